@@ -3,100 +3,216 @@ Aadhaar Data Analysis - Comprehensive Analysis and Insights
 DataThon Submission - Main Analysis Script
 """
 
+import argparse
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from datetime import datetime
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+from lazy_imports import lazy_module
+from data_schema import format_footprint, memory_bytes
+from parallel_ingest import ingest_datasets
+from shard_manifest import load_manifest
+from olap_cube import AggregateCube
+from sampling import StratifiedSampler
+from streaming_aggregation import DEFAULT_GROUPINGS, std_from_moments
+from result_cache import ResultCache
+from task_graph import TaskGraph
+from figure_rendering import DEFAULT_DPI, DEFAULT_FORMAT, FIGURE_FORMATS, FigureJob, figure_jobs, render_figures
 import warnings
 warnings.filterwarnings('ignore')
 
+# Plotting libraries load when the first figure renders, keeping --help and startup fast
+plt = lazy_module('matplotlib.pyplot')
+
+def plot_geographic_analysis(data):
+    """Top states per service and top districts by enrollment"""
+    fig, axes = plt.subplots(2, 2, figsize=(20, 15))
+    fig.suptitle('Geographic Distribution Analysis', fontsize=16, fontweight='bold')
+    
+    panels = [
+        (axes[0,0], data['state_enroll'], None, 'Top 15 States by Enrollment Volume', 'Total Enrollments'),
+        (axes[0,1], data['state_bio'], 'orange', 'Top 15 States by Biometric Updates', 'Total Biometric Updates'),
+        (axes[1,0], data['state_demo'], 'green', 'Top 15 States by Demographic Updates', 'Total Demographic Updates'),
+    ]
+    for ax, states, color, title, ylabel in panels:
+        if states is None:
+            continue
+        ax.bar(range(len(states)), states.values, color=color)
+        ax.set_title(title)
+        ax.set_xticks(range(len(states)))
+        ax.set_xticklabels(states.index, rotation=45, ha='right')
+        ax.set_ylabel(ylabel)
+    
+    district_enroll = data['district_enroll']
+    if district_enroll is not None:
+        district_labels = [f"{idx[1]}, {idx[0]}" for idx in district_enroll.index]
+        axes[1,1].barh(range(len(district_enroll)), district_enroll.values, color='red')
+        axes[1,1].set_title('Top 10 Districts by Enrollment')
+        axes[1,1].set_yticks(range(len(district_enroll)))
+        axes[1,1].set_yticklabels(district_labels)
+        axes[1,1].set_xlabel('Total Enrollments')
+    
+    fig.tight_layout()
+    return fig
+
+def plot_age_demographics(data):
+    """Age-group shares per service and a side-by-side comparison"""
+    fig, axes = plt.subplots(2, 2, figsize=(18, 12))
+    fig.suptitle('Age Group Analysis Across Services', fontsize=16, fontweight='bold')
+    
+    if data['enroll_ages'] is not None:
+        axes[0,0].pie(data['enroll_ages'], labels=['0-5 years', '5-17 years', '18+ years'], autopct='%1.1f%%', startangle=90)
+        axes[0,0].set_title('Enrollment Distribution by Age Groups')
+    
+    if data['bio_ages'] is not None:
+        axes[0,1].pie(data['bio_ages'], labels=['5-17 years', '17+ years'], autopct='%1.1f%%', startangle=90, colors=['lightblue', 'lightcoral'])
+        axes[0,1].set_title('Biometric Updates by Age Groups')
+    
+    if data['demo_ages'] is not None:
+        axes[1,0].pie(data['demo_ages'], labels=['5-17 years', '17+ years'], autopct='%1.1f%%', startangle=90, colors=['lightgreen', 'lightyellow'])
+        axes[1,0].set_title('Demographic Updates by Age Groups')
+    
+    if data['service_ages'] is not None:
+        services = ['Enrollment\n(5-17)', 'Enrollment\n(18+)', 'Biometric\n(5-17)', 'Biometric\n(17+)', 'Demographic\n(5-17)', 'Demographic\n(17+)']
+        axes[1,1].bar(services, data['service_ages'], color=['skyblue', 'navy', 'orange', 'darkorange', 'lightgreen', 'darkgreen'])
+        axes[1,1].set_title('Service Usage Comparison by Age Groups')
+        axes[1,1].set_ylabel('Total Transactions')
+        axes[1,1].tick_params(axis='x', rotation=45)
+    
+    fig.tight_layout()
+    return fig
+
+def plot_temporal_analysis(data):
+    """Daily trends, monthly comparison and day-of-month volume"""
+    fig, axes = plt.subplots(2, 2, figsize=(18, 12))
+    fig.suptitle('Temporal Trends Analysis', fontsize=16, fontweight='bold')
+    
+    daily_enroll = data['daily_enroll']
+    if daily_enroll is not None:
+        axes[0,0].plot(daily_enroll.index, daily_enroll.values, marker='o', linewidth=2)
+        axes[0,0].set_title('Daily Enrollment Trends')
+        axes[0,0].set_xlabel('Date')
+        axes[0,0].set_ylabel('Total Enrollments')
+        axes[0,0].tick_params(axis='x', rotation=45)
+    
+    daily_bio = data['daily_bio']
+    if daily_bio is not None:
+        axes[0,1].plot(daily_bio.index, daily_bio.values, marker='s', color='orange', linewidth=2)
+        axes[0,1].set_title('Daily Biometric Update Trends')
+        axes[0,1].set_xlabel('Date')
+        axes[0,1].set_ylabel('Total Biometric Updates')
+        axes[0,1].tick_params(axis='x', rotation=45)
+    
+    if data['monthly']:
+        months = range(1, 13)
+        for label, monthly in data['monthly'].items():
+            axes[1,0].plot(months, [monthly.get(m, 0) for m in months], marker='o', label=label, linewidth=2)
+        axes[1,0].set_title('Monthly Service Usage Comparison')
+        axes[1,0].set_xlabel('Month')
+        axes[1,0].set_ylabel('Total Transactions')
+        axes[1,0].legend()
+        axes[1,0].set_xticks(months)
+    
+    day_enroll = data['day_enroll']
+    if day_enroll is not None:
+        axes[1,1].bar(day_enroll.index, day_enroll.values, alpha=0.7)
+        axes[1,1].set_title('Enrollment by Day of Month')
+        axes[1,1].set_xlabel('Day of Month')
+        axes[1,1].set_ylabel('Total Enrollments')
+    
+    fig.tight_layout()
+    return fig
+
 class AadhaarAnalyzer:
-    def __init__(self):
+    def __init__(self, streaming=False, memory_budget_mb=256, stratify_by_month=False):
         self.bio_data = None
         self.demo_data = None
         self.enroll_data = None
         
+        # Out-of-core mode: keep only merged aggregates, never the raw rows
+        self.streaming = streaming
+        self.memory_budget_mb = memory_budget_mb
+        # Sample mode: 10% of every shard, stratified so every state (and month) is represented
+        self.stratify_by_month = stratify_by_month
+        self.aggregates = {}
+        
+        # Identify the loaded data for the result cache: shard fingerprint and how rows were chosen
+        self.fingerprint = None
+        self.data_source = None
+        
     def load_all_data(self):
         """Load all datasets efficiently"""
         print("Loading Aadhaar datasets...")
         
-        # Biometric data
-        bio_files = [
-            'api_data_aadhar_biometric/api_data_aadhar_biometric_0_500000.csv',
-            'api_data_aadhar_biometric/api_data_aadhar_biometric_500000_1000000.csv',
-            'api_data_aadhar_biometric/api_data_aadhar_biometric_1000000_1500000.csv',
-            'api_data_aadhar_biometric/api_data_aadhar_biometric_1500000_1861108.csv'
-        ]
-        
-        # Demographic data
-        demo_files = [
-            'api_data_aadhar_demographic/api_data_aadhar_demographic_0_500000.csv',
-            'api_data_aadhar_demographic/api_data_aadhar_demographic_500000_1000000.csv',
-            'api_data_aadhar_demographic/api_data_aadhar_demographic_1000000_1500000.csv',
-            'api_data_aadhar_demographic/api_data_aadhar_demographic_1500000_2000000.csv',
-            'api_data_aadhar_demographic/api_data_aadhar_demographic_2000000_2071700.csv'
-        ]
-        
-        # Enrollment data
-        enroll_files = [
-            'api_data_aadhar_enrolment/api_data_aadhar_enrolment_0_500000.csv',
-            'api_data_aadhar_enrolment/api_data_aadhar_enrolment_500000_1000000.csv',
-            'api_data_aadhar_enrolment/api_data_aadhar_enrolment_1000000_1006029.csv'
-        ]
+        # Shards are discovered on disk; the manifest records which are new or changed
+        manifest = load_manifest()
+        print(manifest.summary())
+        file_lists = manifest.file_lists()
+        self.fingerprint = manifest.fingerprint()
+        self.data_source = 'streaming' if self.streaming else 'stratified-sample'
+        
+        if self.streaming:
+            # Stream ALL records into the (state, district, date) cube once; unchanged
+            # shards reuse their persisted partials and every rollup answers from the cube
+            cube = AggregateCube.load_or_build(manifest, memory_budget_mb=self.memory_budget_mb)
+            self.aggregates = {dataset: cube.rollups(dataset, DEFAULT_GROUPINGS)
+                               for dataset in file_lists if cube.has(dataset)}
+            aggregator = cube.aggregator
+            if aggregator is None:
+                print(f"Loaded persisted aggregate cube ({cube.cells():,} cells)")
+            else:
+                print(f"Streamed {aggregator.rows_processed:,} records from {aggregator.shards_streamed} shards, "
+                      f"reused {aggregator.shards_reused} cached shard aggregates "
+                      f"(budget {self.memory_budget_mb} MB, largest chunk {aggregator.peak_chunk_bytes / 1e6:.1f} MB); "
+                      f"cube has {cube.cells():,} cells")
+            return
+        
+        # Stream every shard concurrently into a stratified 10% sample for memory
+        # efficiency; dates and derived columns are prepared inside the workers
+        frames, raw_bytes = ingest_datasets(
+            file_lists,
+            sampler=StratifiedSampler(fraction=0.1, by_month=self.stratify_by_month),
+            on_error=lambda file, e: print(f"Error loading {file}: {e}")
+        )
+        self.bio_data = frames['biometric']
+        self.demo_data = frames['demographic']
+        self.enroll_data = frames['enrollment']
+        
+        for dataset, data in frames.items():
+            if data is not None:
+                print(f"{dataset.title()} data loaded: {len(data)} records")
         
-        # Load with sampling for memory efficiency
-        self.bio_data = self._load_files(bio_files, "Biometric")
-        self.demo_data = self._load_files(demo_files, "Demographic") 
-        self.enroll_data = self._load_files(enroll_files, "Enrollment")
-        
-        # Data preprocessing
-        self._preprocess_data()
-        
-    def _load_files(self, file_list, data_type, sample_frac=0.1):
-        """Load and combine files with sampling"""
-        dfs = []
-        for file in file_list:
-            try:
-                df = pd.read_csv(file)
-                # Sample for memory efficiency
-                if len(df) > 10000:
-                    df = df.sample(frac=sample_frac, random_state=42)
-                dfs.append(df)
-            except Exception as e:
-                print(f"Error loading {file}: {e}")
-        
-        if dfs:
-            combined = pd.concat(dfs, ignore_index=True)
-            print(f"{data_type} data loaded: {len(combined)} records")
-            return combined
-        return None
+        typed_bytes = sum(memory_bytes(data) for data in frames.values() if data is not None)
+        print(format_footprint("Sampled", raw_bytes, typed_bytes))
     
-    def _preprocess_data(self):
-        """Preprocess all datasets"""
-        datasets = [
-            (self.bio_data, "Biometric"),
-            (self.demo_data, "Demographic"), 
-            (self.enroll_data, "Enrollment")
-        ]
-        
-        for data, name in datasets:
-            if data is not None:
-                # Convert date column
-                data['date'] = pd.to_datetime(data['date'], format='%d-%m-%Y')
-                data['month'] = data['date'].dt.month
-                data['day'] = data['date'].dt.day
-                
-                # Add total columns for analysis
-                if name == "Biometric":
-                    data['total_bio'] = data['bio_age_5_17'] + data['bio_age_17_']
-                elif name == "Demographic":
-                    data['total_demo'] = data['demo_age_5_17'] + data['demo_age_17_']
-                elif name == "Enrollment":
-                    data['total_enroll'] = data['age_0_5'] + data['age_5_17'] + data['age_18_greater']
+    def use_frames(self, frames, fingerprint=None):
+        """Analyze frames already loaded by a shared store instead of reading the shards"""
+        self.fingerprint = fingerprint
+        self.data_source = 'shared-store'
+        self.bio_data = frames.get('biometric')
+        self.demo_data = frames.get('demographic')
+        self.enroll_data = frames.get('enrollment')
+    
+    def _frame(self, dataset):
+        """Return the in-memory frame for a dataset"""
+        return {'biometric': self.bio_data, 'demographic': self.demo_data, 'enrollment': self.enroll_data}[dataset]
+    
+    def _has(self, dataset):
+        """Check whether a dataset is available in the current mode"""
+        if self.streaming:
+            return self.aggregates.get(dataset, {}).get('total') is not None
+        return self._frame(dataset) is not None
+    
+    def _grouped_sum(self, dataset, grouping, column):
+        """Groupby-sum of a column, from streamed aggregates or the loaded frame"""
+        if self.streaming:
+            return self.aggregates[dataset][grouping][column]
+        keys = DEFAULT_GROUPINGS[grouping]
+        return self._frame(dataset).groupby(keys, observed=True)[column].sum()
+    
+    def _column_sum(self, dataset, column):
+        """Grand total of a column, from streamed aggregates or the loaded frame"""
+        if self.streaming:
+            return self.aggregates[dataset]['total'][column].iloc[0]
+        return self._frame(dataset)[column].sum()
     
     def analyze_geographic_patterns(self):
         """Analyze geographic distribution patterns"""
@@ -104,51 +220,25 @@ class AadhaarAnalyzer:
         print("GEOGRAPHIC PATTERN ANALYSIS")
         print("="*60)
         
-        fig, axes = plt.subplots(2, 2, figsize=(20, 15))
-        fig.suptitle('Geographic Distribution Analysis', fontsize=16, fontweight='bold')
+        data = {'state_enroll': None, 'state_bio': None, 'state_demo': None, 'district_enroll': None}
         
         # State-wise enrollment analysis
-        if self.enroll_data is not None:
-            state_enroll = self.enroll_data.groupby('state')['total_enroll'].sum().sort_values(ascending=False).head(15)
-            axes[0,0].bar(range(len(state_enroll)), state_enroll.values)
-            axes[0,0].set_title('Top 15 States by Enrollment Volume')
-            axes[0,0].set_xticks(range(len(state_enroll)))
-            axes[0,0].set_xticklabels(state_enroll.index, rotation=45, ha='right')
-            axes[0,0].set_ylabel('Total Enrollments')
+        if self._has('enrollment'):
+            data['state_enroll'] = self._grouped_sum('enrollment', 'state', 'total_enroll').sort_values(ascending=False).head(15)
         
         # State-wise biometric analysis
-        if self.bio_data is not None:
-            state_bio = self.bio_data.groupby('state')['total_bio'].sum().sort_values(ascending=False).head(15)
-            axes[0,1].bar(range(len(state_bio)), state_bio.values, color='orange')
-            axes[0,1].set_title('Top 15 States by Biometric Updates')
-            axes[0,1].set_xticks(range(len(state_bio)))
-            axes[0,1].set_xticklabels(state_bio.index, rotation=45, ha='right')
-            axes[0,1].set_ylabel('Total Biometric Updates')
+        if self._has('biometric'):
+            data['state_bio'] = self._grouped_sum('biometric', 'state', 'total_bio').sort_values(ascending=False).head(15)
         
         # State-wise demographic analysis
-        if self.demo_data is not None:
-            state_demo = self.demo_data.groupby('state')['total_demo'].sum().sort_values(ascending=False).head(15)
-            axes[1,0].bar(range(len(state_demo)), state_demo.values, color='green')
-            axes[1,0].set_title('Top 15 States by Demographic Updates')
-            axes[1,0].set_xticks(range(len(state_demo)))
-            axes[1,0].set_xticklabels(state_demo.index, rotation=45, ha='right')
-            axes[1,0].set_ylabel('Total Demographic Updates')
+        if self._has('demographic'):
+            data['state_demo'] = self._grouped_sum('demographic', 'state', 'total_demo').sort_values(ascending=False).head(15)
         
         # District-level analysis (top performing districts)
-        if self.enroll_data is not None:
-            district_enroll = self.enroll_data.groupby(['state', 'district'])['total_enroll'].sum().sort_values(ascending=False).head(10)
-            district_labels = [f"{idx[1]}, {idx[0]}" for idx in district_enroll.index]
-            axes[1,1].barh(range(len(district_enroll)), district_enroll.values, color='red')
-            axes[1,1].set_title('Top 10 Districts by Enrollment')
-            axes[1,1].set_yticks(range(len(district_enroll)))
-            axes[1,1].set_yticklabels(district_labels)
-            axes[1,1].set_xlabel('Total Enrollments')
-        
-        plt.tight_layout()
-        plt.savefig('geographic_analysis.png', dpi=300, bbox_inches='tight')
-        plt.show()
-        
-        return state_enroll if self.enroll_data is not None else None
+        if self._has('enrollment'):
+            data['district_enroll'] = self._grouped_sum('enrollment', 'district', 'total_enroll').sort_values(ascending=False).head(10)
+        
+        return FigureJob('geographic_analysis', plot_geographic_analysis, data, result=data['state_enroll'])
     
     def analyze_age_demographics(self):
         """Analyze age group patterns"""
@@ -156,54 +246,33 @@ class AadhaarAnalyzer:
         print("AGE DEMOGRAPHIC ANALYSIS")
         print("="*60)
         
-        fig, axes = plt.subplots(2, 2, figsize=(18, 12))
-        fig.suptitle('Age Group Analysis Across Services', fontsize=16, fontweight='bold')
+        data = {'enroll_ages': None, 'bio_ages': None, 'demo_ages': None, 'service_ages': None}
         
         # Enrollment age distribution
-        if self.enroll_data is not None:
+        if self._has('enrollment'):
             age_cols = ['age_0_5', 'age_5_17', 'age_18_greater']
-            age_totals = [self.enroll_data[col].sum() for col in age_cols]
-            age_labels = ['0-5 years', '5-17 years', '18+ years']
-            
-            axes[0,0].pie(age_totals, labels=age_labels, autopct='%1.1f%%', startangle=90)
-            axes[0,0].set_title('Enrollment Distribution by Age Groups')
+            data['enroll_ages'] = [self._column_sum('enrollment', col) for col in age_cols]
         
         # Biometric age distribution
-        if self.bio_data is not None:
-            bio_age_totals = [self.bio_data['bio_age_5_17'].sum(), self.bio_data['bio_age_17_'].sum()]
-            bio_labels = ['5-17 years', '17+ years']
-            
-            axes[0,1].pie(bio_age_totals, labels=bio_labels, autopct='%1.1f%%', startangle=90, colors=['lightblue', 'lightcoral'])
-            axes[0,1].set_title('Biometric Updates by Age Groups')
+        if self._has('biometric'):
+            data['bio_ages'] = [self._column_sum('biometric', 'bio_age_5_17'), self._column_sum('biometric', 'bio_age_17_')]
         
         # Demographic age distribution
-        if self.demo_data is not None:
-            demo_age_totals = [self.demo_data['demo_age_5_17'].sum(), self.demo_data['demo_age_17_'].sum()]
-            demo_labels = ['5-17 years', '17+ years']
-            
-            axes[1,0].pie(demo_age_totals, labels=demo_labels, autopct='%1.1f%%', startangle=90, colors=['lightgreen', 'lightyellow'])
-            axes[1,0].set_title('Demographic Updates by Age Groups')
+        if self._has('demographic'):
+            data['demo_ages'] = [self._column_sum('demographic', 'demo_age_5_17'), self._column_sum('demographic', 'demo_age_17_')]
         
         # Comparative analysis
-        if all([self.enroll_data is not None, self.bio_data is not None, self.demo_data is not None]):
-            services = ['Enrollment\n(5-17)', 'Enrollment\n(18+)', 'Biometric\n(5-17)', 'Biometric\n(17+)', 'Demographic\n(5-17)', 'Demographic\n(17+)']
-            values = [
-                self.enroll_data['age_5_17'].sum(),
-                self.enroll_data['age_18_greater'].sum(),
-                self.bio_data['bio_age_5_17'].sum(),
-                self.bio_data['bio_age_17_'].sum(),
-                self.demo_data['demo_age_5_17'].sum(),
-                self.demo_data['demo_age_17_'].sum()
+        if all([self._has('enrollment'), self._has('biometric'), self._has('demographic')]):
+            data['service_ages'] = [
+                self._column_sum('enrollment', 'age_5_17'),
+                self._column_sum('enrollment', 'age_18_greater'),
+                self._column_sum('biometric', 'bio_age_5_17'),
+                self._column_sum('biometric', 'bio_age_17_'),
+                self._column_sum('demographic', 'demo_age_5_17'),
+                self._column_sum('demographic', 'demo_age_17_')
             ]
-            
-            axes[1,1].bar(services, values, color=['skyblue', 'navy', 'orange', 'darkorange', 'lightgreen', 'darkgreen'])
-            axes[1,1].set_title('Service Usage Comparison by Age Groups')
-            axes[1,1].set_ylabel('Total Transactions')
-            axes[1,1].tick_params(axis='x', rotation=45)
-        
-        plt.tight_layout()
-        plt.savefig('age_demographics_analysis.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        
+        return FigureJob('age_demographics_analysis', plot_age_demographics, data)
     
     def analyze_temporal_patterns(self):
         """Analyze temporal trends and patterns"""
@@ -211,66 +280,26 @@ class AadhaarAnalyzer:
         print("TEMPORAL PATTERN ANALYSIS")
         print("="*60)
         
-        fig, axes = plt.subplots(2, 2, figsize=(18, 12))
-        fig.suptitle('Temporal Trends Analysis', fontsize=16, fontweight='bold')
-        
-        # Daily trends for enrollment
-        if self.enroll_data is not None:
-            daily_enroll = self.enroll_data.groupby('date')['total_enroll'].sum().sort_index()
-            axes[0,0].plot(daily_enroll.index, daily_enroll.values, marker='o', linewidth=2)
-            axes[0,0].set_title('Daily Enrollment Trends')
-            axes[0,0].set_xlabel('Date')
-            axes[0,0].set_ylabel('Total Enrollments')
-            axes[0,0].tick_params(axis='x', rotation=45)
-        
-        # Daily trends for biometric
-        if self.bio_data is not None:
-            daily_bio = self.bio_data.groupby('date')['total_bio'].sum().sort_index()
-            axes[0,1].plot(daily_bio.index, daily_bio.values, marker='s', color='orange', linewidth=2)
-            axes[0,1].set_title('Daily Biometric Update Trends')
-            axes[0,1].set_xlabel('Date')
-            axes[0,1].set_ylabel('Total Biometric Updates')
-            axes[0,1].tick_params(axis='x', rotation=45)
+        data = {'daily_enroll': None, 'daily_bio': None, 'monthly': {}, 'day_enroll': None}
+        
+        # Daily trends for enrollment and biometric
+        if self._has('enrollment'):
+            data['daily_enroll'] = self._grouped_sum('enrollment', 'date', 'total_enroll').sort_index()
+        if self._has('biometric'):
+            data['daily_bio'] = self._grouped_sum('biometric', 'date', 'total_bio').sort_index()
         
         # Monthly comparison
-        datasets = []
-        labels = []
-        if self.enroll_data is not None:
-            monthly_enroll = self.enroll_data.groupby('month')['total_enroll'].sum()
-            datasets.append(monthly_enroll)
-            labels.append('Enrollment')
-        
-        if self.bio_data is not None:
-            monthly_bio = self.bio_data.groupby('month')['total_bio'].sum()
-            datasets.append(monthly_bio)
-            labels.append('Biometric')
-        
-        if self.demo_data is not None:
-            monthly_demo = self.demo_data.groupby('month')['total_demo'].sum()
-            datasets.append(monthly_demo)
-            labels.append('Demographic')
-        
-        if datasets:
-            months = range(1, 13)
-            for i, (data, label) in enumerate(zip(datasets, labels)):
-                axes[1,0].plot(months, [data.get(m, 0) for m in months], marker='o', label=label, linewidth=2)
-            axes[1,0].set_title('Monthly Service Usage Comparison')
-            axes[1,0].set_xlabel('Month')
-            axes[1,0].set_ylabel('Total Transactions')
-            axes[1,0].legend()
-            axes[1,0].set_xticks(months)
+        for dataset, column, label in [('enrollment', 'total_enroll', 'Enrollment'),
+                                       ('biometric', 'total_bio', 'Biometric'),
+                                       ('demographic', 'total_demo', 'Demographic')]:
+            if self._has(dataset):
+                data['monthly'][label] = self._grouped_sum(dataset, 'month', column)
         
         # Day of month analysis
-        if self.enroll_data is not None:
-            day_enroll = self.enroll_data.groupby('day')['total_enroll'].sum()
-            axes[1,1].bar(day_enroll.index, day_enroll.values, alpha=0.7)
-            axes[1,1].set_title('Enrollment by Day of Month')
-            axes[1,1].set_xlabel('Day of Month')
-            axes[1,1].set_ylabel('Total Enrollments')
-        
-        plt.tight_layout()
-        plt.savefig('temporal_analysis.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        if self._has('enrollment'):
+            data['day_enroll'] = self._grouped_sum('enrollment', 'day', 'total_enroll')
+        
+        return FigureJob('temporal_analysis', plot_temporal_analysis, data)
     
     def identify_anomalies_and_insights(self):
         """Identify anomalies and generate insights"""
@@ -281,23 +310,31 @@ class AadhaarAnalyzer:
         insights = []
         
         # Geographic anomalies
-        if self.enroll_data is not None:
-            state_stats = self.enroll_data.groupby('state')['total_enroll'].agg(['mean', 'std', 'sum'])
+        if self._has('enrollment'):
+            if self.streaming:
+                state_agg = self.aggregates['enrollment']['state']
+                state_stats = pd.DataFrame({
+                    'mean': state_agg['total_enroll'] / state_agg['count'],
+                    'std': std_from_moments(state_agg, 'total_enroll'),
+                    'sum': state_agg['total_enroll']
+                })
+            else:
+                state_stats = self.enroll_data.groupby('state', observed=True)['total_enroll'].agg(['mean', 'std', 'sum'])
             high_variance_states = state_stats[state_stats['std'] > state_stats['std'].quantile(0.9)]
             insights.append(f"High variance enrollment states: {list(high_variance_states.index)}")
         
         # Age group insights
-        if all([self.enroll_data is not None, self.bio_data is not None]):
-            enroll_adult_ratio = self.enroll_data['age_18_greater'].sum() / self.enroll_data['total_enroll'].sum()
-            bio_adult_ratio = self.bio_data['bio_age_17_'].sum() / self.bio_data['total_bio'].sum()
+        if all([self._has('enrollment'), self._has('biometric')]):
+            enroll_adult_ratio = self._column_sum('enrollment', 'age_18_greater') / self._column_sum('enrollment', 'total_enroll')
+            bio_adult_ratio = self._column_sum('biometric', 'bio_age_17_') / self._column_sum('biometric', 'total_bio')
             insights.append(f"Adult enrollment ratio: {enroll_adult_ratio:.2%}")
             insights.append(f"Adult biometric ratio: {bio_adult_ratio:.2%}")
         
         # Service utilization patterns
-        if all([self.enroll_data is not None, self.bio_data is not None, self.demo_data is not None]):
-            total_enroll = self.enroll_data['total_enroll'].sum()
-            total_bio = self.bio_data['total_bio'].sum()
-            total_demo = self.demo_data['total_demo'].sum()
+        if all([self._has('enrollment'), self._has('biometric'), self._has('demographic')]):
+            total_enroll = self._column_sum('enrollment', 'total_enroll')
+            total_bio = self._column_sum('biometric', 'total_bio')
+            total_demo = self._column_sum('demographic', 'total_demo')
             
             insights.append(f"Service usage - Enrollment: {total_enroll:,}, Biometric: {total_bio:,}, Demographic: {total_demo:,}")
             
@@ -336,29 +373,62 @@ class AadhaarAnalyzer:
         
         return recommendations
 
+    def analysis_graph(self, cache=None):
+        """Independent analyses as a task graph; none takes another's result
+
+        The figure analyses return FigureJobs; render them with render_figures.
+        """
+        params = {'source': self.data_source, 'stratify_by_month': self.stratify_by_month}
+        graph = TaskGraph(cache=cache if self.fingerprint else None, fingerprint=self.fingerprint, params=params)
+        graph.add('geographic', self.analyze_geographic_patterns)
+        graph.add('age_demographics', self.analyze_age_demographics)
+        graph.add('temporal', self.analyze_temporal_patterns)
+        graph.add('insights', self.identify_anomalies_and_insights)
+        graph.add('recommendations', self.generate_recommendations)
+        return graph
+
 def main():
     """Main analysis execution"""
+    parser = argparse.ArgumentParser(description="Aadhaar comprehensive analysis")
+    parser.add_argument('--streaming', action='store_true',
+                        help="aggregate ALL records chunk by chunk instead of loading a 10%% sample")
+    parser.add_argument('--memory-budget-mb', type=int, default=256,
+                        help="working memory budget per chunk in streaming mode (default: 256)")
+    parser.add_argument('--stratify-by-month', action='store_true',
+                        help="guarantee a minimum sample per (state, month) instead of per state")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes for the independent analyses (default: CPU count, 1 = serial)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="recompute every analysis instead of reusing cached results")
+    parser.add_argument('--dpi', type=int, default=DEFAULT_DPI,
+                        help=f"resolution of the rendered figures (default: {DEFAULT_DPI})")
+    parser.add_argument('--format', choices=FIGURE_FORMATS, default=DEFAULT_FORMAT,
+                        help=f"file format of the rendered figures (default: {DEFAULT_FORMAT})")
+    args = parser.parse_args()
+    
     print("AADHAAR DATA ANALYSIS - DATATHON SUBMISSION")
     print("="*60)
     
     # Initialize analyzer
-    analyzer = AadhaarAnalyzer()
+    analyzer = AadhaarAnalyzer(streaming=args.streaming, memory_budget_mb=args.memory_budget_mb,
+                               stratify_by_month=args.stratify_by_month)
     
     # Load data
     analyzer.load_all_data()
     
-    # Perform comprehensive analysis
-    analyzer.analyze_geographic_patterns()
-    analyzer.analyze_age_demographics()
-    analyzer.analyze_temporal_patterns()
+    # Perform comprehensive analysis, insights and recommendations concurrently
+    cache = None if args.no_cache else ResultCache()
+    graph = analyzer.analysis_graph(cache=cache)
+    results = graph.run(max_workers=args.workers)
+    graph.report()
     
-    # Generate insights and recommendations
-    insights = analyzer.identify_anomalies_and_insights()
-    recommendations = analyzer.generate_recommendations()
+    # Draw the figures headlessly from their plot data, one worker per figure
+    rendered = render_figures(figure_jobs(results), dpi=args.dpi, fmt=args.format,
+                              max_workers=args.workers, cache=cache)
     
     print("\n" + "="*60)
     print("ANALYSIS COMPLETED SUCCESSFULLY!")
-    print("Generated visualizations: geographic_analysis.png, age_demographics_analysis.png, temporal_analysis.png")
+    print(f"Generated visualizations: {', '.join(path for path, _, _ in rendered.values())}")
     print("="*60)
 
 if __name__ == "__main__":
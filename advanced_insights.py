@@ -3,54 +3,185 @@ Advanced Analytics and Predictive Insights for Aadhaar Data
 DataThon Submission - Advanced Analysis Module
 """
 
+import argparse
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
-from sklearn.ensemble import IsolationForest
-from scipy import stats
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+from lazy_imports import lazy_module
+from data_schema import format_footprint, memory_bytes
+from olap_cube import AggregateCube
+from parallel_ingest import ingest_datasets
+from sampling import StratifiedSampler
+from shard_manifest import load_manifest
+from result_cache import ResultCache
+from task_graph import TaskGraph
+from figure_rendering import DEFAULT_DPI, DEFAULT_FORMAT, FIGURE_FORMATS, FigureJob, figure_jobs, render_figures
 import warnings
 warnings.filterwarnings('ignore')
 
+# Plotting libraries load when the first figure renders; sklearn is imported by the analyses that fit models
+plt = lazy_module('matplotlib.pyplot')
+sns = lazy_module('seaborn')
+
+def plot_clustering_analysis(data):
+    """District counts, enrollment and age mix per cluster, plus the districts' mean vs spread"""
+    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+    fig.suptitle('District Clustering Analysis', fontsize=16, fontweight='bold')
+    
+    # Cluster distribution
+    cluster_counts = data['cluster_counts']
+    axes[0,0].bar(cluster_counts.index, cluster_counts.values, color=['red', 'blue', 'green', 'orange'])
+    axes[0,0].set_title('Districts per Cluster')
+    axes[0,0].set_xlabel('Cluster')
+    axes[0,0].set_ylabel('Number of Districts')
+    
+    # Average enrollment by cluster
+    cluster_avg = data['cluster_avg']
+    axes[0,1].bar(cluster_avg.index, cluster_avg.values, color=['red', 'blue', 'green', 'orange'])
+    axes[0,1].set_title('Average Enrollment by Cluster')
+    axes[0,1].set_xlabel('Cluster')
+    axes[0,1].set_ylabel('Average Enrollment')
+    
+    # Age distribution by cluster
+    cluster_age = data['cluster_age']
+    x = np.arange(len(cluster_age.index))
+    width = 0.25
+    
+    for i, col in enumerate(cluster_age.columns):
+        axes[1,0].bar(x + i*width, cluster_age[col], width, label=col.replace('avg_age_', '').replace('_', '-') + ' years')
+    
+    axes[1,0].set_title('Age Group Distribution by Cluster')
+    axes[1,0].set_xlabel('Cluster')
+    axes[1,0].set_ylabel('Average Count')
+    axes[1,0].set_xticks(x + width)
+    axes[1,0].set_xticklabels(cluster_age.index)
+    axes[1,0].legend()
+    
+    # Scatter plot of key features
+    districts = data['districts']
+    scatter = axes[1,1].scatter(districts['avg_total'], districts['std_total'], 
+                              c=districts['cluster'], cmap='viridis', alpha=0.6)
+    axes[1,1].set_title('Districts by Average vs Standard Deviation')
+    axes[1,1].set_xlabel('Average Total Enrollment')
+    axes[1,1].set_ylabel('Standard Deviation')
+    fig.colorbar(scatter, ax=axes[1,1])
+    
+    fig.tight_layout()
+    return fig
+
+def plot_anomaly_detection(data):
+    """Box plot, binned distributions and daily counts of the detected anomalies"""
+    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+    fig.suptitle('Anomaly Detection Results', fontsize=16, fontweight='bold')
+    
+    # Box plot for outliers, from precomputed statistics
+    sample_note = data.get('sample_note', '')
+    axes[0,0].bxp([data['box']])
+    if sample_note and data.get('whiskers_sampled'):
+        sources = '\nBox: all records; whiskers and outlier points' + sample_note
+    elif sample_note:
+        sources = '\nBox and whiskers: all records; outlier points' + sample_note
+    else:
+        sources = ''
+    axes[0,0].set_title('Enrollment Distribution (Box Plot)' + sources)
+    axes[0,0].set_ylabel('Total Enrollment')
+    
+    # Histogram with outliers marked
+    counts, edges = data['total_hist']
+    lower_bound, upper_bound = data['bounds']
+    axes[0,1].stairs(counts, edges, fill=True, alpha=0.7, color='skyblue')
+    axes[0,1].axvline(lower_bound, color='red', linestyle='--', label='Lower Bound')
+    axes[0,1].axvline(upper_bound, color='red', linestyle='--', label='Upper Bound')
+    axes[0,1].set_title('Enrollment Distribution with Outlier Bounds' + sample_note)
+    axes[0,1].set_xlabel('Total Enrollment')
+    axes[0,1].set_ylabel('Frequency')
+    axes[0,1].legend()
+    
+    # Anomaly scores
+    counts, edges = data['score_hist']
+    axes[1,0].stairs(counts, edges, fill=True, alpha=0.7, color='orange')
+    axes[1,0].set_title('Isolation Forest Anomaly Scores' + sample_note)
+    axes[1,0].set_xlabel('Anomaly Score')
+    axes[1,0].set_ylabel('Frequency')
+    
+    # Time series of anomalies
+    daily_anomalies = data['daily_anomalies']
+    if len(daily_anomalies) > 0:
+        axes[1,1].plot(daily_anomalies.index, daily_anomalies.values, marker='o', color='red')
+        axes[1,1].set_title('Daily Anomaly Count' + sample_note)
+        axes[1,1].set_xlabel('Date')
+        axes[1,1].set_ylabel('Number of Anomalies')
+        axes[1,1].tick_params(axis='x', rotation=45)
+    
+    fig.tight_layout()
+    return fig
+
+def plot_correlation_analysis(correlation_matrix):
+    """Lower-triangle heatmap of the service correlation matrix"""
+    fig = plt.figure(figsize=(14, 10))
+    mask = np.triu(np.ones_like(correlation_matrix, dtype=bool))
+    sns.heatmap(correlation_matrix, mask=mask, annot=True, cmap='coolwarm', center=0,
+               square=True, linewidths=0.5, cbar_kws={"shrink": .8})
+    plt.title('Correlation Matrix - Aadhaar Services', fontsize=16, fontweight='bold')
+    fig.tight_layout()
+    return fig
+
 class AdvancedAadhaarAnalytics:
-    def __init__(self):
+    def __init__(self, use_cube=False):
         self.bio_data = None
         self.demo_data = None
         self.enroll_data = None
         self.combined_data = None
         
+        # Cluster features from the delta-maintained aggregate cube (ALL records)
+        self.use_cube = use_cube
+        self.cube = None
+        
+        # Identify the loaded data for the result cache: shard fingerprint and how rows were chosen
+        self.fingerprint = None
+        self.data_source = None
+        
     def load_and_prepare_data(self):
         """Load and prepare data for advanced analytics"""
         print("Loading data for advanced analytics...")
         
         # Load sample data for analysis
         try:
-            self.bio_data = pd.read_csv('api_data_aadhar_biometric/api_data_aadhar_biometric_0_500000.csv').sample(n=10000, random_state=42)
-            self.demo_data = pd.read_csv('api_data_aadhar_demographic/api_data_aadhar_demographic_0_500000.csv').sample(n=10000, random_state=42)
-            self.enroll_data = pd.read_csv('api_data_aadhar_enrolment/api_data_aadhar_enrolment_0_500000.csv').sample(n=10000, random_state=42)
+            manifest = load_manifest()
+            self.fingerprint = manifest.fingerprint()
+            self.data_source = 'stratified-sample'
+            if self.use_cube:
+                self.cube = AggregateCube.load_or_build(manifest)
+                print(f"Aggregate cube ready ({self.cube.cells():,} cells)")
             
-            # Preprocess dates
-            for df in [self.bio_data, self.demo_data, self.enroll_data]:
-                df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y')
-                df['month'] = df['date'].dt.month
-                df['day'] = df['date'].dt.day
-                df['weekday'] = df['date'].dt.dayofweek
+            # 10,000 rows per dataset drawn from EVERY shard, with a minimum per state;
+            # shards are streamed and preprocessed concurrently in worker processes
+            frames, raw_bytes = ingest_datasets(
+                manifest.file_lists(),
+                sampler=StratifiedSampler(size=10000),
+                on_error=lambda file, e: print(f"Error loading {file}: {e}")
+            )
+            self.bio_data = frames['biometric']
+            self.demo_data = frames['demographic']
+            self.enroll_data = frames['enrollment']
             
-            # Add calculated columns
-            self.bio_data['total_bio'] = self.bio_data['bio_age_5_17'] + self.bio_data['bio_age_17_']
-            self.demo_data['total_demo'] = self.demo_data['demo_age_5_17'] + self.demo_data['demo_age_17_']
-            self.enroll_data['total_enroll'] = self.enroll_data['age_0_5'] + self.enroll_data['age_5_17'] + self.enroll_data['age_18_greater']
+            if any(df is None for df in frames.values()):
+                return
             
+            typed_bytes = sum(memory_bytes(df) for df in frames.values())
+            print(format_footprint("Sample", raw_bytes, typed_bytes))
             print("Data loaded and preprocessed successfully!")
             
         except Exception as e:
             print(f"Error loading data: {e}")
     
+    def use_frames(self, frames, fingerprint=None):
+        """Analyze frames already loaded by a shared store instead of reading the shards"""
+        self.fingerprint = fingerprint
+        self.data_source = 'shared-store'
+        self.bio_data = frames.get('biometric')
+        self.demo_data = frames.get('demographic')
+        self.enroll_data = frames.get('enrollment')
+    
     def perform_clustering_analysis(self):
         """Perform clustering analysis to identify patterns"""
         print("\n" + "="*60)
@@ -60,25 +191,31 @@ class AdvancedAadhaarAnalytics:
         if self.enroll_data is None:
             return
         
-        # Aggregate data by district for clustering
-        district_features = self.enroll_data.groupby(['state', 'district']).agg({
-            'age_0_5': 'mean',
-            'age_5_17': 'mean', 
-            'age_18_greater': 'mean',
-            'total_enroll': ['mean', 'std', 'sum'],
-            'month': 'nunique',
-            'pincode': 'nunique'
-        }).reset_index()
-        
-        # Flatten column names
-        district_features.columns = ['state', 'district', 'avg_age_0_5', 'avg_age_5_17', 'avg_age_18_greater', 
-                                   'avg_total', 'std_total', 'sum_total', 'months_active', 'pincode_count']
+        if self.cube is not None and self.cube.has('enrollment'):
+            # Same features over ALL records, from the cube's count/sum/sum-of-squares cells
+            district_features = self.cube.district_features('enrollment')
+        else:
+            # Aggregate data by district for clustering
+            district_features = self.enroll_data.groupby(['state', 'district'], observed=True).agg({
+                'age_0_5': 'mean',
+                'age_5_17': 'mean', 
+                'age_18_greater': 'mean',
+                'total_enroll': ['mean', 'std', 'sum'],
+                'month': 'nunique',
+                'pincode': 'nunique'
+            }).reset_index()
+            
+            # Flatten column names
+            district_features.columns = ['state', 'district', 'avg_age_0_5', 'avg_age_5_17', 'avg_age_18_greater', 
+                                       'avg_total', 'std_total', 'sum_total', 'months_active', 'pincode_count']
         
         # Prepare features for clustering
         feature_cols = ['avg_age_0_5', 'avg_age_5_17', 'avg_age_18_greater', 'avg_total', 'std_total', 'pincode_count']
         X = district_features[feature_cols].fillna(0)
         
         # Standardize features
+        from sklearn.cluster import KMeans
+        from sklearn.preprocessing import StandardScaler
         scaler = StandardScaler()
         X_scaled = scaler.fit_transform(X)
         
@@ -86,52 +223,14 @@ class AdvancedAadhaarAnalytics:
         kmeans = KMeans(n_clusters=4, random_state=42)
         district_features['cluster'] = kmeans.fit_predict(X_scaled)
         
-        # Visualize clusters
-        fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-        fig.suptitle('District Clustering Analysis', fontsize=16, fontweight='bold')
-        
-        # Cluster distribution
-        cluster_counts = district_features['cluster'].value_counts().sort_index()
-        axes[0,0].bar(cluster_counts.index, cluster_counts.values, color=['red', 'blue', 'green', 'orange'])
-        axes[0,0].set_title('Districts per Cluster')
-        axes[0,0].set_xlabel('Cluster')
-        axes[0,0].set_ylabel('Number of Districts')
-        
-        # Average enrollment by cluster
-        cluster_avg = district_features.groupby('cluster')['avg_total'].mean()
-        axes[0,1].bar(cluster_avg.index, cluster_avg.values, color=['red', 'blue', 'green', 'orange'])
-        axes[0,1].set_title('Average Enrollment by Cluster')
-        axes[0,1].set_xlabel('Cluster')
-        axes[0,1].set_ylabel('Average Enrollment')
-        
-        # Age distribution by cluster
+        # Cluster summaries and the district scatter are all the figure needs
         age_cols = ['avg_age_0_5', 'avg_age_5_17', 'avg_age_18_greater']
-        cluster_age = district_features.groupby('cluster')[age_cols].mean()
-        
-        x = np.arange(len(cluster_age.index))
-        width = 0.25
-        
-        for i, col in enumerate(age_cols):
-            axes[1,0].bar(x + i*width, cluster_age[col], width, label=col.replace('avg_age_', '').replace('_', '-') + ' years')
-        
-        axes[1,0].set_title('Age Group Distribution by Cluster')
-        axes[1,0].set_xlabel('Cluster')
-        axes[1,0].set_ylabel('Average Count')
-        axes[1,0].set_xticks(x + width)
-        axes[1,0].set_xticklabels(cluster_age.index)
-        axes[1,0].legend()
-        
-        # Scatter plot of key features
-        scatter = axes[1,1].scatter(district_features['avg_total'], district_features['std_total'], 
-                                  c=district_features['cluster'], cmap='viridis', alpha=0.6)
-        axes[1,1].set_title('Districts by Average vs Standard Deviation')
-        axes[1,1].set_xlabel('Average Total Enrollment')
-        axes[1,1].set_ylabel('Standard Deviation')
-        plt.colorbar(scatter, ax=axes[1,1])
-        
-        plt.tight_layout()
-        plt.savefig('clustering_analysis.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        plot_data = {
+            'cluster_counts': district_features['cluster'].value_counts().sort_index(),
+            'cluster_avg': district_features.groupby('cluster')['avg_total'].mean(),
+            'cluster_age': district_features.groupby('cluster')[age_cols].mean(),
+            'districts': district_features[['avg_total', 'std_total', 'cluster']],
+        }
         
         # Print cluster characteristics
         print("\nCLUSTER CHARACTERISTICS:")
@@ -140,9 +239,10 @@ class AdvancedAadhaarAnalytics:
             print(f"\nCluster {cluster} ({len(cluster_data)} districts):")
             print(f"  Average enrollment: {cluster_data['avg_total'].mean():.1f}")
             print(f"  Average std deviation: {cluster_data['std_total'].mean():.1f}")
-            print(f"  Top states: {cluster_data['state'].value_counts().head(3).to_dict()}")
+            state_counts = cluster_data['state'].value_counts()
+            print(f"  Top states: {state_counts[state_counts > 0].head(3).to_dict()}")
         
-        return district_features
+        return FigureJob('clustering_analysis', plot_clustering_analysis, plot_data, result=district_features)
     
     def detect_anomalies(self):
         """Detect anomalies in the data using statistical methods"""
@@ -151,12 +251,20 @@ class AdvancedAadhaarAnalytics:
         print("="*60)
         
         anomalies_found = {}
+        plot_data = None
         
         # Analyze enrollment data for anomalies
         if self.enroll_data is not None:
             # Statistical outliers using IQR method
-            Q1 = self.enroll_data['total_enroll'].quantile(0.25)
-            Q3 = self.enroll_data['total_enroll'].quantile(0.75)
+            digest = None
+            if self.cube is not None and self.cube.has('enrollment'):
+                # Quartiles over ALL records from the cube's mergeable t-digests
+                digest = self.cube.total_quantiles('enrollment', qs=[0, 0.25, 0.5, 0.75, 1]).iloc[0]
+                Q1, Q3 = digest[0.25], digest[0.75]
+                print(f"IQR bounds from t-digest over all records (rank error <= {digest['rank_error']:.2%})")
+            else:
+                Q1 = self.enroll_data['total_enroll'].quantile(0.25)
+                Q3 = self.enroll_data['total_enroll'].quantile(0.75)
             IQR = Q3 - Q1
             lower_bound = Q1 - 1.5 * IQR
             upper_bound = Q3 + 1.5 * IQR
@@ -170,54 +278,53 @@ class AdvancedAadhaarAnalytics:
             features = ['age_0_5', 'age_5_17', 'age_18_greater', 'month', 'day']
             X = self.enroll_data[features].fillna(0)
             
+            from sklearn.ensemble import IsolationForest
             iso_forest = IsolationForest(contamination=0.1, random_state=42)
             anomaly_labels = iso_forest.fit_predict(X)
             
             anomalies_found['multivariate_anomalies'] = sum(anomaly_labels == -1)
             
-            # Visualize anomalies
-            fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-            fig.suptitle('Anomaly Detection Results', fontsize=16, fontweight='bold')
-            
-            # Box plot for outliers
-            axes[0,0].boxplot(self.enroll_data['total_enroll'])
-            axes[0,0].set_title('Enrollment Distribution (Box Plot)')
-            axes[0,0].set_ylabel('Total Enrollment')
-            
-            # Histogram with outliers marked
-            axes[0,1].hist(self.enroll_data['total_enroll'], bins=50, alpha=0.7, color='skyblue')
-            axes[0,1].axvline(lower_bound, color='red', linestyle='--', label='Lower Bound')
-            axes[0,1].axvline(upper_bound, color='red', linestyle='--', label='Upper Bound')
-            axes[0,1].set_title('Enrollment Distribution with Outlier Bounds')
-            axes[0,1].set_xlabel('Total Enrollment')
-            axes[0,1].set_ylabel('Frequency')
-            axes[0,1].legend()
+            # Box plot statistics, histogram counts and daily anomaly counts for the figure
+            totals = self.enroll_data['total_enroll']
+            inliers = totals[(totals >= lower_bound) & (totals <= upper_bound)]
+            box = {'med': totals.median(), 'whislo': inliers.min(), 'whishi': inliers.max()}
+            whiskers_sampled = False
+            if digest is not None:
+                # The digest's q=0/q=1 are the exact extremes of all records - whisker ends
+                # whenever they fall inside the bounds, else the in-range ends of the loaded rows
+                box['med'] = digest[0.5]
+                if digest[0] >= lower_bound:
+                    box['whislo'] = digest[0]
+                else:
+                    whiskers_sampled = True
+                if digest[1] <= upper_bound:
+                    box['whishi'] = digest[1]
+                else:
+                    whiskers_sampled = True
+            box.update({'q1': Q1, 'q3': Q3, 'fliers': outliers['total_enroll'].to_numpy()})
             
-            # Anomaly scores
             anomaly_scores = iso_forest.decision_function(X)
-            axes[1,0].hist(anomaly_scores, bins=50, alpha=0.7, color='orange')
-            axes[1,0].set_title('Isolation Forest Anomaly Scores')
-            axes[1,0].set_xlabel('Anomaly Score')
-            axes[1,0].set_ylabel('Frequency')
-            
-            # Time series of anomalies
-            daily_anomalies = self.enroll_data[anomaly_labels == -1].groupby('date').size()
-            if len(daily_anomalies) > 0:
-                axes[1,1].plot(daily_anomalies.index, daily_anomalies.values, marker='o', color='red')
-                axes[1,1].set_title('Daily Anomaly Count')
-                axes[1,1].set_xlabel('Date')
-                axes[1,1].set_ylabel('Number of Anomalies')
-                axes[1,1].tick_params(axis='x', rotation=45)
-            
-            plt.tight_layout()
-            plt.savefig('anomaly_detection.png', dpi=300, bbox_inches='tight')
-            plt.show()
+            # With the cube, the bounds cover all records but everything counted or binned is the loaded rows
+            sample_note = f" ({len(totals):,} sampled rows)" if digest is not None else ''
+            if sample_note:
+                print(f"Outlier, histogram and anomaly counts cover the {len(totals):,} sampled rows only")
+            plot_data = {
+                'box': box,
+                'bounds': (lower_bound, upper_bound),
+                'sample_note': sample_note,
+                'whiskers_sampled': whiskers_sampled,
+                'total_hist': np.histogram(totals, bins=50),
+                'score_hist': np.histogram(anomaly_scores, bins=50),
+                'daily_anomalies': self.enroll_data[anomaly_labels == -1].groupby('date').size(),
+            }
         
         print("\nANOMALY DETECTION RESULTS:")
         for anomaly_type, count in anomalies_found.items():
             print(f"  {anomaly_type.replace('_', ' ').title()}: {count}")
         
-        return anomalies_found
+        if plot_data is None:
+            return anomalies_found
+        return FigureJob('anomaly_detection', plot_anomaly_detection, plot_data, result=anomalies_found)
     
     def correlation_analysis(self):
         """Perform correlation analysis across different data types"""
@@ -229,19 +336,19 @@ class AdvancedAadhaarAnalytics:
         if all([self.bio_data is not None, self.demo_data is not None, self.enroll_data is not None]):
             
             # Aggregate by state and date for correlation
-            bio_agg = self.bio_data.groupby(['state', 'date']).agg({
+            bio_agg = self.bio_data.groupby(['state', 'date'], observed=True).agg({
                 'bio_age_5_17': 'sum',
                 'bio_age_17_': 'sum',
                 'total_bio': 'sum'
             }).reset_index()
             
-            demo_agg = self.demo_data.groupby(['state', 'date']).agg({
+            demo_agg = self.demo_data.groupby(['state', 'date'], observed=True).agg({
                 'demo_age_5_17': 'sum',
                 'demo_age_17_': 'sum',
                 'total_demo': 'sum'
             }).reset_index()
             
-            enroll_agg = self.enroll_data.groupby(['state', 'date']).agg({
+            enroll_agg = self.enroll_data.groupby(['state', 'date'], observed=True).agg({
                 'age_0_5': 'sum',
                 'age_5_17': 'sum',
                 'age_18_greater': 'sum',
@@ -257,16 +364,6 @@ class AdvancedAadhaarAnalytics:
             numeric_cols = combined.select_dtypes(include=[np.number]).columns
             correlation_matrix = combined[numeric_cols].corr()
             
-            # Visualize correlation matrix
-            plt.figure(figsize=(14, 10))
-            mask = np.triu(np.ones_like(correlation_matrix, dtype=bool))
-            sns.heatmap(correlation_matrix, mask=mask, annot=True, cmap='coolwarm', center=0,
-                       square=True, linewidths=0.5, cbar_kws={"shrink": .8})
-            plt.title('Correlation Matrix - Aadhaar Services', fontsize=16, fontweight='bold')
-            plt.tight_layout()
-            plt.savefig('correlation_analysis.png', dpi=300, bbox_inches='tight')
-            plt.show()
-            
             # Print strong correlations
             print("\nSTRONG CORRELATIONS (|r| > 0.7):")
             strong_corr = []
@@ -279,7 +376,7 @@ class AdvancedAadhaarAnalytics:
             for var1, var2, corr in sorted(strong_corr, key=lambda x: abs(x[2]), reverse=True):
                 print(f"  {var1} <-> {var2}: {corr:.3f}")
             
-            return correlation_matrix
+            return FigureJob('correlation_analysis', plot_correlation_analysis, correlation_matrix, result=correlation_matrix)
     
     def predictive_insights(self):
         """Generate predictive insights and trends"""
@@ -314,7 +411,7 @@ class AdvancedAadhaarAnalytics:
                 insights.append(f"Lowest enrollment month: {low_month}")
                 
                 # Weekly patterns
-                weekly_avg = self.enroll_data.groupby('weekday')['total_enroll'].mean()
+                weekly_avg = self.enroll_data.groupby('weekday', observed=True)['total_enroll'].mean()
                 peak_day = weekly_avg.idxmax()
                 days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
                 
@@ -385,29 +482,57 @@ class AdvancedAadhaarAnalytics:
         
         return recommendations
 
+    def analysis_graph(self, cache=None):
+        """Independent analyses as a task graph; none takes another's result
+
+        The figure analyses return FigureJobs; render them with render_figures.
+        """
+        params = {'source': self.data_source, 'use_cube': self.cube is not None}
+        graph = TaskGraph(cache=cache if self.fingerprint else None, fingerprint=self.fingerprint, params=params)
+        graph.add('clustering', self.perform_clustering_analysis)
+        graph.add('anomalies', self.detect_anomalies)
+        graph.add('correlations', self.correlation_analysis)
+        graph.add('predictions', self.predictive_insights)
+        graph.add('recommendations', self.generate_advanced_recommendations)
+        return graph
+
 def main():
     """Execute advanced analytics"""
     print("ADVANCED AADHAAR DATA ANALYTICS")
     print("="*60)
     
+    parser = argparse.ArgumentParser(description="Advanced Aadhaar analytics")
+    parser.add_argument('--cube', action='store_true',
+                        help="cluster districts and set anomaly bounds on ALL records via the persisted aggregate cube")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes for the independent analyses (default: CPU count, 1 = serial)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="recompute every analysis instead of reusing cached results")
+    parser.add_argument('--dpi', type=int, default=DEFAULT_DPI,
+                        help=f"resolution of the rendered figures (default: {DEFAULT_DPI})")
+    parser.add_argument('--format', choices=FIGURE_FORMATS, default=DEFAULT_FORMAT,
+                        help=f"file format of the rendered figures (default: {DEFAULT_FORMAT})")
+    args = parser.parse_args()
+    
     # Initialize advanced analyzer
-    analyzer = AdvancedAadhaarAnalytics()
+    analyzer = AdvancedAadhaarAnalytics(use_cube=args.cube)
     
     # Load and prepare data
     analyzer.load_and_prepare_data()
     
-    # Perform advanced analyses
-    district_clusters = analyzer.perform_clustering_analysis()
-    anomalies = analyzer.detect_anomalies()
-    correlations = analyzer.correlation_analysis()
-    predictions = analyzer.predictive_insights()
+    # Perform advanced analyses and recommendations concurrently
+    cache = None if args.no_cache else ResultCache()
+    graph = analyzer.analysis_graph(cache=cache)
+    results = graph.run(max_workers=args.workers)
+    graph.report()
     
-    # Generate recommendations
-    recommendations = analyzer.generate_advanced_recommendations()
+    # Draw the figures headlessly from their plot data, one worker per figure
+    rendered = render_figures(figure_jobs(results), dpi=args.dpi, fmt=args.format,
+                              max_workers=args.workers, cache=cache)
     
     print("\n" + "="*60)
     print("ADVANCED ANALYSIS COMPLETED!")
-    print("Generated: clustering_analysis.png, anomaly_detection.png, correlation_analysis.png")
+    print(f"Generated: {', '.join(path for path, _, _ in rendered.values())}")
     print("="*60)
 
 if __name__ == "__main__":
@@ -0,0 +1,281 @@
+"""
+Aadhaar DataThon - Columnar Shard Cache
+Typed Parquet cache for the raw api_data_aadhar_* CSV shards
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from data_schema import apply_schema, memory_bytes
+from date_dimension import parse_dates
+
+CACHE_DIR = '.aadhaar_cache'
+CACHE_VERSION = 5
+
+
+def file_checksum(path, chunk_size=1 << 20):
+    """Compute the SHA-1 checksum of a shard file"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ShardCache:
+    """One-time CSV to Parquet conversion, invalidated by shard checksum"""
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.parquet_available = True
+        self._raw_bytes = {}
+
+    def _cache_paths(self, csv_path):
+        """Return the (parquet, metadata) paths used for a shard"""
+        stem = Path(csv_path).stem
+        return self.cache_dir / f"{stem}.parquet", self.cache_dir / f"{stem}.json"
+
+    def _is_fresh(self, csv_path, meta_path):
+        """Check the cached copy against the shard's size, mtime and checksum"""
+        if not meta_path.exists():
+            return False
+
+        with open(meta_path) as f:
+            meta = json.load(f)
+
+        if meta.get('version') != CACHE_VERSION:
+            return False
+
+        stat = os.stat(csv_path)
+        if meta.get('size') != stat.st_size:
+            return False
+        if meta.get('mtime_ns') == stat.st_mtime_ns:
+            return True
+
+        # Same size but touched - only the checksum can tell
+        if meta.get('checksum') != file_checksum(csv_path):
+            return False
+
+        meta['mtime_ns'] = stat.st_mtime_ns
+        with open(meta_path, 'w') as f:
+            json.dump(meta, f, indent=2)
+        return True
+
+    def _parse_csv(self, csv_path):
+        """Parse a raw shard into a typed frame, returning it with its raw footprint"""
+        df = pd.read_csv(csv_path)
+        if 'date' in df.columns:
+            df['date'] = parse_dates(df['date'])
+        raw_bytes = memory_bytes(df)
+        return apply_schema(df), raw_bytes
+
+    def _write(self, df, csv_path, parquet_path, meta_path, raw_bytes):
+        """Persist a parsed shard and its checksum metadata atomically"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        tmp_path = parquet_path.with_suffix('.parquet.tmp')
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, parquet_path)
+
+        self._write_meta(csv_path, meta_path, len(df), raw_bytes, memory_bytes(df))
+
+    def _write_meta(self, csv_path, meta_path, rows, raw_bytes, typed_bytes):
+        """Record a cached shard's source version and footprints"""
+        stat = os.stat(csv_path)
+        meta = {
+            'version': CACHE_VERSION,
+            'source': str(csv_path),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'checksum': file_checksum(csv_path),
+            'rows': rows,
+            'raw_bytes': raw_bytes,
+            'typed_bytes': typed_bytes,
+        }
+        with open(meta_path, 'w') as f:
+            json.dump(meta, f, indent=2)
+
+    def read_shard(self, csv_path, columns=None):
+        """Read a shard from the columnar cache, converting it on first use"""
+        parquet_path, meta_path = self._cache_paths(csv_path)
+
+        if self.parquet_available and parquet_path.exists() and self._is_fresh(csv_path, meta_path):
+            try:
+                # Shards cached while streaming store widened integers - narrow them again
+                return apply_schema(pd.read_parquet(parquet_path, columns=columns))
+            except ImportError:
+                self.parquet_available = False
+
+        df, raw_bytes = self._parse_csv(csv_path)
+        self._raw_bytes[str(csv_path)] = (raw_bytes, len(df))
+
+        if self.parquet_available:
+            try:
+                self._write(df, csv_path, parquet_path, meta_path, raw_bytes)
+            except ImportError:
+                # No Parquet engine installed - fall back to plain CSV parsing
+                self.parquet_available = False
+                print("⚠️ pyarrow not installed, shard cache disabled")
+
+        return df[columns] if columns is not None else df
+
+    def iter_shard(self, csv_path, batch_rows):
+        """Yield a shard as typed frames of at most batch_rows rows, never loading it whole"""
+        parquet_path, meta_path = self._cache_paths(csv_path)
+
+        if self.parquet_available and parquet_path.exists() and self._is_fresh(csv_path, meta_path):
+            try:
+                import pyarrow.parquet as pq
+            except ImportError:
+                self.parquet_available = False
+            else:
+                for batch in pq.ParquetFile(parquet_path).iter_batches(batch_size=batch_rows):
+                    yield apply_schema(batch.to_pandas())
+                return
+
+        writer = _StreamingWriter(self, csv_path) if self.parquet_available else None
+        rows = raw_bytes = 0
+        try:
+            for chunk in pd.read_csv(csv_path, chunksize=batch_rows):
+                if 'date' in chunk.columns:
+                    chunk['date'] = parse_dates(chunk['date'])
+                rows += len(chunk)
+                raw_bytes += memory_bytes(chunk)
+                chunk = apply_schema(chunk)
+                if writer is not None and not writer.write(chunk):
+                    writer = None
+                yield chunk
+        except BaseException:
+            # Abandoned or failed part way - never publish a partial shard
+            if writer is not None:
+                writer.abort()
+            raise
+
+        self._raw_bytes[str(csv_path)] = (raw_bytes, rows)
+        if writer is not None:
+            writer.close(rows, raw_bytes)
+
+    def typed_bytes_per_row(self, csv_path, default=256):
+        """Return the typed in-memory bytes per row recorded for a shard"""
+        _, meta_path = self._cache_paths(csv_path)
+        if not meta_path.exists():
+            return default
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if not meta.get('rows') or not meta.get('typed_bytes'):
+            return default
+        return max(1, meta['typed_bytes'] // meta['rows'])
+
+    def estimate_raw_bytes(self, csv_path, rows=None):
+        """Estimate the untyped (object/int64) footprint of rows loaded from a shard
+
+        Uses the footprint measured when the shard was parsed; a shard never
+        parsed in this cache falls back to its CSV file size for all its rows.
+        """
+        raw_bytes, shard_rows = 0, 0
+        if str(csv_path) in self._raw_bytes:
+            raw_bytes, shard_rows = self._raw_bytes[str(csv_path)]
+        else:
+            _, meta_path = self._cache_paths(csv_path)
+            if meta_path.exists():
+                with open(meta_path) as f:
+                    meta = json.load(f)
+                raw_bytes, shard_rows = meta.get('raw_bytes', 0), meta.get('rows', 0)
+
+        if not raw_bytes:
+            return os.path.getsize(csv_path)
+        if rows is None or not shard_rows:
+            return raw_bytes
+        return int(raw_bytes * rows / shard_rows)
+
+
+class _StreamingWriter:
+    """Writes a shard's typed chunks to the Parquet cache while it is being streamed
+
+    Chunks narrow their integers and categories independently, so every chunk is
+    cast to one schema with int64 integers and int32 dictionary indices. If a
+    later chunk cannot take that schema (a count column that gained missing
+    values, say) the partial file is dropped and the shard stays uncached.
+    """
+
+    def __init__(self, cache, csv_path):
+        self.cache = cache
+        self.csv_path = csv_path
+        self.parquet_path, self.meta_path = cache._cache_paths(csv_path)
+        self.tmp_path = self.parquet_path.with_suffix('.parquet.tmp')
+        self.writer = None
+        self.typed_bytes = 0
+
+    def _schema(self, schema):
+        """Widen a chunk's schema so every chunk of the shard can be cast to it"""
+        import pyarrow as pa
+
+        fields = []
+        for field in schema:
+            if pa.types.is_dictionary(field.type):
+                field = field.with_type(pa.dictionary(pa.int32(), field.type.value_type))
+            elif pa.types.is_integer(field.type):
+                field = field.with_type(pa.int64())
+            fields.append(field)
+        return pa.schema(fields, metadata=schema.metadata)
+
+    def write(self, chunk):
+        """Append a typed chunk; returns False once the shard cannot be cached"""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            self.cache.parquet_available = False
+            print("⚠️ pyarrow not installed, shard cache disabled")
+            return False
+
+        try:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self.writer is None:
+                self.cache.cache_dir.mkdir(parents=True, exist_ok=True)
+                self.writer = pq.ParquetWriter(self.tmp_path, self._schema(table.schema))
+            self.writer.write_table(table.cast(self.writer.schema))
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError, OSError):
+            self.abort()
+            return False
+        self.typed_bytes += memory_bytes(chunk)
+        return True
+
+    def abort(self):
+        """Discard the partially written file"""
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        if self.tmp_path.exists():
+            self.tmp_path.unlink()
+
+    def close(self, rows, raw_bytes):
+        """Publish the finished file and its metadata"""
+        if self.writer is None:
+            return
+        self.writer.close()
+        self.writer = None
+        os.replace(self.tmp_path, self.parquet_path)
+        self.cache._write_meta(self.csv_path, self.meta_path, rows, raw_bytes, self.typed_bytes)
+
+
+_default_cache = ShardCache()
+
+
+def read_shard(csv_path, columns=None):
+    """Read a shard through the default on-disk cache"""
+    return _default_cache.read_shard(csv_path, columns=columns)
+
+
+def iter_shard(csv_path, batch_rows):
+    """Stream a shard in bounded batches through the default cache"""
+    return _default_cache.iter_shard(csv_path, batch_rows)
+
+
+def estimate_raw_bytes(csv_path, rows=None):
+    """Estimate the untyped footprint of rows read through the default cache"""
+    return _default_cache.estimate_raw_bytes(csv_path, rows=rows)
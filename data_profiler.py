@@ -0,0 +1,150 @@
+"""
+Aadhaar DataThon - Streaming Data-Quality Profiler
+One pass over every shard producing a machine-readable column profile
+"""
+
+import json
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype, is_numeric_dtype
+
+from data_cache import ShardCache
+from sketches import HyperLogLog
+
+# Rows per chunk while profiling
+PROFILE_BATCH_ROWS = 250000
+
+# Exact value counts are kept only while a column stays below this many distinct values
+TOP_VALUES_MAX_DISTINCT = 100000
+TOP_VALUES = 10
+
+
+class ColumnProfile:
+    """Mergeable running statistics of one column"""
+
+    def __init__(self):
+        self.count = 0
+        self.nulls = 0
+        self.minimum = None
+        self.maximum = None
+        # Running mean and sum of squared deviations (Chan et al. parallel update)
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.numeric = False
+        self.distinct = HyperLogLog()
+        self.value_counts = pd.Series(dtype=np.int64)
+
+    def update(self, series):
+        """Fold one chunk of the column into the profile"""
+        values = series.dropna()
+        self.nulls += len(series) - len(values)
+        if not len(values):
+            return
+
+        if is_numeric_dtype(values) or is_datetime64_any_dtype(values):
+            low, high = values.min(), values.max()
+            self.minimum = low if self.minimum is None else min(self.minimum, low)
+            self.maximum = high if self.maximum is None else max(self.maximum, high)
+
+        n = len(values)
+        if is_numeric_dtype(values) and not isinstance(values.dtype, pd.CategoricalDtype):
+            self.numeric = True
+            data = values.to_numpy(dtype=np.float64)
+            chunk_mean = data.mean()
+            chunk_m2 = ((data - chunk_mean) ** 2).sum()
+            total = self.count + n
+            delta = chunk_mean - self.mean
+            self.mean += delta * n / total
+            self.m2 += chunk_m2 + delta ** 2 * self.count * n / total
+        self.count += n
+
+        self.distinct.add(values)
+        if self.value_counts is not None:
+            counts = values.value_counts(sort=False)
+            if isinstance(counts.index, pd.CategoricalIndex):
+                counts.index = counts.index.astype(object)
+            self.value_counts = self.value_counts.add(counts[counts > 0], fill_value=0)
+            if len(self.value_counts) > TOP_VALUES_MAX_DISTINCT:
+                # Too many distinct values to count exactly within budget
+                self.value_counts = None
+
+    @staticmethod
+    def _jsonable(value):
+        """Convert numpy / pandas scalars for JSON output"""
+        if value is None:
+            return None
+        if isinstance(value, pd.Timestamp):
+            return value.strftime('%Y-%m-%d')
+        if isinstance(value, np.generic):
+            return value.item()
+        return value
+
+    def to_dict(self):
+        """Machine-readable summary of the column"""
+        total = self.count + self.nulls
+        profile = {
+            'count': self.count,
+            'nulls': self.nulls,
+            'null_pct': round(self.nulls / total * 100, 4) if total else 0.0,
+            'approx_distinct': self.distinct.count(),
+            'min': self._jsonable(self.minimum),
+            'max': self._jsonable(self.maximum),
+        }
+        if self.numeric:
+            profile['mean'] = self.mean
+            profile['variance'] = self.m2 / (self.count - 1) if self.count > 1 else None
+        if self.value_counts is not None:
+            top = self.value_counts.sort_values(ascending=False).head(TOP_VALUES)
+            profile['top_values'] = [[str(self._jsonable(value)), int(count)] for value, count in top.items()]
+        else:
+            profile['top_values'] = None
+        return profile
+
+
+class StreamingProfiler:
+    """Profile every column of every shard in a single chunked read"""
+
+    def __init__(self, batch_rows=PROFILE_BATCH_ROWS, cache=None):
+        self.batch_rows = batch_rows
+        self.cache = cache or ShardCache()
+
+    def profile_dataset(self, file_list, frame=None):
+        """Profile one dataset's shards, returning a JSON-ready dict
+
+        A frame already holding the shards' records is profiled in place of
+        reading them again.
+        """
+        if frame is None:
+            chunks = (chunk for file in file_list for chunk in self.cache.iter_shard(file, self.batch_rows))
+        else:
+            chunks = (frame.iloc[start:start + self.batch_rows] for start in range(0, len(frame), self.batch_rows))
+
+        columns = {}
+        rows = 0
+        for chunk in chunks:
+            rows += len(chunk)
+            for col in chunk.columns:
+                columns.setdefault(col, ColumnProfile()).update(chunk[col])
+
+        profile = {
+            'rows': rows,
+            'shards': list(file_list),
+            'columns': {col: column.to_dict() for col, column in columns.items()},
+        }
+        if 'date' in columns:
+            profile['date_range'] = [profile['columns']['date']['min'], profile['columns']['date']['max']]
+        return profile
+
+    def profile(self, file_lists, output_path=None, frames=None):
+        """Profile every dataset (from frames where given) and optionally write the profile as JSON"""
+        frames = frames or {}
+        report = {
+            'generated': datetime.now().isoformat(timespec='seconds'),
+            'datasets': {name: self.profile_dataset(files, frames.get(name)) for name, files in file_lists.items()},
+        }
+        if output_path:
+            with open(output_path, 'w') as f:
+                json.dump(report, f, indent=2)
+        return report
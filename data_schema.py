@@ -0,0 +1,110 @@
+"""
+Aadhaar DataThon - Canonical Data Schema
+Compact typed schema shared by every loader
+"""
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype, union_categoricals
+
+from geography import CANONICALIZERS, canonicalize_categorical
+
+# Geography is low-cardinality text - store as dictionary-encoded categoricals
+# with variant spellings merged into one canonical category
+CATEGORICAL_COLUMNS = ['state', 'district']
+
+# Per-dataset age count columns and the derived total column
+COUNT_COLUMNS = {
+    'biometric': ['bio_age_5_17', 'bio_age_17_'],
+    'demographic': ['demo_age_5_17', 'demo_age_17_'],
+    'enrollment': ['age_0_5', 'age_5_17', 'age_18_greater'],
+}
+
+TOTAL_COLUMNS = {
+    'biometric': 'total_bio',
+    'demographic': 'total_demo',
+    'enrollment': 'total_enroll',
+}
+
+# Fixed-width columns
+FIXED_DTYPES = {
+    'pincode': 'int32',
+    'month': 'uint8',
+    'day': 'uint8',
+    'weekday': 'uint8',
+}
+
+WEEKDAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+def memory_bytes(df):
+    """Return the deep in-memory size of a frame in bytes"""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def format_footprint(label, before, after):
+    """Format a before/after memory footprint line"""
+    saved = f"{(1 - after / before) * 100:.0f}% smaller" if before else "n/a"
+    return f"{label} memory: {before / 1e6:,.1f} MB → {after / 1e6:,.1f} MB ({saved})"
+
+
+def narrow_unsigned(series):
+    """Downcast a non-negative integer count column to the narrowest safe unsigned type"""
+    if series.isnull().any() or not np.issubdtype(series.dtype, np.number):
+        return series
+    if len(series) and series.min() < 0:
+        return series
+    return pd.to_numeric(series, downcast='unsigned')
+
+
+def apply_schema(df):
+    """Cast a frame to the canonical compact schema in place and return it"""
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = canonicalize_categorical(df[col], CANONICALIZERS[col])
+
+    for col, dtype in FIXED_DTYPES.items():
+        if col not in df.columns or not is_numeric_dtype(df[col]):
+            continue
+        if df[col].dtype != dtype and not df[col].isnull().any():
+            df[col] = df[col].astype(dtype)
+
+    for cols in COUNT_COLUMNS.values():
+        for col in cols:
+            if col in df.columns:
+                df[col] = narrow_unsigned(df[col])
+
+    for col in TOTAL_COLUMNS.values():
+        if col in df.columns:
+            df[col] = narrow_unsigned(df[col])
+
+    return df
+
+
+def add_total_column(df, dataset):
+    """Add the dataset's total column without overflowing narrow count types"""
+    total = df[COUNT_COLUMNS[dataset]].sum(axis=1)
+    df[TOTAL_COLUMNS[dataset]] = narrow_unsigned(total)
+    return df
+
+
+def weekday_names(dayofweek):
+    """Build an ordered weekday-name categorical from day-of-week codes (-1 for missing)"""
+    return pd.Categorical.from_codes(dayofweek, categories=WEEKDAY_NAMES, ordered=True)
+
+
+def concat_frames(frames):
+    """Concatenate shards while keeping categorical columns categorical"""
+    frames = [df for df in frames if df is not None]
+    if not frames:
+        return None
+
+    # pd.concat falls back to object dtype when category sets differ
+    for col in CATEGORICAL_COLUMNS:
+        if all(col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype) for df in frames):
+            categories = union_categoricals([df[col].array for df in frames], ignore_order=True).categories
+            for df in frames:
+                df[col] = df[col].cat.set_categories(categories)
+
+    combined = pd.concat(frames, ignore_index=True)
+    return apply_schema(combined)
@@ -0,0 +1,68 @@
+"""
+Aadhaar DataThon - Date Dimension
+Calendar attributes derived once per distinct date and joined back by code
+"""
+
+import numpy as np
+import pandas as pd
+
+from data_schema import weekday_names
+
+DATE_FORMAT = '%d-%m-%Y'
+
+# Attributes attached to every loaded frame; the dimension also carries week_of_year and quarter
+CALENDAR_COLUMNS = ['month', 'day', 'weekday']
+
+
+def parse_dates(values, date_format=DATE_FORMAT):
+    """Parse a column of date strings once per distinct value"""
+    codes, uniques = pd.factorize(values)
+    parsed = pd.to_datetime(pd.Index(uniques), format=date_format)
+    dates = pd.Series(parsed[codes], index=values.index, name=values.name)
+    if (codes < 0).any():
+        dates[codes < 0] = pd.NaT
+    return dates
+
+
+def build_date_dimension(dates):
+    """Factorize a datetime column into integer codes and a per-date attribute table
+
+    Returns (codes, dimension) where dimension.iloc[code] describes each distinct
+    date. Missing dates get code -1.
+    """
+    codes, uniques = pd.factorize(dates, sort=True)
+    uniques = pd.DatetimeIndex(uniques)
+    dimension = pd.DataFrame({
+        'date': uniques,
+        'month': uniques.month.astype(np.uint8),
+        'day': uniques.day.astype(np.uint8),
+        'weekday': uniques.dayofweek.astype(np.uint8),
+        'week_of_year': uniques.isocalendar().week.to_numpy().astype(np.uint8),
+        'quarter': uniques.quarter.astype(np.uint8),
+    })
+    return codes.astype(np.int32), dimension
+
+
+def _lookup(values, codes, missing):
+    """Join a dimension attribute back onto rows, leaving missing dates as NaN"""
+    if not missing.any():
+        return values[codes]
+    joined = values.astype(np.float64)[codes]
+    joined[missing] = np.nan
+    return joined
+
+
+def add_calendar_columns(df, weekday_as_names=False, columns=CALENDAR_COLUMNS):
+    """Attach calendar attributes to a frame with one lookup per row instead of per-row date math"""
+    codes, dimension = build_date_dimension(df['date'])
+    missing = codes < 0
+
+    for col in columns:
+        values = dimension[col].to_numpy()
+        if col == 'weekday' and weekday_as_names:
+            dayofweek = values[codes].astype(np.int8)
+            dayofweek[missing] = -1
+            df[col] = weekday_names(dayofweek)
+        else:
+            df[col] = _lookup(values, codes, missing)
+    return df
@@ -0,0 +1,47 @@
+"""
+Aadhaar DataThon - Duplicate Record Detection
+Hash-based detection of records repeated within and across shards
+"""
+
+import numpy as np
+import pandas as pd
+
+# A record is identified by where and when it was reported
+DEDUP_KEYS = ['date', 'state', 'district', 'pincode']
+
+
+def key_hashes(df, keys=DEDUP_KEYS):
+    """64-bit hash of each row's key columns (categoricals hash by value, not code)"""
+    return pd.util.hash_pandas_object(df[keys], index=False).to_numpy()
+
+
+class DuplicateReport:
+    """Duplicate keys found across a dataset's shards, with per-shard drop masks"""
+
+    def __init__(self, files, frames, keys=DEDUP_KEYS):
+        self.files = list(files)
+        self.rows = sum(len(df) for df in frames)
+
+        hashes = np.concatenate([key_hashes(df, keys) for df in frames]) if frames else np.empty(0, np.uint64)
+        shard_ids = np.repeat(np.arange(len(frames)), [len(df) for df in frames])
+
+        # One hash-table pass: repeats of a key, and the shard holding its first copy
+        repeated = pd.Series(hashes).duplicated(keep='first').to_numpy()
+        first_shard = pd.Series(shard_ids).groupby(hashes).transform('first').to_numpy()
+
+        cross = repeated & (shard_ids != first_shard)
+        self.cross_shard = int(cross.sum())
+        self.within_shard = int((repeated & ~cross).sum())
+
+        bounds = np.cumsum([0] + [len(df) for df in frames])
+        self._cross_masks = [cross[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+        self.by_shard = {file: int(mask.sum()) for file, mask in zip(self.files, self._cross_masks) if mask.any()}
+
+    def summary(self, label):
+        """One-line description of the duplicates found"""
+        return (f"{label}: {self.cross_shard:,} cross-shard and {self.within_shard:,} within-shard "
+                f"duplicate keys in {self.rows:,} records")
+
+    def drop_cross_shard(self, frames):
+        """Remove rows whose key already appeared in an earlier shard"""
+        return [df[~mask] if mask.any() else df for df, mask in zip(frames, self._cross_masks)]
@@ -0,0 +1,149 @@
+"""
+Aadhaar DataThon - Figure Rendering
+Headless, concurrent rendering of analysis figures from their pre-aggregated plot data
+"""
+
+import hashlib
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+
+from result_cache import code_version, result_key
+
+# Output settings used when a script is not told otherwise
+DEFAULT_DPI = 300
+DEFAULT_FORMAT = 'png'
+
+# Formats the Agg canvas (and its vector siblings) can save without a display
+FIGURE_FORMATS = ('png', 'jpg', 'svg', 'pdf')
+
+
+class FigureJob:
+    """One figure to render: its file name stem, a module-level plot function and the data it draws
+
+    render(data) builds and returns a matplotlib figure. The data is already
+    aggregated (group totals, histogram counts, small tables), so a job is cheap
+    to pickle into a worker. result carries the analysis's own return value
+    alongside its plot data.
+    """
+
+    def __init__(self, name, render, data, result=None):
+        self.name = name
+        self.render = render
+        self.data = data
+        self.result = result
+
+    def filename(self, fmt=DEFAULT_FORMAT):
+        """File the rendered figure is saved to"""
+        return f"{self.name}.{fmt}"
+
+    def __repr__(self):
+        return f"<FigureJob {self.name} via {self.render.__name__}>"
+
+
+def figure_jobs(results):
+    """FigureJobs among a task graph's results"""
+    return [result for result in results.values() if isinstance(result, FigureJob)]
+
+
+def _render_job(job, dpi, fmt):
+    """Worker: draw one job on the Agg backend and save it, returning (path, wall seconds, CPU seconds)"""
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+    import matplotlib.pyplot as plt
+
+    wall, cpu = time.perf_counter(), time.process_time()
+    fig = job.render(job.data)
+    path = job.filename(fmt)
+    fig.savefig(path, dpi=dpi, format=fmt, bbox_inches='tight')
+    plt.close(fig)
+    return path, time.perf_counter() - wall, time.process_time() - cpu
+
+
+def _digest(value, digest):
+    """Fold plot data into a hash by value, so equal data hashes alike however it was built or restored"""
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        digest.update(type(value).__name__.encode())
+        if isinstance(value, pd.DataFrame):
+            digest.update(repr(list(value.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=not isinstance(value, pd.Index)).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(f"{value.dtype.str}{value.shape}".encode())
+        digest.update(np.ascontiguousarray(value).tobytes() if value.dtype != object else repr(value.tolist()).encode())
+    elif isinstance(value, dict):
+        digest.update(b'{')
+        for key in sorted(value, key=repr):
+            digest.update(repr(key).encode())
+            _digest(value[key], digest)
+        digest.update(b'}')
+    elif isinstance(value, (list, tuple)):
+        digest.update(b'[')
+        for item in value:
+            _digest(item, digest)
+        digest.update(b']')
+    else:
+        digest.update(repr(value.item() if isinstance(value, np.generic) else value).encode())
+    return digest
+
+
+def _job_key(job, dpi, fmt):
+    """Content address of a rendered figure: its plot data, the plot code and the output settings"""
+    data = _digest(job.data, hashlib.sha256()).hexdigest()
+    return result_key(f"figure:{job.name}", data, {'dpi': dpi, 'format': fmt}, code_version(job.render))
+
+
+def render_figures(jobs, dpi=DEFAULT_DPI, fmt=DEFAULT_FORMAT, max_workers=None, cache=None):
+    """Render FigureJobs concurrently in worker processes and print a per-figure timing log
+
+    Returns {name: (path, wall seconds, CPU seconds)}; a figure restored from the
+    result cache reports zero seconds. Without fork (or if the pool breaks) the
+    figures render one after another in this process, still on Agg.
+    """
+    if fmt not in FIGURE_FORMATS:
+        raise ValueError(f"Unsupported figure format {fmt!r}; choose from {', '.join(FIGURE_FORMATS)}")
+    jobs = [job for job in jobs if job is not None]
+    timings, pending, keys = {}, [], {}
+    start = time.perf_counter()
+
+    for job in jobs:
+        if cache is not None:
+            keys[job.name] = _job_key(job, dpi, fmt)
+            hit, path = cache.get(keys[job.name])
+            if hit:
+                timings[job.name] = (path, 0.0, 0.0)
+                continue
+        pending.append(job)
+
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(pending)))
+    print(f"\n🖼️ Rendering {len(pending)} figures at {dpi} dpi as {fmt.upper()} "
+          f"({workers} worker{'s' if workers != 1 else ''}, {len(jobs) - len(pending)} cached)")
+
+    rendered = {}
+    if workers > 1 and 'fork' in multiprocessing.get_all_start_methods():
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork')) as pool:
+                futures = {job.name: pool.submit(_render_job, job, dpi, fmt) for job in pending}
+                rendered = {name: future.result() for name, future in futures.items()}
+        except (BrokenProcessPool, OSError) as e:
+            print(f"⚠️ Figure pool unavailable ({e}); rendering serially")
+            rendered = {}
+    for job in pending:
+        if job.name not in rendered:
+            rendered[job.name] = _render_job(job, dpi, fmt)
+
+    for job in pending:
+        timings[job.name] = rendered[job.name]
+        if cache is not None:
+            cache.put(keys[job.name], rendered[job.name][0], artifacts=[rendered[job.name][0]])
+
+    for job in jobs:
+        path, wall, cpu = timings[job.name]
+        source = "cached" if job not in pending else f"{wall:6.2f}s wall {cpu:6.2f}s CPU"
+        print(f"   {path:<36} {source}")
+    print(f"   {'All figures':<36} {time.perf_counter() - start:6.2f}s elapsed")
+    return {job.name: timings[job.name] for job in jobs}
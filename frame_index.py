@@ -0,0 +1,75 @@
+"""
+Aadhaar DataThon - State/Date Frame Index
+Rows sorted by (state, date) with per-state offsets, so dashboard filters resolve to slices
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class StateDateIndex:
+    """A frame sorted by (state, date) plus the row range of every state
+
+    A (date range, states) filter becomes one binary search per selected state
+    over that state's sorted dates. Each match is a contiguous row range, and
+    ranges that touch are merged: a single range comes back as a zero-copy
+    iloc view, several are gathered with one take. Filtering therefore costs
+    time proportional to the rows returned, not the rows stored.
+    """
+
+    def __init__(self, frame):
+        states = frame['state']
+        codes = states.cat.codes.to_numpy() if isinstance(states.dtype, pd.CategoricalDtype) else pd.factorize(states)[0]
+        # Missing dates sort last within their state, so a finite date range never selects them
+        order = np.lexsort((frame['date'].to_numpy(), codes))
+        self.frame = frame.take(order).reset_index(drop=True)
+        self.dates = self.frame['date'].to_numpy()
+
+        sorted_codes = codes[order]
+        boundaries = np.flatnonzero(np.diff(sorted_codes)) + 1
+        starts = np.concatenate([[0], boundaries]).astype(np.int64)
+        stops = np.concatenate([boundaries, [len(self.frame)]]).astype(np.int64)
+        names = self.frame['state'].to_numpy()
+        self.offsets = {names[start]: (int(start), int(stop))
+                        for start, stop in zip(starts, stops) if stop > start}
+
+        # Filter widget bounds, so a rerun never scans the frame for them
+        valid = self.dates[~pd.isna(self.dates)]
+        self.min_date = valid.min() if len(valid) else None
+        self.max_date = valid.max() if len(valid) else None
+
+    def __len__(self):
+        return len(self.frame)
+
+    @property
+    def states(self):
+        """States present in the frame"""
+        return list(self.offsets)
+
+    def ranges(self, start, end, states=None):
+        """Merged (start row, stop row) ranges of the rows dated start..end in the given states (all if empty)"""
+        lo_date = np.datetime64(pd.Timestamp(start), 'ns')
+        hi_date = np.datetime64(pd.Timestamp(end), 'ns')
+        spans = [self.offsets[state] for state in (states or self.offsets) if state in self.offsets]
+
+        ranges = []
+        for first, last in sorted(spans):
+            dates = self.dates[first:last]
+            lo = first + int(np.searchsorted(dates, lo_date, side='left'))
+            hi = first + int(np.searchsorted(dates, hi_date, side='right'))
+            if lo >= hi:
+                continue
+            if ranges and ranges[-1][1] == lo:
+                ranges[-1] = (ranges[-1][0], hi)
+            else:
+                ranges.append((lo, hi))
+        return ranges
+
+    def select(self, start, end, states=None):
+        """Rows dated start..end (inclusive) in the given states, as a view when they are contiguous"""
+        ranges = self.ranges(start, end, states)
+        if not ranges:
+            return self.frame.iloc[0:0]
+        if len(ranges) == 1:
+            return self.frame.iloc[ranges[0][0]:ranges[0][1]]
+        return self.frame.take(np.concatenate([np.arange(lo, hi) for lo, hi in ranges]))
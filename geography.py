@@ -0,0 +1,134 @@
+"""
+Aadhaar DataThon - Geography Normalization
+Canonical state and district names applied as a categorical remap
+"""
+
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Centre of India, used to frame maps
+INDIA_CENTER = [20.5937, 78.9629]
+
+# Canonical state / UT names and their approximate centre coordinates
+STATE_COORDINATES = {
+    'Andhra Pradesh': [15.9129, 79.7400],
+    'Arunachal Pradesh': [28.2180, 94.7278],
+    'Assam': [26.2006, 92.9376],
+    'Bihar': [25.0961, 85.3131],
+    'Chhattisgarh': [21.2787, 81.8661],
+    'Goa': [15.2993, 74.1240],
+    'Gujarat': [23.0225, 72.5714],
+    'Haryana': [29.0588, 76.0856],
+    'Himachal Pradesh': [31.1048, 77.1734],
+    'Jharkhand': [23.6102, 85.2799],
+    'Karnataka': [15.3173, 75.7139],
+    'Kerala': [10.8505, 76.2711],
+    'Madhya Pradesh': [22.9734, 78.6569],
+    'Maharashtra': [19.7515, 75.7139],
+    'Manipur': [24.6637, 93.9063],
+    'Meghalaya': [25.4670, 91.3662],
+    'Mizoram': [23.1645, 92.9376],
+    'Nagaland': [26.1584, 94.5624],
+    'Odisha': [20.9517, 85.0985],
+    'Punjab': [31.1471, 75.3412],
+    'Rajasthan': [27.0238, 74.2179],
+    'Sikkim': [27.5330, 88.5122],
+    'Tamil Nadu': [11.1271, 78.6569],
+    'Telangana': [18.1124, 79.0193],
+    'Tripura': [23.9408, 91.9882],
+    'Uttar Pradesh': [26.8467, 80.9462],
+    'Uttarakhand': [30.0668, 79.0193],
+    'West Bengal': [22.9868, 87.8550],
+    'Andaman and Nicobar Islands': [11.7401, 92.6586],
+    'Chandigarh': [30.7333, 76.7794],
+    'Dadra and Nagar Haveli and Daman and Diu': [20.1809, 73.0169],
+    'Delhi': [28.7041, 77.1025],
+    'Jammu and Kashmir': [34.0837, 74.7973],
+    'Ladakh': [34.1526, 77.5771],
+    'Lakshadweep': [10.5667, 72.6417],
+    'Puducherry': [11.9416, 79.8083],
+}
+
+# Legacy names, abbreviations and common misspellings seen in the raw shards
+STATE_ALIASES = {
+    'Orissa': 'Odisha',
+    'Pondicherry': 'Puducherry',
+    'Uttaranchal': 'Uttarakhand',
+    'Chhatisgarh': 'Chhattisgarh',
+    'Tamilnadu': 'Tamil Nadu',
+    'Westbengal': 'West Bengal',
+    'West Bangal': 'West Bengal',
+    'Telengana': 'Telangana',
+    'NCT of Delhi': 'Delhi',
+    'New Delhi': 'Delhi',
+    'Andaman and Nicobar': 'Andaman and Nicobar Islands',
+    'Dadra and Nagar Haveli': 'Dadra and Nagar Haveli and Daman and Diu',
+    'Daman and Diu': 'Dadra and Nagar Haveli and Daman and Diu',
+    'The Dadra and Nagar Haveli and Daman and Diu': 'Dadra and Nagar Haveli and Daman and Diu',
+}
+
+# Renamed districts, keyed by normalized old name
+DISTRICT_ALIASES = {
+    'gurgaon': 'Gurugram',
+    'allahabad': 'Prayagraj',
+    'faizabad': 'Ayodhya',
+    'hoshangabad': 'Narmadapuram',
+    'aurangabad maharashtra': 'Chhatrapati Sambhajinagar',
+}
+
+
+def normalize_key(name):
+    """Case, punctuation and whitespace-insensitive lookup key for a place name"""
+    text = str(name).lower().replace('&', ' and ')
+    text = re.sub(r'[^a-z0-9\- ]', ' ', text)
+    return ' '.join(text.split())
+
+
+_STATE_INDEX = {normalize_key(state): state for state in STATE_COORDINATES}
+_STATE_INDEX.update({normalize_key(alias): state for alias, state in STATE_ALIASES.items()})
+
+
+@lru_cache(maxsize=None)
+def canonical_state(name):
+    """Canonical spelling of a state name (unknown names are tidied, not dropped)"""
+    key = normalize_key(name)
+    return _STATE_INDEX.get(key, key.title())
+
+
+@lru_cache(maxsize=None)
+def canonical_district(name):
+    """Canonical spelling of a district name (only known renames change; others keep their spelling)"""
+    return DISTRICT_ALIASES.get(normalize_key(name), ' '.join(str(name).split()))
+
+
+CANONICALIZERS = {
+    'state': canonical_state,
+    'district': canonical_district,
+}
+
+
+def canonicalize_categorical(values, canonical):
+    """Remap a categorical column to canonical names, merging variant spellings
+
+    Names are resolved once per category; rows are remapped with a single
+    integer take over the category codes.
+    """
+    categorical = pd.Categorical(values)
+    categories = list(categorical.categories)
+    mapped = [canonical(category) for category in categories]
+    if mapped == categories:
+        return categorical
+
+    canonical_categories = pd.Index(sorted(set(mapped)))
+    lookup = canonical_categories.get_indexer(mapped)
+    codes = categorical.codes
+    remapped = np.where(codes >= 0, lookup[codes], -1)
+    return pd.Categorical.from_codes(remapped, categories=canonical_categories)
+
+
+def unknown_states(states):
+    """States without a known canonical entry (no map coordinates)"""
+    return sorted({state for state in states if state not in STATE_COORDINATES})
@@ -0,0 +1,126 @@
+"""
+Aadhaar DataThon - Import-Time Benchmark
+Cold and warm import time per module, and --help latency of every CLI entry point
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Modules imported by the entry points, lightest first
+MODULES = [
+    'data_schema', 'data_cache', 'shard_manifest', 'parallel_ingest', 'sampling',
+    'olap_cube', 'frame_index', 'task_graph', 'result_cache', 'figure_rendering', 'pdf_assembly', 'data_profiler',
+    'data_exploration', 'aadhaar_analysis', 'advanced_insights', 'pdf_report_generator',
+    'run_analysis', 'interactive_dashboard',
+]
+
+# Scripts whose --help should answer within the startup budget
+CLI_SCRIPTS = [
+    'data_exploration.py', 'aadhaar_analysis.py', 'advanced_insights.py',
+    'pdf_report_generator.py', 'run_analysis.py', 'launch_dashboard.py',
+]
+
+# Startup budget for --help and the dashboard's first paint, in seconds
+STARTUP_BUDGET = 1.0
+
+_TIMER = "import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+
+
+def _run(args, pycache_prefix=None, importtime=False):
+    """Run a fresh interpreter in the repo directory, returning (wall seconds, stdout, stderr)
+
+    pycache_prefix points bytecode at an empty directory, forcing a cold compile.
+    """
+    env = dict(os.environ, MPLBACKEND='Agg')
+    if pycache_prefix:
+        env['PYTHONPYCACHEPREFIX'] = pycache_prefix
+    flags = ['-X', 'importtime'] if importtime else []
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable] + flags + args, cwd=REPO_DIR, env=env,
+                            capture_output=True, text=True, timeout=300)
+    return time.perf_counter() - start, result.stdout, result.stderr
+
+
+def _timing(stdout):
+    """Seconds printed on the last line of a timer run (NaN if the import failed)"""
+    lines = stdout.strip().splitlines()
+    try:
+        return float(lines[-1])
+    except (IndexError, ValueError):
+        return float('nan')
+
+
+def _heaviest_import(importtime_log):
+    """Slowest third-party top-level package in a -X importtime log, as (name, seconds)"""
+    repo_modules = {name[:-3] for name in os.listdir(REPO_DIR) if name.endswith('.py')}
+    heaviest, heaviest_us = None, 0
+    for line in importtime_log.splitlines():
+        parts = line.split('|')
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2].strip()
+        if '.' in name or name in repo_modules or name in sys.builtin_module_names or name == 'site':
+            continue
+        if int(parts[1]) > heaviest_us:
+            heaviest, heaviest_us = name, int(parts[1])
+    return heaviest, heaviest_us / 1e6
+
+
+def benchmark_imports(modules=MODULES, repeats=3):
+    """Return {module: (cold seconds, warm seconds, heaviest import, its seconds)}
+
+    Cold imports run against an empty bytecode cache, so every module (pandas
+    included) is compiled from source; warm imports use the normal __pycache__
+    and report the best of `repeats`.
+    """
+    results = {}
+    for module in modules:
+        timer = ['-c', _TIMER.format(module=module)]
+        with tempfile.TemporaryDirectory() as prefix:
+            cold = _timing(_run(timer, prefix)[1])
+        _run(timer)
+        warm = min(_timing(_run(timer)[1]) for _ in range(repeats))
+        heaviest, heaviest_s = _heaviest_import(_run(timer, importtime=True)[2])
+        results[module] = (cold, warm, heaviest, heaviest_s)
+    return results
+
+
+def benchmark_help(scripts=CLI_SCRIPTS, repeats=3):
+    """Return {script: best wall seconds of `python script --help`}, interpreter startup included"""
+    results = {}
+    for script in scripts:
+        _run([script, '--help'])
+        results[script] = min(_run([script, '--help'])[0] for _ in range(repeats))
+    return results
+
+
+def main():
+    """Print the import and --help benchmarks"""
+    parser = argparse.ArgumentParser(description="Benchmark import and CLI startup times")
+    parser.add_argument('--repeats', type=int, default=3, help="warm runs per measurement (default: 3)")
+    args = parser.parse_args()
+
+    print("="*78)
+    print("IMPORT TIMES (fresh interpreter per measurement)")
+    print("="*78)
+    print(f"{'Module':<24}{'Cold (s)':>10}{'Warm (s)':>10}  Heaviest import")
+    for module, (cold, warm, heaviest, heaviest_s) in benchmark_imports(repeats=args.repeats).items():
+        flag = "  ⚠️" if module == 'interactive_dashboard' and warm > STARTUP_BUDGET else ""
+        print(f"{module:<24}{cold:>10.3f}{warm:>10.3f}  {heaviest or '-'} ({heaviest_s:.3f}s){flag}")
+
+    print("\n" + "="*78)
+    print(f"CLI --help LATENCY (budget {STARTUP_BUDGET:.1f}s, includes interpreter startup)")
+    print("="*78)
+    for script, seconds in benchmark_help(repeats=args.repeats).items():
+        status = "✓" if seconds <= STARTUP_BUDGET else "❌ over budget"
+        print(f"{script:<28}{seconds:>8.3f}s  {status}")
+
+
+if __name__ == "__main__":
+    main()
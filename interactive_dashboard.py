@@ -5,14 +5,27 @@ Hackathon-Winning Interactive Visualization Dashboard
 
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import streamlit as st
-from datetime import datetime, timedelta
+from lazy_imports import lazy_module
+from olap_cube import AggregateCube
+from data_schema import format_footprint, memory_bytes, weekday_names
+from frame_index import StateDateIndex
+from geography import INDIA_CENTER, STATE_COORDINATES, unknown_states
+from parallel_ingest import ingest_datasets
+from shard_manifest import load_manifest
 import warnings
 warnings.filterwarnings('ignore')
 
+# Plotly loads with the first chart, after the page header has painted
+px = lazy_module('plotly.express')
+go = lazy_module('plotly.graph_objects')
+
+# JSON the anomaly scatter may send to the browser, in bytes
+SCATTER_BYTE_BUDGET = 1_500_000
+
+# Starting guess of JSON bytes per plotted point, refined by measuring the figure
+SCATTER_BYTES_PER_POINT = 20
+
 # Page configuration
 st.set_page_config(
     page_title="Aadhaar Analytics Dashboard",
@@ -450,89 +463,36 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 @st.cache_data
-def load_data():
-    """Load and preprocess ALL data from CSV files with caching"""
+def load_data(file_lists, shard_fingerprint, drop_duplicates=False):
+    """Load and preprocess ALL data from CSV files with caching
+
+    shard_fingerprint only keys the cache, so a new or changed shard triggers a reload.
+    """
     try:
         st.info("Loading ALL CSV files from the three folders (this may take a moment)...")
         
-        # Define all file paths
-        bio_files = [
-            'api_data_aadhar_biometric/api_data_aadhar_biometric_0_500000.csv',
-            'api_data_aadhar_biometric/api_data_aadhar_biometric_500000_1000000.csv',
-            'api_data_aadhar_biometric/api_data_aadhar_biometric_1000000_1500000.csv',
-            'api_data_aadhar_biometric/api_data_aadhar_biometric_1500000_1861108.csv'
-        ]
-        
-        demo_files = [
-            'api_data_aadhar_demographic/api_data_aadhar_demographic_0_500000.csv',
-            'api_data_aadhar_demographic/api_data_aadhar_demographic_500000_1000000.csv',
-            'api_data_aadhar_demographic/api_data_aadhar_demographic_1000000_1500000.csv',
-            'api_data_aadhar_demographic/api_data_aadhar_demographic_1500000_2000000.csv',
-            'api_data_aadhar_demographic/api_data_aadhar_demographic_2000000_2071700.csv'
-        ]
-        
-        enroll_files = [
-            'api_data_aadhar_enrolment/api_data_aadhar_enrolment_0_500000.csv',
-            'api_data_aadhar_enrolment/api_data_aadhar_enrolment_500000_1000000.csv',
-            'api_data_aadhar_enrolment/api_data_aadhar_enrolment_1000000_1006029.csv'
-        ]
-        
-        # Load biometric data (ALL records)
-        bio_dfs = []
-        for file in bio_files:
-            try:
-                df = pd.read_csv(file)
-                bio_dfs.append(df)
-                st.write(f"✓ Loaded {file}: {len(df):,} records")
-            except Exception as e:
-                st.warning(f"Could not load {file}: {e}")
-        
-        bio_data = pd.concat(bio_dfs, ignore_index=True) if bio_dfs else None
-        
-        # Load demographic data (ALL records)
-        demo_dfs = []
-        for file in demo_files:
-            try:
-                df = pd.read_csv(file)
-                demo_dfs.append(df)
-                st.write(f"✓ Loaded {file}: {len(df):,} records")
-            except Exception as e:
-                st.warning(f"Could not load {file}: {e}")
-        
-        demo_data = pd.concat(demo_dfs, ignore_index=True) if demo_dfs else None
-        
-        # Load enrollment data (ALL records)
-        enroll_dfs = []
-        for file in enroll_files:
-            try:
-                df = pd.read_csv(file)
-                enroll_dfs.append(df)
-                st.write(f"✓ Loaded {file}: {len(df):,} records")
-            except Exception as e:
-                st.warning(f"Could not load {file}: {e}")
-        
-        enroll_data = pd.concat(enroll_dfs, ignore_index=True) if enroll_dfs else None
+        # Load all shards concurrently (ALL records), merged in file order
+        frames, raw_bytes = ingest_datasets(
+            file_lists,
+            weekday_as_names=True,
+            on_loaded=lambda file, df: st.write(f"✓ Loaded {file}: {len(df):,} records"),
+            on_error=lambda file, e: st.warning(f"Could not load {file}: {e}"),
+            duplicates='drop' if drop_duplicates else 'report',
+            on_duplicates=lambda name, report: st.write(f"🔎 {report.summary(name.title())}"
+                                                        + (" - cross-shard copies removed" if drop_duplicates else ""))
+        )
+        bio_data = frames['biometric']
+        demo_data = frames['demographic']
+        enroll_data = frames['enrollment']
         
         # Verify we have data
         if bio_data is None or demo_data is None or enroll_data is None:
             st.error("Failed to load one or more datasets")
             return None, None, None
         
-        # Preprocess data
-        st.info("Preprocessing data...")
-        for df in [bio_data, demo_data, enroll_data]:
-            df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y')
-            df['month'] = df['date'].dt.month
-            df['day'] = df['date'].dt.day
-            df['weekday'] = df['date'].dt.day_name()
-        
-        # Add calculated columns
-        bio_data['total_bio'] = bio_data['bio_age_5_17'] + bio_data['bio_age_17_']
-        demo_data['total_demo'] = demo_data['demo_age_5_17'] + demo_data['demo_age_17_']
-        enroll_data['total_enroll'] = enroll_data['age_0_5'] + enroll_data['age_5_17'] + enroll_data['age_18_greater']
-        
         # Show loading summary
         total_records = len(bio_data) + len(demo_data) + len(enroll_data)
+        typed_bytes = sum(memory_bytes(df) for df in [bio_data, demo_data, enroll_data])
         st.success(f"""
         **📊 COMPLETE Data Loading Summary:**
         - **Total records loaded: {total_records:,}**
@@ -541,6 +501,7 @@ def load_data():
         - **Enrollment records: {len(enroll_data):,}** (Expected: ~1,006,029)
         - **States covered: {len(set(enroll_data['state'].unique()) | set(bio_data['state'].unique()) | set(demo_data['state'].unique()))}**
         - **Date range: {min(enroll_data['date'].min(), bio_data['date'].min(), demo_data['date'].min())} to {max(enroll_data['date'].max(), bio_data['date'].max(), demo_data['date'].max())}**
+        - **{format_footprint('Total', raw_bytes, typed_bytes)}**
         """)
         
         return bio_data, demo_data, enroll_data
@@ -549,22 +510,128 @@ def load_data():
         st.error(f"Error loading data: {e}")
         return None, None, None
 
-def filter_data(data, date_range, selected_states):
-    """Filter data based on date range and selected states"""
+@st.cache_resource
+def load_indexed_data(file_lists, shard_fingerprint, drop_duplicates=False):
+    """Loaded frames sorted by (state, date) and indexed, built once per shard set and shared by every rerun"""
+    frames = load_data(file_lists, shard_fingerprint, drop_duplicates)
+    if any(data is None for data in frames):
+        return None, None, None
+    return tuple(StateDateIndex(data) for data in frames)
+
+@st.cache_resource
+def load_cube_data(shard_fingerprint):
+    """Aggregate (state, district, date) cells per dataset, indexed like the raw frames and built once per shard set
+
+    The cells carry the raw column names plus a record 'count', so the
+    summary sections read them exactly like raw rows; means come from the
+    stored sums and counts (see group_mean).
+    """
+    cube = AggregateCube.load_or_build(load_manifest())
+    indexes = []
+    for dataset in ('biometric', 'demographic', 'enrollment'):
+        if not cube.has(dataset):
+            return None, None, None
+        cells = cube.cubes[dataset].copy()
+        # The cube keeps weekday as a day-of-week number; the charts expect names
+        cells['weekday'] = weekday_names(cells['weekday'].fillna(-1).astype('int8').to_numpy())
+        indexes.append(StateDateIndex(cells))
+    return tuple(indexes)
+
+def record_count(data):
+    """Raw records behind a frame: its rows, or the summed counts of aggregate cells"""
     if data is None:
-        return None
-    
-    # Filter by date range
-    filtered_data = data[
-        (data['date'] >= pd.to_datetime(date_range[0])) & 
-        (data['date'] <= pd.to_datetime(date_range[1]))
-    ].copy()
+        return 0
+    return int(data['count'].sum()) if 'count' in data.columns else len(data)
+
+def group_mean(data, by, column):
+    """Per-record mean of a column by group, from stored sums and counts when the frame holds aggregate cells"""
+    if 'count' in data.columns:
+        sums = data.groupby(by, observed=True)[[column, 'count']].sum()
+        return sums[column] / sums['count'].where(sums['count'] > 0)
+    return data.groupby(by, observed=True)[column].mean()
+
+def filter_data(index, date_range, selected_states):
+    """Filter an indexed frame by date range and selected states
     
-    # Filter by selected states
-    if selected_states:
-        filtered_data = filtered_data[filtered_data['state'].isin(selected_states)]
+    Resolves to contiguous row ranges by binary search; the result is a
+    read-only view of the indexed frame whenever the rows are contiguous.
+    """
+    if index is None:
+        return None
     
-    return filtered_data
+    return index.select(date_range[0], date_range[1], selected_states)
+
+def bin_points(points, max_cells):
+    """Bin (date, total_enroll) rows into at most max_cells cells with a row count each
+    
+    Enrollment values are widened first (1, 2, 4, ...), then dates, until the
+    cells fit. Each cell is placed at its first day and its value-bin centre.
+    """
+    days = points['date'].values.astype('datetime64[D]')
+    values = points['total_enroll'].to_numpy(dtype='int64')
+    first_day, value_span = days.min(), int(values.max() - values.min()) + 1
+    day_width, value_width = 1, 1
+    while True:
+        cells = pd.DataFrame({
+            'date': first_day + (days - first_day) // day_width * day_width,
+            'total_enroll': values // value_width * value_width + (value_width - 1) / 2,
+        }).value_counts().rename('rows').reset_index()
+        if len(cells) <= max_cells or (value_width >= value_span and day_width >= len(np.unique(days)) * 2):
+            return cells
+        if value_width < value_span:
+            value_width *= 2
+        else:
+            day_width *= 2
+
+def build_anomaly_figure(enroll_data, byte_budget=SCATTER_BYTE_BUDGET):
+    """WebGL scatter of binned normal rows plus anomalies at full fidelity, within a JSON byte budget
+    
+    Returns (figure, number of anomalies, number of anomalies drawn). Anomalies
+    keep one marker per row with its state; if even they exceed half the budget,
+    the most extreme are kept.
+    """
+    totals = enroll_data['total_enroll'].astype(float)
+    z_scores = ((totals - totals.mean()) / totals.std(ddof=0)).abs()
+    anomalies = enroll_data.loc[z_scores > 2, ['date', 'total_enroll', 'state']].assign(z=z_scores[z_scores > 2])
+    normal_data = enroll_data.loc[z_scores <= 2, ['date', 'total_enroll']]
+    
+    max_points = max(byte_budget // SCATTER_BYTES_PER_POINT, 2)
+    while True:
+        shown = anomalies.nlargest(max_points // 2, 'z') if len(anomalies) > max_points // 2 else anomalies
+        cells = bin_points(normal_data, max(max_points - len(shown), 1)) if len(normal_data) > 0 else None
+        
+        fig = go.Figure()
+        
+        # Normal data, one marker per cell sized by its row count
+        if cells is not None:
+            sizes = 4 + 10 * np.sqrt(cells['rows'] / cells['rows'].max())
+            fig.add_trace(go.Scattergl(
+                x=cells['date'],
+                y=cells['total_enroll'],
+                mode='markers',
+                name='Normal (binned)',
+                marker=dict(color='blue', size=sizes.round(1), opacity=0.6),
+                hovertemplate='Date: %{x}<br>Enrollment: ~%{y}<br>Rows: %{customdata:,}<extra></extra>',
+                customdata=cells['rows']
+            ))
+        
+        # Anomaly points
+        if len(shown) > 0:
+            fig.add_trace(go.Scattergl(
+                x=shown['date'],
+                y=shown['total_enroll'],
+                mode='markers',
+                name='Anomalies',
+                marker=dict(color='red', size=10, symbol='x'),
+                hovertemplate='<b>%{text}</b><br>Date: %{x}<br>Enrollment: %{y}<br><b>ANOMALY</b><extra></extra>',
+                text=shown['state'].astype(str)
+            ))
+        
+        # Measure the payload and shrink the point budget until it fits
+        payload = len(fig.to_json())
+        if payload <= byte_budget or max_points <= 2:
+            return fig, len(anomalies), len(shown)
+        max_points = max(int(max_points * byte_budget / payload * 0.9), 2)
 
 def create_kpi_metrics(bio_data, demo_data, enroll_data):
     """Create KPI metrics section"""
@@ -634,7 +701,7 @@ def create_geographic_analysis(bio_data, demo_data, enroll_data):
     
     with col1:
         # State-wise enrollment
-        state_enroll = enroll_data.groupby('state')['total_enroll'].sum().sort_values(ascending=False).head(15)
+        state_enroll = enroll_data.groupby('state', observed=True)['total_enroll'].sum().sort_values(ascending=False).head(15)
         
         if len(state_enroll) > 0:
             fig = px.bar(
@@ -667,7 +734,7 @@ def create_geographic_analysis(bio_data, demo_data, enroll_data):
     with col2:
         if bio_data is not None and len(bio_data) > 0:
             # State-wise biometric updates
-            state_bio = bio_data.groupby('state')['total_bio'].sum().sort_values(ascending=False).head(15)
+            state_bio = bio_data.groupby('state', observed=True)['total_bio'].sum().sort_values(ascending=False).head(15)
             
             if len(state_bio) > 0:
                 fig = px.bar(
@@ -704,13 +771,16 @@ def create_geographic_analysis(bio_data, demo_data, enroll_data):
         st.markdown("### 🗺️ Interactive State Performance Map")
         
         # Create state performance data
-        state_performance = enroll_data.groupby('state').agg({
-            'total_enroll': ['sum', 'mean', 'count'],
-            'district': 'nunique'
-        }).reset_index()
-        
-        # Flatten column names
-        state_performance.columns = ['state', 'total_enroll', 'avg_enroll', 'record_count', 'district_count']
+        state_performance = enroll_data.groupby('state', observed=True).agg(
+            total_enroll=('total_enroll', 'sum')
+        )
+        state_performance['district_count'] = AggregateCube.districts_in(enroll_data)
+        state_performance.insert(1, 'avg_enroll', group_mean(enroll_data, 'state', 'total_enroll'))
+        if 'count' in enroll_data.columns:
+            state_performance.insert(2, 'record_count', enroll_data.groupby('state', observed=True)['count'].sum())
+        else:
+            state_performance.insert(2, 'record_count', enroll_data.groupby('state', observed=True).size())
+        state_performance = state_performance[['total_enroll', 'avg_enroll', 'record_count', 'district_count']].reset_index()
         
         if len(state_performance) > 0:
             # Create performance categories
@@ -720,56 +790,14 @@ def create_geographic_analysis(bio_data, demo_data, enroll_data):
                 labels=['Low', 'Below Average', 'Average', 'Above Average', 'High']
             )
             
-            # State coordinates mapping (approximate center coordinates for Indian states)
-            state_coordinates = {
-                'Andhra Pradesh': [15.9129, 79.7400],
-                'Arunachal Pradesh': [28.2180, 94.7278],
-                'Assam': [26.2006, 92.9376],
-                'Bihar': [25.0961, 85.3131],
-                'Chhattisgarh': [21.2787, 81.8661],
-                'Goa': [15.2993, 74.1240],
-                'Gujarat': [23.0225, 72.5714],
-                'Haryana': [29.0588, 76.0856],
-                'Himachal Pradesh': [31.1048, 77.1734],
-                'Jharkhand': [23.6102, 85.2799],
-                'Karnataka': [15.3173, 75.7139],
-                'Kerala': [10.8505, 76.2711],
-                'Madhya Pradesh': [22.9734, 78.6569],
-                'Maharashtra': [19.7515, 75.7139],
-                'Manipur': [24.6637, 93.9063],
-                'Meghalaya': [25.4670, 91.3662],
-                'Mizoram': [23.1645, 92.9376],
-                'Nagaland': [26.1584, 94.5624],
-                'Odisha': [20.9517, 85.0985],
-                'Punjab': [31.1471, 75.3412],
-                'Rajasthan': [27.0238, 74.2179],
-                'Sikkim': [27.5330, 88.5122],
-                'Tamil Nadu': [11.1271, 78.6569],
-                'Telangana': [18.1124, 79.0193],
-                'Tripura': [23.9408, 91.9882],
-                'Uttar Pradesh': [26.8467, 80.9462],
-                'Uttarakhand': [30.0668, 79.0193],
-                'West Bengal': [22.9868, 87.8550],
-                'Andaman and Nicobar Islands': [11.7401, 92.6586],
-                'Chandigarh': [30.7333, 76.7794],
-                'Dadra and Nagar Haveli and Daman and Diu': [20.1809, 73.0169],
-                'Delhi': [28.7041, 77.1025],
-                'Jammu and Kashmir': [34.0837, 74.7973],
-                'Ladakh': [34.1526, 77.5771],
-                'Lakshadweep': [10.5667, 72.6417],
-                'Puducherry': [11.9416, 79.8083]
-            }
-            
-            # Add coordinates to state performance data
-            state_performance['lat'] = state_performance['state'].map(lambda x: state_coordinates.get(x, [20.5937, 78.9629])[0])
-            state_performance['lon'] = state_performance['state'].map(lambda x: state_coordinates.get(x, [20.5937, 78.9629])[1])
-            
-            # For states not in our coordinate mapping, use random coordinates within India bounds
-            missing_coords = state_performance[state_performance['lat'].isna()]
-            if len(missing_coords) > 0:
-                np.random.seed(42)
-                state_performance.loc[state_performance['lat'].isna(), 'lat'] = np.random.uniform(8.0, 37.0, len(missing_coords))
-                state_performance.loc[state_performance['lon'].isna(), 'lon'] = np.random.uniform(68.0, 97.0, len(missing_coords))
+            # Coordinates by canonical state name; names are canonicalized at ingest,
+            # so a state without coordinates is genuinely unknown rather than misspelled
+            missing_states = unknown_states(state_performance['state'])
+            if missing_states:
+                st.warning(f"No map coordinates for: {', '.join(missing_states)}")
+            state_performance = state_performance[~state_performance['state'].isin(missing_states)].copy()
+            state_performance['lat'] = state_performance['state'].map(lambda x: STATE_COORDINATES[x][0]).astype(float)
+            state_performance['lon'] = state_performance['state'].map(lambda x: STATE_COORDINATES[x][1]).astype(float)
             
             # Create the interactive map
             fig = px.scatter_mapbox(
@@ -791,7 +819,7 @@ def create_geographic_analysis(bio_data, demo_data, enroll_data):
                 color_continuous_scale='Viridis',
                 size_max=50,
                 zoom=4,
-                center=dict(lat=20.5937, lon=78.9629),  # Center of India
+                center=dict(lat=INDIA_CENTER[0], lon=INDIA_CENTER[1]),  # Center of India
                 mapbox_style='carto-darkmatter',  # Dark map style
                 title=f"State Performance Interactive Map ({len(state_performance)} States - Filtered Data)",
                 height=600
@@ -866,7 +894,7 @@ def create_geographic_analysis(bio_data, demo_data, enroll_data):
     # Enhanced Treemap as alternative view
     if len(enroll_data) > 0:
         st.markdown("### 📊 Hierarchical District Performance View")
-        district_state = enroll_data.groupby(['state', 'district'])['total_enroll'].sum().reset_index()
+        district_state = enroll_data.groupby(['state', 'district'], observed=True)['total_enroll'].sum().reset_index()
         
         if len(district_state) > 0:
             top_districts = district_state.nlargest(min(50, len(district_state)), 'total_enroll')
@@ -913,7 +941,7 @@ def create_geographic_analysis(bio_data, demo_data, enroll_data):
                 """)
             
             with col_tree2:
-                state_summary = top_districts.groupby('state')['total_enroll'].sum().sort_values(ascending=False)
+                state_summary = top_districts.groupby('state', observed=True)['total_enroll'].sum().sort_values(ascending=False)
                 num_states = min(5, len(state_summary))
                 
                 state_list = []
@@ -1003,7 +1031,7 @@ def create_temporal_analysis(bio_data, demo_data, enroll_data):
     if enroll_data is not None and len(enroll_data) > 0:
         st.markdown("### Weekly Usage Patterns (Filtered Data)")
         weekday_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        weekly_data = enroll_data.groupby('weekday')['total_enroll'].mean().reindex(weekday_order)
+        weekly_data = group_mean(enroll_data, 'weekday', 'total_enroll').reindex(weekday_order)
         
         # Remove NaN values
         weekly_data = weekly_data.dropna()
@@ -1345,39 +1373,9 @@ def create_advanced_analytics(bio_data, demo_data, enroll_data):
         if enroll_data is not None and len(enroll_data) > 0:
             # Anomaly detection visualization
             try:
-                from scipy import stats
-                
                 # Calculate z-scores for anomaly detection
                 if len(enroll_data) > 10:  # Need sufficient data for anomaly detection
-                    z_scores = np.abs(stats.zscore(enroll_data['total_enroll']))
-                    anomalies = enroll_data[z_scores > 2]
-                    normal_data = enroll_data[z_scores <= 2]
-                    
-                    fig = go.Figure()
-                    
-                    # Normal data points
-                    if len(normal_data) > 0:
-                        fig.add_trace(go.Scatter(
-                            x=normal_data['date'],
-                            y=normal_data['total_enroll'],
-                            mode='markers',
-                            name='Normal',
-                            marker=dict(color='blue', size=6, opacity=0.6),
-                            hovertemplate='<b>%{text}</b><br>Date: %{x}<br>Enrollment: %{y}<extra></extra>',
-                            text=normal_data['state']
-                        ))
-                    
-                    # Anomaly points
-                    if len(anomalies) > 0:
-                        fig.add_trace(go.Scatter(
-                            x=anomalies['date'],
-                            y=anomalies['total_enroll'],
-                            mode='markers',
-                            name='Anomalies',
-                            marker=dict(color='red', size=10, symbol='x'),
-                            hovertemplate='<b>%{text}</b><br>Date: %{x}<br>Enrollment: %{y}<br><b>ANOMALY</b><extra></extra>',
-                            text=anomalies['state']
-                        ))
+                    fig, anomaly_count, shown_count = build_anomaly_figure(enroll_data)
                     
                     fig.update_layout(
                         title=dict(
@@ -1397,9 +1395,10 @@ def create_advanced_analytics(bio_data, demo_data, enroll_data):
                     st.plotly_chart(fig, use_container_width=True)
                     
                     # Show anomaly statistics
-                    if len(anomalies) > 0:
-                        anomaly_rate = (len(anomalies) / len(enroll_data)) * 100
-                        st.info(f"🚨 Detected {len(anomalies)} anomalies ({anomaly_rate:.1f}% of filtered data)")
+                    if anomaly_count > 0:
+                        anomaly_rate = (anomaly_count / len(enroll_data)) * 100
+                        shown = "" if shown_count == anomaly_count else f", {shown_count:,} most extreme plotted"
+                        st.info(f"🚨 Detected {anomaly_count:,} anomalies ({anomaly_rate:.1f}% of filtered data{shown})")
                     else:
                         st.success("✅ No anomalies detected in filtered data")
                 else:
@@ -1557,19 +1556,38 @@ def main():
     st.sidebar.markdown("## 🎛️ Dashboard Controls")
     st.sidebar.markdown("---")
     
-    # Load data
+    drop_duplicates = st.sidebar.checkbox(
+        "Remove cross-shard duplicates",
+        value=False,
+        help="Drop records whose (date, state, district, pincode) already appeared in an earlier shard file"
+    )
+    
+    use_cube = st.sidebar.checkbox(
+        "Answer summaries from the aggregate cube",
+        value=True,
+        disabled=drop_duplicates,
+        help="KPI, geographic, temporal and demographic sections read pre-aggregated (state, district, date) cells; "
+             "raw rows are only used for the drill-downs. The cube keeps every shard, so duplicate removal uses raw rows"
+    ) and not drop_duplicates
+    
+    # Load data - in cube mode raw rows are only read if the drill-downs ask for them
     with st.spinner("Loading Aadhaar data..."):
-        bio_data_raw, demo_data_raw, enroll_data_raw = load_data()
-    
-    if all([bio_data_raw is not None, demo_data_raw is not None, enroll_data_raw is not None]):
+        manifest = load_manifest()
+        indexes = load_cube_data(manifest.fingerprint()) if use_cube else (None, None, None)
+        use_cube = all(index is not None for index in indexes)
+        if not use_cube:
+            indexes = load_indexed_data(manifest.file_lists(), manifest.fingerprint(), drop_duplicates)
+        bio_index, demo_index, enroll_index = indexes
+    
+    if all([bio_index is not None, demo_index is not None, enroll_index is not None]):
         st.success("✅ Data loaded successfully!")
         
         # Sidebar filters
         st.sidebar.markdown("### 📊 Data Filters")
         
         # Date range filter
-        min_date = min(enroll_data_raw['date'].min(), bio_data_raw['date'].min(), demo_data_raw['date'].min())
-        max_date = max(enroll_data_raw['date'].max(), bio_data_raw['date'].max(), demo_data_raw['date'].max())
+        min_date = pd.Timestamp(min(enroll_index.min_date, bio_index.min_date, demo_index.min_date))
+        max_date = pd.Timestamp(max(enroll_index.max_date, bio_index.max_date, demo_index.max_date))
         
         date_range = st.sidebar.date_input(
             "Select Date Range",
@@ -1587,9 +1605,9 @@ def main():
         
         # State filter
         all_states = set()
-        all_states.update(enroll_data_raw['state'].unique())
-        all_states.update(bio_data_raw['state'].unique())
-        all_states.update(demo_data_raw['state'].unique())
+        all_states.update(enroll_index.states)
+        all_states.update(bio_index.states)
+        all_states.update(demo_index.states)
         
         selected_states = st.sidebar.multiselect(
             "Select States",
@@ -1608,21 +1626,15 @@ def main():
         **Total Available States:** {len(all_states)}
         """)
         
-        # Apply filters to data
-        bio_data = filter_data(bio_data_raw, (start_date, end_date), selected_states)
-        demo_data = filter_data(demo_data_raw, (start_date, end_date), selected_states)
-        enroll_data = filter_data(enroll_data_raw, (start_date, end_date), selected_states)
+        # Apply filters to data - aggregate cells in cube mode, raw rows otherwise
+        bio_data = filter_data(bio_index, (start_date, end_date), selected_states)
+        demo_data = filter_data(demo_index, (start_date, end_date), selected_states)
+        enroll_data = filter_data(enroll_index, (start_date, end_date), selected_states)
         
         # Show filtered data summary
-        filtered_records = 0
-        if enroll_data is not None:
-            filtered_records += len(enroll_data)
-        if bio_data is not None:
-            filtered_records += len(bio_data)
-        if demo_data is not None:
-            filtered_records += len(demo_data)
+        filtered_records = record_count(enroll_data) + record_count(bio_data) + record_count(demo_data)
         
-        total_records = len(enroll_data_raw) + len(bio_data_raw) + len(demo_data_raw)
+        total_records = sum(record_count(index.frame) for index in indexes)
         
         st.sidebar.markdown("### 📈 Data Summary")
         st.sidebar.metric(
@@ -1644,7 +1656,16 @@ def main():
         create_demographic_analysis(bio_data, demo_data, enroll_data)
         st.markdown("---")
         
-        create_advanced_analytics(bio_data, demo_data, enroll_data)
+        # Drill-downs need individual rows, which cube mode loads only on request
+        if not use_cube:
+            create_advanced_analytics(bio_data, demo_data, enroll_data)
+        elif st.toggle("🔬 Load raw records for the advanced drill-downs", value=False,
+                       help="Anomaly and distribution views need individual records; loading them reads every shard once"):
+            with st.spinner("Loading raw records..."):
+                raw_indexes = load_indexed_data(manifest.file_lists(), manifest.fingerprint(), drop_duplicates)
+            if all(index is not None for index in raw_indexes):
+                create_advanced_analytics(*(filter_data(index, (start_date, end_date), selected_states)
+                                            for index in raw_indexes))
         st.markdown("---")
         
         create_predictive_dashboard()
@@ -3,6 +3,7 @@ Launch Script for Aadhaar DataThon Dashboard and PDF Generation
 Hackathon-Winning Solution Launcher
 """
 
+import argparse
 import subprocess
 import sys
 import os
@@ -67,6 +68,11 @@ def launch_dashboard():
 
 def main():
     """Main launcher function"""
+    parser = argparse.ArgumentParser(description="Generate the PDF report and launch the Aadhaar dashboard")
+    parser.add_argument('--skip-install', action='store_true',
+                        help="do not pip install dashboard_requirements.txt before launching")
+    args = parser.parse_args()
+    
     print("🏆 AADHAAR DATATHON - HACKATHON WINNING SOLUTION")
     print("=" * 60)
     print("🎯 Interactive Dashboard + Professional PDF Report")
@@ -86,7 +92,7 @@ def main():
         print("📁 Please ensure all data directories are present")
     
     # Install requirements
-    if not install_dashboard_requirements():
+    if not args.skip_install and not install_dashboard_requirements():
         print("❌ Failed to install requirements. Exiting.")
         return
     
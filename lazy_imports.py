@@ -0,0 +1,44 @@
+"""
+Aadhaar DataThon - Lazy Imports
+Module proxies that defer heavy plotting libraries until an analysis first uses them
+"""
+
+import importlib
+
+
+class LazyModule:
+    """Stand-in for a module that imports it on first attribute access
+
+    on_import(module) runs once, when this proxy first resolves - module-level
+    styling (plt.style.use, sns.set_palette) goes there so it still applies
+    before the first plot without paying the import at startup.
+    """
+
+    def __init__(self, name, on_import=None):
+        self._name = name
+        self._on_import = on_import
+        self._module = None
+
+    def _load(self):
+        """Import the module (once) and return it"""
+        if self._module is None:
+            module = importlib.import_module(self._name)
+            self._module = module
+            if self._on_import is not None:
+                self._on_import(module)
+        return self._module
+
+    def __getattr__(self, attr):
+        # Only called for attributes the proxy itself lacks, i.e. the module's
+        if attr in ('_name', '_on_import', '_module'):
+            raise AttributeError(attr)
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_module(name, on_import=None):
+    """Return a proxy for `name` that imports it when first used"""
+    return LazyModule(name, on_import)
@@ -0,0 +1,299 @@
+"""
+Aadhaar DataThon - Aggregate Cube
+Persisted (state x district x date) cube per dataset with distinct-pincode and quantile sketches
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from data_cache import CACHE_DIR, CACHE_VERSION
+from data_schema import COUNT_COLUMNS, TOTAL_COLUMNS, apply_schema
+from date_dimension import add_calendar_columns
+from sketches import DistinctSketch, QuantileSketch
+from streaming_aggregation import StreamingAggregator, std_from_moments
+
+# Finest grain kept for every dataset
+CUBE_KEYS = ['state', 'district', 'date']
+
+# Calendar attributes rolled up from the cube's date column
+CUBE_CALENDAR_COLUMNS = ['month', 'day', 'weekday', 'week_of_year', 'quarter']
+
+# Groupings streamed per shard to build or update the cube
+CUBE_GROUPINGS = {'cube': CUBE_KEYS}
+
+# Quantiles reported alongside the IQR bounds
+IQR_QUANTILES = [0.25, 0.5, 0.75]
+
+CUBE_DIR = 'cube'
+
+
+def value_columns(dataset):
+    """Additive measures stored in every cube cell"""
+    total_col = TOTAL_COLUMNS[dataset]
+    return COUNT_COLUMNS[dataset] + [total_col, f'{total_col}_sq', 'count']
+
+
+def sketch_groupings(dataset):
+    """Mergeable sketches kept beside the cube: distinct pincodes per (state, district, month)
+    cell and a t-digest of the dataset total per district"""
+    return {
+        'pincode_hll': DistinctSketch(['state', 'district', 'month'], 'pincode'),
+        'total_digest': QuantileSketch(['state', 'district'], TOTAL_COLUMNS[dataset]),
+    }
+
+
+def _as_partial(table, keys, dataset):
+    """Index a flat cube table like a streamed partial so deltas can be merged into it"""
+    int_cols = COUNT_COLUMNS[dataset] + [TOTAL_COLUMNS[dataset], 'count']
+    values = table[value_columns(dataset)].astype({col: np.int64 for col in int_cols})
+    values.index = pd.MultiIndex.from_arrays([np.asarray(table[key]) for key in keys], names=keys)
+    return values
+
+
+class AggregateCube:
+    """Pre-aggregated cube that answers state/district/date/calendar rollups without raw rows"""
+
+    def __init__(self, cubes=None, sketches=None, cache_dir=CACHE_DIR):
+        self.cubes = cubes or {}
+        # {dataset: {sketch name: flat sketch table}}
+        self.sketches = sketches or {}
+        self.cube_dir = os.path.join(cache_dir, CUBE_DIR)
+        self.aggregator = None
+        # Shard versions folded into the cube: {path: {'dataset', 'checksum'}}
+        self.shards = {}
+        self.fingerprint = None
+
+    @staticmethod
+    def _flatten(aggregate):
+        """Turn a streamed aggregate into a flat, compactly typed table"""
+        if aggregate is None:
+            return None
+        table = aggregate.reset_index()
+        return apply_schema(table)
+
+    def _prepare(self, dataset):
+        """Attach calendar attributes to a cube - one lookup per distinct date"""
+        add_calendar_columns(self.cubes[dataset], columns=CUBE_CALENDAR_COLUMNS)
+
+    @classmethod
+    def build(cls, file_lists, manifest=None, memory_budget_mb=256, cache_dir=CACHE_DIR):
+        """Stream every shard into cube tables and sketches (unchanged shards reuse their partials)"""
+        aggregator = StreamingAggregator(memory_budget_mb=memory_budget_mb, manifest=manifest)
+
+        cube = cls(cache_dir=cache_dir)
+        for dataset, files in file_lists.items():
+            sketches = sketch_groupings(dataset)
+            results = aggregator.aggregate(files, dataset, {**CUBE_GROUPINGS, **sketches})
+            if results['cube'] is None:
+                continue
+            cube.cubes[dataset] = cls._flatten(results['cube'])
+            cube.sketches[dataset] = {name: cls._flatten(results[name]) for name in sketches}
+            cube._prepare(dataset)
+            if manifest:
+                for file in files:
+                    cube.shards[file] = {'dataset': dataset, 'checksum': manifest.checksum(file)}
+        cube.aggregator = aggregator
+        return cube
+
+    def update(self, manifest, memory_budget_mb=256):
+        """Fold new or changed shards into the cube and subtract replaced or removed ones
+
+        Only the delta shards are streamed; the cube's count, sum and sum-of-squares
+        cells stay exact. Sketches cannot be subtracted, so a dataset that lost or
+        replaced a shard re-merges its sketches from the persisted per-shard partials.
+        Returns False, leaving the cube untouched, if the partials of a replaced shard
+        version are no longer on disk.
+        """
+        current = manifest.entries
+        added = [path for path, entry in current.items()
+                 if self.shards.get(path, {}).get('checksum') != entry['checksum']]
+        removed = [path for path, shard in self.shards.items()
+                   if current.get(path, {}).get('checksum') != shard['checksum']]
+
+        aggregator = StreamingAggregator(memory_budget_mb=memory_budget_mb, manifest=manifest)
+        deltas = {}
+
+        # Read the replaced versions first - re-streaming a shard prunes its old partials
+        for path in removed:
+            shard = self.shards[path]
+            partials = aggregator.load_partials(path, CUBE_GROUPINGS, shard['checksum'])
+            if partials is None:
+                return False
+            for name, partial in partials.items():
+                deltas.setdefault((shard['dataset'], name), []).append(-partial)
+
+        for path in added:
+            dataset = current[path]['dataset']
+            groupings = {**CUBE_GROUPINGS, **sketch_groupings(dataset)}
+            for name, partial in aggregator.shard_partials(path, dataset, groupings).items():
+                if partial is not None:
+                    deltas.setdefault((dataset, name), []).append(partial)
+
+        file_lists = manifest.file_lists()
+        shrunk = {self.shards[path]['dataset'] for path in removed}
+
+        for dataset in {dataset for dataset, _ in deltas}:
+            for name, keys in CUBE_GROUPINGS.items():
+                parts = deltas.get((dataset, name), [])
+                if dataset in self.cubes:
+                    parts = [_as_partial(self.cubes[dataset], keys, dataset)] + parts
+                if not parts:
+                    continue
+                merged = aggregator._reduce(parts)
+                self.cubes[dataset] = self._flatten(merged[merged['count'] > 0])
+
+            sketches = self.sketches.setdefault(dataset, {})
+            for name, spec in sketch_groupings(dataset).items():
+                if dataset in shrunk:
+                    merged = aggregator.aggregate(file_lists[dataset], dataset, {name: spec})[name]
+                else:
+                    parts = deltas.get((dataset, name), [])
+                    if sketches.get(name) is not None:
+                        parts = [sketches[name].set_index(spec.index_columns)] + parts
+                    merged = spec.reduce(parts) if parts else None
+                sketches[name] = self._flatten(merged)
+
+            if len(self.cubes[dataset]):
+                self._prepare(dataset)
+            else:
+                del self.cubes[dataset], self.sketches[dataset]
+
+        self.shards = {path: {'dataset': entry['dataset'], 'checksum': entry['checksum']}
+                       for path, entry in current.items()}
+        self.aggregator = aggregator
+        return True
+
+    def _paths(self, dataset):
+        """Return the cube parquet path of a dataset and its sketch paths by name"""
+        return (os.path.join(self.cube_dir, f"{dataset}_cube.parquet"),
+                {name: os.path.join(self.cube_dir, f"{dataset}_{name}.parquet") for name in sketch_groupings(dataset)})
+
+    def save(self, fingerprint):
+        """Persist every cube along with the shard fingerprint it was built from"""
+        os.makedirs(self.cube_dir, exist_ok=True)
+        for dataset in self.cubes:
+            cube_path, sketch_paths = self._paths(dataset)
+            self.cubes[dataset][CUBE_KEYS + value_columns(dataset)].to_parquet(cube_path, index=False)
+            for name, path in sketch_paths.items():
+                self.sketches[dataset][name].to_parquet(path, index=False)
+
+        with open(os.path.join(self.cube_dir, 'cube.json'), 'w') as f:
+            json.dump({'version': CACHE_VERSION, 'fingerprint': fingerprint,
+                       'datasets': sorted(self.cubes), 'shards': self.shards}, f, indent=2)
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def load(cls, cache_dir=CACHE_DIR):
+        """Load the persisted cubes, or None if none were saved with the current schema"""
+        cube = cls(cache_dir=cache_dir)
+        meta_path = os.path.join(cube.cube_dir, 'cube.json')
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta.get('version') != CACHE_VERSION:
+            return None
+        cube.fingerprint = meta.get('fingerprint')
+        cube.shards = meta.get('shards', {})
+
+        for dataset in meta['datasets']:
+            cube_path, sketch_paths = cube._paths(dataset)
+            if not all(os.path.exists(path) for path in sketch_paths.values()):
+                # Saved before a sketch was added - rebuild
+                return None
+            cube.cubes[dataset] = apply_schema(pd.read_parquet(cube_path))
+            cube.sketches[dataset] = {name: apply_schema(pd.read_parquet(path)) for name, path in sketch_paths.items()}
+            cube._prepare(dataset)
+        return cube
+
+    @classmethod
+    def load_or_build(cls, manifest, memory_budget_mb=256, cache_dir=CACHE_DIR):
+        """Reuse the persisted cube, applying shard deltas when the manifest has changed"""
+        fingerprint = manifest.fingerprint()
+        try:
+            cube = cls.load(cache_dir)
+        except (ImportError, OSError, ValueError) as e:
+            print(f"⚠️ Could not load aggregate cube: {e}")
+            cube = None
+        if cube is not None and cube.fingerprint == fingerprint:
+            return cube
+
+        if cube is None or not cube.update(manifest, memory_budget_mb):
+            cube = cls.build(manifest.file_lists(), manifest, memory_budget_mb, cache_dir)
+        try:
+            cube.save(fingerprint)
+        except (ImportError, OSError) as e:
+            print(f"⚠️ Could not persist aggregate cube: {e}")
+        return cube
+
+    def has(self, dataset):
+        """Check whether a dataset has any cube cells"""
+        return dataset in self.cubes
+
+    def rollup(self, dataset, by=None):
+        """Sum every measure by any of state, district, date or a calendar attribute (None = grand total)"""
+        cube = self.cubes[dataset]
+        values = cube[value_columns(dataset)]
+        if by is None:
+            totals = values.groupby(np.zeros(len(cube), dtype=np.int8)).sum()
+            totals.index.name = '_all'
+            return totals
+        return values.groupby([cube[key] for key in by], observed=True).sum()
+
+    def rollups(self, dataset, groupings):
+        """Answer several rollups at once, returning {name: frame}"""
+        return {name: self.rollup(dataset, keys) for name, keys in groupings.items()}
+
+    @staticmethod
+    def _filtered(table, where):
+        """Rows of a cube table matching {column: allowed values}"""
+        if not where:
+            return table
+        mask = np.ones(len(table), dtype=bool)
+        for col, allowed in where.items():
+            mask &= table[col].isin(allowed).to_numpy()
+        return table[mask]
+
+    def distinct_pincodes(self, dataset, by=('state',), where=None):
+        """Approximate distinct pincodes per group for any state/district/month filter, merged from cell sketches"""
+        registers = self._filtered(self.sketches[dataset]['pincode_hll'], where)
+        return sketch_groupings(dataset)['pincode_hll'].estimate(registers, list(by))
+
+    def total_quantiles(self, dataset, by=(), qs=IQR_QUANTILES, where=None):
+        """Approximate quantiles of the dataset total per group, over ALL records, with a rank-error bound"""
+        centroids = self._filtered(self.sketches[dataset]['total_digest'], where)
+        return sketch_groupings(dataset)['total_digest'].quantiles(centroids, by, qs)
+
+    @staticmethod
+    def districts_in(cells, by=('state',)):
+        """Distinct districts per group of cube cells (or raw rows) - exact, since district is a cube key"""
+        return cells.groupby(list(by), observed=True)['district'].nunique()
+
+    def district_counts(self, dataset, by=('state',), where=None):
+        """Distinct districts per group for any state/district/month filter"""
+        return self.districts_in(self._filtered(self.cubes[dataset], where), by)
+
+    def cells(self):
+        """Total number of cube cells across datasets"""
+        return sum(len(cube) for cube in self.cubes.values())
+
+    def district_features(self, dataset='enrollment'):
+        """Per-district clustering features derived from the cube's mergeable moments"""
+        cube = self.cubes[dataset]
+        total_col = TOTAL_COLUMNS[dataset]
+        grouped = cube.groupby(['state', 'district'], observed=True)
+        sums = grouped[value_columns(dataset)].sum()
+        n = sums['count']
+
+        features = pd.DataFrame(index=sums.index)
+        for col in COUNT_COLUMNS[dataset]:
+            features[f'avg_{col}'] = sums[col] / n
+        features['avg_total'] = sums[total_col] / n
+        features['std_total'] = std_from_moments(sums, total_col)
+        features['sum_total'] = sums[total_col]
+        features['months_active'] = grouped['month'].nunique()
+        features['pincode_count'] = self.distinct_pincodes(dataset, by=('state', 'district'))
+        return features.reset_index()
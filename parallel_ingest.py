@@ -0,0 +1,100 @@
+"""
+Aadhaar DataThon - Parallel Shard Ingestion
+Parses CSV shards concurrently across a process pool
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from data_cache import read_shard, estimate_raw_bytes
+from data_schema import COUNT_COLUMNS, add_total_column, apply_schema, concat_frames
+from date_dimension import add_calendar_columns
+from deduplication import DuplicateReport
+
+
+def add_derived_columns(df, weekday_as_names=False):
+    """Add calendar and total columns to a single shard"""
+    add_calendar_columns(df, weekday_as_names)
+    apply_schema(df)
+
+    for dataset, cols in COUNT_COLUMNS.items():
+        if all(col in df.columns for col in cols):
+            add_total_column(df, dataset)
+    return df
+
+
+def _ingest_shard(file, derive, weekday_as_names, sampler):
+    """Worker: load (or stream-sample) and preprocess one shard, returning (df, raw_bytes, error)"""
+    try:
+        df = sampler.sample_shard(file) if sampler is not None else read_shard(file)
+
+        raw_bytes = estimate_raw_bytes(file, len(df))
+        if derive:
+            add_derived_columns(df, weekday_as_names)
+        return df, raw_bytes, None
+    except Exception as e:
+        return None, 0, str(e)
+
+
+def ingest_datasets(file_lists, max_workers=None, derive=True, weekday_as_names=False,
+                    sampler=None, on_loaded=None, on_error=None, duplicates=None, on_duplicates=None):
+    """Load every shard of every dataset concurrently and merge them in file order
+
+    file_lists maps a dataset name to its shard paths. Returns a dict of combined
+    frames (None where no shard loaded) and the estimated untyped footprint.
+    on_loaded(file, df) and on_error(file, error) are called in file order.
+    duplicates='report' checks for repeated (date, state, district, pincode) keys
+    and passes a DuplicateReport to on_duplicates(name, report); 'drop' also removes
+    rows whose key already appeared in an earlier shard. A StratifiedSampler streams
+    each shard into candidate rows that are merged into one sample per dataset.
+    """
+    tasks = [(name, file) for name, files in file_lists.items() for file in files]
+    args = (derive, weekday_as_names, sampler)
+    workers = min(max_workers or os.cpu_count() or 1, len(tasks))
+
+    results = None
+    if workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_ingest_shard, file, *args) for _, file in tasks]
+                results = [future.result() for future in futures]
+        except (BrokenProcessPool, OSError) as e:
+            print(f"⚠️ Process pool unavailable ({e}), loading shards serially")
+    if results is None:
+        results = [_ingest_shard(file, *args) for _, file in tasks]
+
+    frames = {name: [] for name in file_lists}
+    loaded_files = {name: [] for name in file_lists}
+    raw_bytes = 0
+    for (name, file), (df, shard_bytes, error) in zip(tasks, results):
+        if error is not None:
+            if on_error:
+                on_error(file, error)
+            continue
+        frames[name].append(df)
+        loaded_files[name].append(file)
+        raw_bytes += shard_bytes
+        if on_loaded:
+            on_loaded(file, df)
+
+    if duplicates:
+        for name, dfs in frames.items():
+            if not dfs:
+                continue
+            report = DuplicateReport(loaded_files[name], dfs)
+            if on_duplicates:
+                on_duplicates(name, report)
+            if duplicates == 'drop':
+                frames[name] = report.drop_cross_shard(dfs)
+
+    combined = {name: concat_frames(dfs) for name, dfs in frames.items()}
+    if sampler is not None:
+        combined = {name: sampler.merge(df) for name, df in combined.items()}
+    return combined, raw_bytes
+
+
+def ingest_shards(file_list, **kwargs):
+    """Load one list of shards concurrently, returning (combined_df, raw_bytes)"""
+    frames, raw_bytes = ingest_datasets({'shards': file_list}, **kwargs)
+    return frames['shards'], raw_bytes
@@ -0,0 +1,127 @@
+"""
+Aadhaar DataThon - PDF Page Assembly
+Joins single-page PDFs drawn in separate processes into one document
+"""
+
+import re
+from datetime import datetime
+
+_OBJECT_NUMBER = re.compile(rb'^(\d+) 0 obj')
+_REFERENCE = re.compile(rb'(\d+) 0 R\b')
+_STREAM = re.compile(rb'\bstream\r?\n')
+_TYPE = re.compile(rb'/Type\s*/(Catalog|Pages|Page)\b')
+_INFO = re.compile(rb'/Info (\d+) 0 R')
+
+# Numbers of the objects the assembled document adds itself
+_CATALOG, _PAGES, _INFO_OBJECT = 1, 2, 3
+
+
+def _pdf_string(text):
+    """PDF string literal (UTF-16 hex for non-ASCII text)"""
+    text = str(text)
+    if text.isascii():
+        return b'(' + text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)').encode('ascii') + b')'
+    return b'<FEFF' + text.encode('utf-16-be').hex().upper().encode('ascii') + b'>'
+
+
+def read_objects(pdf):
+    """Raw 'N 0 obj ... endobj' bytes by object number, located through the xref table
+
+    Handles the classic cross-reference tables written by matplotlib's PDF
+    backend; stream bytes are never scanned, only sliced between offsets.
+    """
+    xref_at = int(pdf[pdf.rindex(b'startxref') + len(b'startxref'):].split()[0])
+    if not pdf.startswith(b'xref', xref_at):
+        raise ValueError("PDF uses a cross-reference stream, which page assembly does not read")
+
+    lines = iter(pdf[xref_at:].split(b'\n')[1:])
+    offsets = {}
+    for line in lines:
+        fields = line.split()
+        if not fields or fields[0] == b'trailer':
+            break
+        first, count = int(fields[0]), int(fields[1])
+        for number in range(first, first + count):
+            offset, _, state = next(lines).split()[:3]
+            if state == b'n':
+                offsets[number] = int(offset)
+
+    trailer = pdf[pdf.index(b'trailer', xref_at):]
+    info = _INFO.search(trailer)
+    starts = sorted(offsets.values())
+    ends = dict(zip(starts, starts[1:] + [xref_at]))
+    objects = {number: pdf[offset:ends[offset]].rstrip() for number, offset in offsets.items()}
+    return objects, int(info.group(1)) if info else None
+
+
+def assemble_pages(pages, metadata=None):
+    """Join single-page PDFs (bytes, in page order) into one PDF document, returned as bytes
+
+    Every object of every page is copied unchanged apart from its number and
+    the references in its dictionary; each page's catalog, page tree and
+    info dictionary are replaced by one shared set.
+    """
+    body, page_numbers = [], []
+    next_number = _INFO_OBJECT + 1
+    header = b'%PDF-1.4'
+
+    for pdf in pages:
+        header = max(header, pdf.split(b'\n', 1)[0])
+        objects, info = read_objects(pdf)
+        # Old page trees map onto the shared one; catalogs and info dictionaries are dropped
+        renumbered, pages_here = {}, []
+        for number, raw in objects.items():
+            stream = _STREAM.search(raw)
+            kind = _TYPE.search(raw[:stream.start()] if stream else raw)
+            kind = kind.group(1) if kind else None
+            if kind == b'Pages':
+                renumbered[number] = _PAGES
+            elif number != info and kind != b'Catalog':
+                renumbered[number] = next_number
+                next_number += 1
+                if kind == b'Page':
+                    pages_here.append(number)
+
+        def renumber(match):
+            number = int(match.group(1))
+            if number not in renumbered:
+                raise ValueError(f"Page object refers to object {number}, which was dropped")
+            return b'%d 0 R' % renumbered[number]
+
+        for number, raw in objects.items():
+            if renumbered.get(number) in (None, _PAGES):
+                continue
+            # Only the dictionary is rewritten; stream bytes are copied as they are
+            stream = _STREAM.search(raw)
+            head, tail = (raw[:stream.start()], raw[stream.start():]) if stream else (raw, b'')
+            head = _OBJECT_NUMBER.sub(b'%d 0 obj' % renumbered[number], _REFERENCE.sub(renumber, head))
+            body.append((renumbered[number], head + tail))
+        page_numbers.extend(renumbered[number] for number in sorted(pages_here))
+
+    metadata = dict(metadata or {})
+    metadata.setdefault('CreationDate', datetime.now())
+    info_entries = b' '.join(
+        b'/%s %s' % (key.encode('ascii'),
+                     _pdf_string(value.strftime("D:%Y%m%d%H%M%S")) if isinstance(value, datetime) else _pdf_string(value))
+        for key, value in metadata.items())
+
+    objects = [
+        (_CATALOG, b'%d 0 obj\n<< /Type /Catalog /Pages %d 0 R >>\nendobj' % (_CATALOG, _PAGES)),
+        (_PAGES, b'%d 0 obj\n<< /Type /Pages /Kids [ %s ] /Count %d >>\nendobj'
+         % (_PAGES, b' '.join(b'%d 0 R' % number for number in page_numbers), len(page_numbers))),
+        (_INFO_OBJECT, b'%d 0 obj\n<< %s >>\nendobj' % (_INFO_OBJECT, info_entries)),
+    ] + body
+
+    out = bytearray(header + b'\n%\xac\xdc \xab\xba\n')
+    offsets = {}
+    for number, raw in objects:
+        offsets[number] = len(out)
+        out += raw + b'\n'
+
+    xref_at = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % next_number
+    for number in range(1, next_number):
+        out += b'%010d 00000 n \n' % offsets[number]
+    out += (b'trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n'
+            % (next_number, _CATALOG, _INFO_OBJECT, xref_at))
+    return bytes(out)
@@ -3,118 +3,135 @@ Aadhaar DataThon - PDF Report Generator
 Hackathon-Winning Professional PDF Report
 """
 
+import argparse
+import io
+import multiprocessing
+import os
+import time
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from matplotlib.backends.backend_pdf import PdfPages
-from matplotlib.patches import Rectangle
-import matplotlib.patches as mpatches
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
+from lazy_imports import lazy_module
+from data_schema import format_footprint, memory_bytes
+from parallel_ingest import ingest_datasets
+from pdf_assembly import assemble_pages
+from shard_manifest import load_manifest
+from result_cache import ResultCache, code_version, result_key
 import warnings
 warnings.filterwarnings('ignore')
 
-# Set professional styling
-plt.style.use('seaborn-v0_8-whitegrid')
-sns.set_palette("husl")
+# Set professional styling - applied when pyplot first loads, so --help stays fast
+def _apply_style(plt):
+    plt.style.use('seaborn-v0_8-whitegrid')
+    sns.set_palette("husl")
+
+plt = lazy_module('matplotlib.pyplot', on_import=_apply_style)
+sns = lazy_module('seaborn')
+mpatches = lazy_module('matplotlib.patches')
+
+# Report pages in document order: (progress label, page method)
+REPORT_PAGES = [
+    ("title page", 'create_title_page'),
+    ("methodology page", 'create_methodology_page'),
+    ("geographic analysis", 'create_geographic_analysis_page'),
+    ("temporal analysis", 'create_temporal_analysis_page'),
+    ("demographic analysis", 'create_demographic_analysis_page'),
+    ("advanced analytics", 'create_advanced_analytics_page'),
+    ("recommendations", 'create_recommendations_page'),
+    ("conclusion", 'create_conclusion_page'),
+]
+
+# Resolution of the anomaly-page density image: (date bins, enrollment bins)
+DENSITY_BINS = (365, 200)
+
+# Anomalies drawn as individual markers over the density image, most extreme first
+MAX_ANOMALY_MARKERS = 500
+
+# Report being built; forked page workers inherit it, so the aggregate bundle is never pickled
+_ACTIVE_REPORT = None
+
+def _build_page(method):
+    """Worker: lay out and draw one page from the bundle, returning (one-page PDF bytes, wall seconds, CPU seconds)"""
+    wall, cpu = time.perf_counter(), time.process_time()
+    fig = getattr(_ACTIVE_REPORT, method)()
+    page = io.BytesIO()
+    fig.savefig(page, format='pdf', bbox_inches='tight')
+    plt.close(fig)
+    return page.getvalue(), time.perf_counter() - wall, time.process_time() - cpu
+
+def _density_image(points):
+    """Row-weighted 2-D histogram of (date, total_enroll) points at DENSITY_BINS resolution
+    
+    Returns (counts, [x0, x1, y0, y1]) with x in matplotlib date numbers (days
+    since 1970), so the page draws a fixed-size image whatever the row count.
+    """
+    if len(points) == 0:
+        return np.zeros((1, 1)), [0, 1, 0, 1]
+    days = points['date'].values.astype('datetime64[D]').astype('int64')
+    values = points['total_enroll'].to_numpy(dtype=float)
+    x_range = (days.min(), days.max() + 1)
+    y_range = (values.min(), values.max() + 1)
+    bins = (min(DENSITY_BINS[0], int(x_range[1] - x_range[0])), min(DENSITY_BINS[1], int(y_range[1] - y_range[0])))
+    counts, x_edges, y_edges = np.histogram2d(days, values, bins=bins, range=[x_range, y_range],
+                                              weights=points['rows'].to_numpy())
+    return counts, [x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]]
+
+def _fused_cells(frame, columns, value_key=None):
+    """Row count and column sums per (state, district, date[, value_key]) cell, in a single groupby"""
+    keys = ['state', 'district', 'date'] + ([value_key] if value_key else [])
+    aggregations = {column: (column, 'sum') for column in columns if column != value_key}
+    cells = frame.groupby(keys, observed=True).agg(rows=('date', 'size'), **aggregations).reset_index()
+    if value_key:
+        # The value is a key here: keep it as 'value' and turn the column into its cell sum
+        cells['value'] = cells[value_key]
+        cells[value_key] = cells['value'].astype('int64') * cells['rows']
+    return cells
 
 class AadhaarPDFReportGenerator:
-    def __init__(self):
+    def __init__(self, drop_duplicates=False):
+        self.drop_duplicates = drop_duplicates
         self.bio_data = None
         self.demo_data = None
         self.enroll_data = None
         self.report_date = datetime.now().strftime("%B %d, %Y")
         
-    def load_data(self):
+        # Aggregates every page draws from, built once per shard set and persisted
+        self.bundle = None
+        
+    def load_data(self, manifest=None):
         """Load and preprocess ALL data from CSV files"""
         try:
             print("Loading ALL CSV files from the three folders (this may take a moment)...")
             
-            # Define all file paths
-            bio_files = [
-                'api_data_aadhar_biometric/api_data_aadhar_biometric_0_500000.csv',
-                'api_data_aadhar_biometric/api_data_aadhar_biometric_500000_1000000.csv',
-                'api_data_aadhar_biometric/api_data_aadhar_biometric_1000000_1500000.csv',
-                'api_data_aadhar_biometric/api_data_aadhar_biometric_1500000_1861108.csv'
-            ]
+            # Discover all shards and record new or changed ones in the manifest
+            manifest = manifest or load_manifest()
+            print(manifest.summary())
             
-            demo_files = [
-                'api_data_aadhar_demographic/api_data_aadhar_demographic_0_500000.csv',
-                'api_data_aadhar_demographic/api_data_aadhar_demographic_500000_1000000.csv',
-                'api_data_aadhar_demographic/api_data_aadhar_demographic_1000000_1500000.csv',
-                'api_data_aadhar_demographic/api_data_aadhar_demographic_1500000_2000000.csv',
-                'api_data_aadhar_demographic/api_data_aadhar_demographic_2000000_2071700.csv'
-            ]
-            
-            enroll_files = [
-                'api_data_aadhar_enrolment/api_data_aadhar_enrolment_0_500000.csv',
-                'api_data_aadhar_enrolment/api_data_aadhar_enrolment_500000_1000000.csv',
-                'api_data_aadhar_enrolment/api_data_aadhar_enrolment_1000000_1006029.csv'
-            ]
-            
-            # Load biometric data (ALL records)
-            print("Loading biometric data files...")
-            bio_dfs = []
-            for file in bio_files:
-                try:
-                    df = pd.read_csv(file)
-                    bio_dfs.append(df)
-                    print(f"  ✓ Loaded {file}: {len(df):,} records")
-                except Exception as e:
-                    print(f"  ⚠️ Could not load {file}: {e}")
-            
-            if bio_dfs:
-                self.bio_data = pd.concat(bio_dfs, ignore_index=True)
-                print(f"✅ Combined biometric data: {len(self.bio_data):,} records")
-            
-            # Load demographic data (ALL records)
-            print("Loading demographic data files...")
-            demo_dfs = []
-            for file in demo_files:
-                try:
-                    df = pd.read_csv(file)
-                    demo_dfs.append(df)
-                    print(f"  ✓ Loaded {file}: {len(df):,} records")
-                except Exception as e:
-                    print(f"  ⚠️ Could not load {file}: {e}")
-            
-            if demo_dfs:
-                self.demo_data = pd.concat(demo_dfs, ignore_index=True)
-                print(f"✅ Combined demographic data: {len(self.demo_data):,} records")
-            
-            # Load enrollment data (ALL records)
-            print("Loading enrollment data files...")
-            enroll_dfs = []
-            for file in enroll_files:
-                try:
-                    df = pd.read_csv(file)
-                    enroll_dfs.append(df)
-                    print(f"  ✓ Loaded {file}: {len(df):,} records")
-                except Exception as e:
-                    print(f"  ⚠️ Could not load {file}: {e}")
+            # Load all shards concurrently (ALL records), merged in file order
+            print("Loading biometric, demographic and enrollment data files in parallel...")
+            frames, raw_bytes = ingest_datasets(
+                manifest.file_lists(),
+                on_loaded=lambda file, df: print(f"  ✓ Loaded {file}: {len(df):,} records"),
+                on_error=lambda file, e: print(f"  ⚠️ Could not load {file}: {e}"),
+                duplicates='drop' if self.drop_duplicates else 'report',
+                on_duplicates=lambda name, report: print(f"  🔎 {report.summary(name.title())}"
+                                                         + (" - cross-shard copies removed" if self.drop_duplicates else ""))
+            )
+            self.bio_data = frames['biometric']
+            self.demo_data = frames['demographic']
+            self.enroll_data = frames['enrollment']
             
-            if enroll_dfs:
-                self.enroll_data = pd.concat(enroll_dfs, ignore_index=True)
-                print(f"✅ Combined enrollment data: {len(self.enroll_data):,} records")
+            for label, data in [('biometric', self.bio_data), ('demographic', self.demo_data), ('enrollment', self.enroll_data)]:
+                if data is not None:
+                    print(f"✅ Combined {label} data: {len(data):,} records")
             
             # Verify we have data
             if self.bio_data is None or self.demo_data is None or self.enroll_data is None:
                 print("❌ Failed to load one or more datasets")
                 return False
             
-            # Preprocess data
-            print("Preprocessing data...")
-            for df in [self.bio_data, self.demo_data, self.enroll_data]:
-                df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y')
-                df['month'] = df['date'].dt.month
-                df['day'] = df['date'].dt.day
-                df['weekday'] = df['date'].dt.dayofweek
-            
-            # Add calculated columns
-            self.bio_data['total_bio'] = self.bio_data['bio_age_5_17'] + self.bio_data['bio_age_17_']
-            self.demo_data['total_demo'] = self.demo_data['demo_age_5_17'] + self.demo_data['demo_age_17_']
-            self.enroll_data['total_enroll'] = self.enroll_data['age_0_5'] + self.enroll_data['age_5_17'] + self.enroll_data['age_18_greater']
-            
             # Print summary statistics
             total_records = len(self.bio_data) + len(self.demo_data) + len(self.enroll_data)
             print(f"\n📊 COMPLETE DATA LOADING SUMMARY:")
@@ -124,6 +141,8 @@ class AadhaarPDFReportGenerator:
             print(f"   • Enrollment records: {len(self.enroll_data):,} (Expected: ~1,006,029)")
             print(f"   • States covered: {len(set(self.enroll_data['state'].unique()) | set(self.bio_data['state'].unique()) | set(self.demo_data['state'].unique()))}")
             print(f"   • Date range: {min(self.enroll_data['date'].min(), self.bio_data['date'].min(), self.demo_data['date'].min())} to {max(self.enroll_data['date'].max(), self.bio_data['date'].max(), self.demo_data['date'].max())}")
+            typed_bytes = sum(memory_bytes(df) for df in [self.bio_data, self.demo_data, self.enroll_data])
+            print(f"   • {format_footprint('Total', raw_bytes, typed_bytes)}")
             
             print("✅ ALL data loaded and preprocessed successfully!")
             return True
@@ -132,7 +151,104 @@ class AadhaarPDFReportGenerator:
             print(f"❌ Error loading data: {e}")
             return False
     
-    def create_title_page(self, pdf):
+    def build_report_bundle(self):
+        """Compute the aggregates all pages share in one fused groupby per dataset
+        
+        Every rollup a page draws (state, district, daily, monthly, weekday, age
+        totals, district means) is derived from these cells, never from the raw
+        rows. Enrollment cells are also keyed by total_enroll, which keeps the
+        per-row value distribution the z-score scatter needs.
+        """
+        enroll = _fused_cells(self.enroll_data, ['age_0_5', 'age_5_17', 'age_18_greater', 'total_enroll'],
+                              value_key='total_enroll')
+        bio = _fused_cells(self.bio_data, ['bio_age_5_17', 'bio_age_17_', 'total_bio'])
+        demo = _fused_cells(self.demo_data, ['demo_age_5_17', 'demo_age_17_', 'total_demo'])
+        
+        # Distinct (date, total) points with their row counts, split by z-score (> 2 is an anomaly)
+        points = (enroll.groupby(['date', 'value'], observed=True)['rows'].sum().reset_index()
+                  .rename(columns={'value': 'total_enroll'}))
+        rows = points['rows'].sum()
+        mean = (points['total_enroll'] * points['rows']).sum() / rows
+        std = np.sqrt(((points['total_enroll'] - mean) ** 2 * points['rows']).sum() / rows)
+        z_scores = ((points['total_enroll'] - mean) / std).abs()
+        
+        state_enroll = enroll.groupby('state', observed=True)['total_enroll'].sum().sort_values(ascending=False)
+        
+        # Service totals for the top 10 enrollment states
+        states = state_enroll.index[:10]
+        state_service_totals = pd.DataFrame({
+            'Enrollment': state_enroll.reindex(states, fill_value=0).values,
+            'Biometric': bio.groupby('state', observed=True)['total_bio'].sum().reindex(states, fill_value=0).values,
+            'Demographic': demo.groupby('state', observed=True)['total_demo'].sum().reindex(states, fill_value=0).values,
+        })
+        
+        daily = enroll.groupby('date')[['total_enroll', 'rows']].sum().sort_index()
+        weekday = daily.groupby(daily.index.dayofweek).sum()
+        district = enroll.groupby(['state', 'district'], observed=True)[
+            ['age_0_5', 'age_5_17', 'age_18_greater', 'total_enroll', 'rows']].sum()
+        district_means = district.drop(columns='rows').div(district['rows'], axis=0).reset_index()
+        
+        self.bundle = {
+            'records': {'enrollment': int(enroll['rows'].sum()), 'biometric': int(bio['rows'].sum()),
+                        'demographic': int(demo['rows'].sum())},
+            'enroll_states': enroll['state'].nunique(),
+            'enroll_districts': enroll['district'].nunique(),
+            'state_enroll': state_enroll,
+            'state_bio': bio.groupby('state', observed=True)['total_bio'].sum().sort_values(ascending=False),
+            'district_enroll': district['total_enroll'].sort_values(ascending=False),
+            'daily_enroll': daily['total_enroll'],
+            'monthly_enroll': daily['total_enroll'].groupby(daily.index.month).sum(),
+            'weekday_mean_enroll': weekday['total_enroll'] / weekday['rows'],
+            'column_sums': {
+                'enrollment': enroll[['age_0_5', 'age_5_17', 'age_18_greater']].sum().to_dict(),
+                'biometric': bio[['bio_age_5_17', 'bio_age_17_']].sum().to_dict(),
+                'demographic': demo[['demo_age_5_17', 'demo_age_17_']].sum().to_dict(),
+            },
+            'enroll_density': _density_image(points[z_scores <= 2]),
+            'enroll_anomalies': points[z_scores > 2].assign(z=z_scores).nlargest(MAX_ANOMALY_MARKERS, 'z'),
+            'enroll_anomaly_rows': int(points.loc[z_scores > 2, 'rows'].sum()),
+            'state_service_totals': state_service_totals,
+            'district_means': district_means,
+        }
+        return self.bundle
+    
+    def bundle_key(self, manifest):
+        """Result-cache key of the bundle: shard fingerprint, duplicate handling and the bundle code"""
+        return result_key('report_bundle', manifest.fingerprint(), {'drop_duplicates': self.drop_duplicates},
+                          code_version(self.build_report_bundle))
+    
+    def build_pages(self, max_workers=None):
+        """Draw every page concurrently in forked workers; return (one-page PDFs in page order, timings)
+        
+        Without fork (or if the pool breaks) the pages are built one after another.
+        """
+        global _ACTIVE_REPORT
+        _ACTIVE_REPORT = self
+        # Import pyplot (applying the report style) before forking, so workers inherit it
+        plt.close('all')
+        methods = [method for _, method in REPORT_PAGES]
+        built = {}
+        workers = min(max_workers or os.cpu_count() or 1, len(methods))
+        try:
+            if workers > 1 and 'fork' in multiprocessing.get_all_start_methods():
+                try:
+                    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork')) as pool:
+                        futures = {method: pool.submit(_build_page, method) for method in methods}
+                        built = {method: future.result() for method, future in futures.items()}
+                except (BrokenProcessPool, OSError) as e:
+                    print(f"⚠️ Page pool unavailable ({e}); building pages serially")
+                    built = {}
+            for method in methods:
+                if method not in built:
+                    built[method] = _build_page(method)
+        finally:
+            _ACTIVE_REPORT = None
+        
+        pages = [built[method][0] for method in methods]
+        timings = [built[method][1:] for method in methods]
+        return pages, timings
+    
+    def create_title_page(self):
         """Create professional title page"""
         fig, ax = plt.subplots(figsize=(8.5, 11))
         ax.set_xlim(0, 10)
@@ -154,26 +270,27 @@ class AadhaarPDFReportGenerator:
                 ha='center', va='center', color='#d35400')
         
         # Digital India logo placeholder
-        rect = Rectangle((4, 8.2), 2, 1, linewidth=2, edgecolor='#ff6b35', facecolor='#ff6b35', alpha=0.1)
+        rect = mpatches.Rectangle((4, 8.2), 2, 1, linewidth=2, edgecolor='#ff6b35', facecolor='#ff6b35', alpha=0.1)
         ax.add_patch(rect)
         ax.text(5, 8.7, '🏛️ DIGITAL INDIA', fontsize=14, fontweight='bold',
                 ha='center', va='center', color='#ff6b35')
         
         # Key metrics box
-        rect = Rectangle((1, 5.5), 8, 2, linewidth=2, edgecolor='#34495e', facecolor='#ecf0f1', alpha=0.8)
+        rect = mpatches.Rectangle((1, 5.5), 8, 2, linewidth=2, edgecolor='#34495e', facecolor='#ecf0f1', alpha=0.8)
         ax.add_patch(rect)
         
         ax.text(5, 7, 'EXECUTIVE SUMMARY', fontsize=16, fontweight='bold',
                 ha='center', va='center', color='#2c3e50')
         
         # Key statistics
-        total_records = len(self.enroll_data) + len(self.bio_data) + len(self.demo_data)
+        b = self.bundle
+        total_records = sum(b['records'].values())
         ax.text(2.5, 6.3, f'📊 Total Records Analyzed: {total_records:,}', fontsize=12, ha='left', va='center')
-        ax.text(2.5, 6.0, f'🗺️ States Covered: {len(self.enroll_data["state"].unique())}', fontsize=12, ha='left', va='center')
+        ax.text(2.5, 6.0, f'🗺️ States Covered: {b["enroll_states"]}', fontsize=12, ha='left', va='center')
         ax.text(2.5, 5.7, f'📅 Analysis Period: March - December 2025', fontsize=12, ha='left', va='center')
         
         # Problem statement box
-        rect = Rectangle((0.5, 2.5), 9, 2.5, linewidth=2, edgecolor='#27ae60', facecolor='#d5f4e6', alpha=0.8)
+        rect = mpatches.Rectangle((0.5, 2.5), 9, 2.5, linewidth=2, edgecolor='#27ae60', facecolor='#d5f4e6', alpha=0.8)
         ax.add_patch(rect)
         
         ax.text(5, 4.5, 'PROBLEM STATEMENT', fontsize=14, fontweight='bold',
@@ -192,10 +309,9 @@ and system improvements for the Digital India initiative."""
         ax.text(5, 1.0, 'Confidential - For Official Use Only', fontsize=10, 
                 ha='center', va='center', color='#e74c3c', fontweight='bold')
         
-        pdf.savefig(fig, bbox_inches='tight')
-        plt.close()
+        return fig
     
-    def create_methodology_page(self, pdf):
+    def create_methodology_page(self):
         """Create methodology and approach page"""
         fig, ax = plt.subplots(figsize=(8.5, 11))
         ax.set_xlim(0, 10)
@@ -207,15 +323,16 @@ and system improvements for the Digital India initiative."""
                 ha='center', va='center', color='#1f4e79')
         
         # Dataset description
-        rect = Rectangle((0.5, 10.5), 9, 2, linewidth=2, edgecolor='#3498db', facecolor='#ebf3fd', alpha=0.8)
+        rect = mpatches.Rectangle((0.5, 10.5), 9, 2, linewidth=2, edgecolor='#3498db', facecolor='#ebf3fd', alpha=0.8)
         ax.add_patch(rect)
         
         ax.text(5, 12, 'DATASETS UTILIZED', fontsize=14, fontweight='bold',
                 ha='center', va='center', color='#3498db')
         
-        dataset_text = f"""• Biometric Data: {len(self.bio_data):,} records across 4 CSV files (~1.86M total)
-• Demographic Data: {len(self.demo_data):,} records across 5 CSV files (~2.07M total)
-• Enrollment Data: {len(self.enroll_data):,} records across 3 CSV files (~1.01M total)"""
+        records = self.bundle['records']
+        dataset_text = f"""• Biometric Data: {records['biometric']:,} records across 4 CSV files (~1.86M total)
+• Demographic Data: {records['demographic']:,} records across 5 CSV files (~2.07M total)
+• Enrollment Data: {records['enrollment']:,} records across 3 CSV files (~1.01M total)"""
         
         ax.text(1, 11.2, dataset_text, fontsize=11, ha='left', va='center', color='#2c3e50')
         
@@ -232,7 +349,7 @@ and system improvements for the Digital India initiative."""
         y_pos = 9.5
         for i, (title, desc) in enumerate(methods):
             # Method box
-            rect = Rectangle((0.5, y_pos-0.4), 9, 0.8, linewidth=1, 
+            rect = mpatches.Rectangle((0.5, y_pos-0.4), 9, 0.8, linewidth=1, 
                            edgecolor='#95a5a6', facecolor='#f8f9fa', alpha=0.8)
             ax.add_patch(rect)
             
@@ -244,7 +361,7 @@ and system improvements for the Digital India initiative."""
             y_pos -= 1.2
         
         # Technical implementation
-        rect = Rectangle((0.5, 1.5), 9, 1.5, linewidth=2, edgecolor='#9b59b6', facecolor='#f4ecf7', alpha=0.8)
+        rect = mpatches.Rectangle((0.5, 1.5), 9, 1.5, linewidth=2, edgecolor='#9b59b6', facecolor='#f4ecf7', alpha=0.8)
         ax.add_patch(rect)
         
         ax.text(5, 2.7, 'TECHNICAL IMPLEMENTATION', fontsize=14, fontweight='bold',
@@ -257,10 +374,9 @@ Reproducibility: All code documented and modular for scalability"""
         ax.text(5, 2, tech_text, fontsize=10, ha='center', va='center', 
                 color='#2c3e50', linespacing=1.3)
         
-        pdf.savefig(fig, bbox_inches='tight')
-        plt.close()
+        return fig
     
-    def create_geographic_analysis_page(self, pdf):
+    def create_geographic_analysis_page(self):
         """Create geographic analysis page"""
         fig = plt.figure(figsize=(8.5, 11))
         
@@ -270,9 +386,11 @@ Reproducibility: All code documented and modular for scalability"""
         # Create subplots
         gs = fig.add_gridspec(3, 2, height_ratios=[1, 1, 1], hspace=0.4, wspace=0.3)
         
+        b = self.bundle
+        
         # State-wise enrollment
         ax1 = fig.add_subplot(gs[0, 0])
-        state_enroll = self.enroll_data.groupby('state')['total_enroll'].sum().sort_values(ascending=False).head(10)
+        state_enroll = b['state_enroll'].head(10)
         bars1 = ax1.barh(range(len(state_enroll)), state_enroll.values, color='#3498db')
         ax1.set_yticks(range(len(state_enroll)))
         ax1.set_yticklabels(state_enroll.index, fontsize=8)
@@ -287,7 +405,7 @@ Reproducibility: All code documented and modular for scalability"""
         
         # State-wise biometric
         ax2 = fig.add_subplot(gs[0, 1])
-        state_bio = self.bio_data.groupby('state')['total_bio'].sum().sort_values(ascending=False).head(10)
+        state_bio = b['state_bio'].head(10)
         bars2 = ax2.barh(range(len(state_bio)), state_bio.values, color='#e74c3c')
         ax2.set_yticks(range(len(state_bio)))
         ax2.set_yticklabels(state_bio.index, fontsize=8)
@@ -302,7 +420,7 @@ Reproducibility: All code documented and modular for scalability"""
         
         # District performance
         ax3 = fig.add_subplot(gs[1, :])
-        district_enroll = self.enroll_data.groupby(['state', 'district'])['total_enroll'].sum().sort_values(ascending=False).head(15)
+        district_enroll = b['district_enroll'].head(15)
         district_labels = [f"{idx[1]}, {idx[0]}" for idx in district_enroll.index]
         
         bars3 = ax3.bar(range(len(district_enroll)), district_enroll.values, color='#27ae60')
@@ -316,7 +434,7 @@ Reproducibility: All code documented and modular for scalability"""
         ax4.axis('off')
         
         # Insights box
-        rect = Rectangle((0.05, 0.1), 0.9, 0.8, linewidth=2, 
+        rect = mpatches.Rectangle((0.05, 0.1), 0.9, 0.8, linewidth=2, 
                         edgecolor='#f39c12', facecolor='#fef9e7', alpha=0.8, transform=ax4.transAxes)
         ax4.add_patch(rect)
         
@@ -331,25 +449,26 @@ Reproducibility: All code documented and modular for scalability"""
         insights_text = f"""• Geographic Concentration: Top 5 states account for {concentration_pct:.1f}% of total enrollments
 • Regional Leaders: {state_enroll.index[0]} leads with {state_enroll.iloc[0]:,} enrollments
 • District Hotspots: {district_enroll.index[0][1]} district shows highest activity
-• Coverage: Analysis spans {len(self.enroll_data['state'].unique())} states and {len(self.enroll_data['district'].unique())} districts
+• Coverage: Analysis spans {b['enroll_states']} states and {b['enroll_districts']} districts
 • Biometric Correlation: Strong positive correlation between enrollment and biometric updates"""
         
         ax4.text(0.1, 0.45, insights_text, fontsize=10, ha='left', va='center',
                 color='#2c3e50', transform=ax4.transAxes, linespacing=1.4)
         
-        pdf.savefig(fig, bbox_inches='tight')
-        plt.close()
+        return fig
     
-    def create_temporal_analysis_page(self, pdf):
+    def create_temporal_analysis_page(self):
         """Create temporal analysis page"""
         fig = plt.figure(figsize=(8.5, 11))
         fig.suptitle('TEMPORAL TRENDS ANALYSIS', fontsize=16, fontweight='bold', y=0.95)
         
         gs = fig.add_gridspec(3, 2, height_ratios=[1, 1, 1], hspace=0.4, wspace=0.3)
         
+        b = self.bundle
+        
         # Daily trends
         ax1 = fig.add_subplot(gs[0, :])
-        daily_enroll = self.enroll_data.groupby('date')['total_enroll'].sum().sort_index()
+        daily_enroll = b['daily_enroll']
         ax1.plot(daily_enroll.index, daily_enroll.values, color='#3498db', linewidth=2, marker='o', markersize=3)
         ax1.set_title('Daily Enrollment Trends Over Time', fontweight='bold', fontsize=12)
         ax1.set_ylabel('Total Enrollments')
@@ -358,7 +477,7 @@ Reproducibility: All code documented and modular for scalability"""
         
         # Monthly patterns
         ax2 = fig.add_subplot(gs[1, 0])
-        monthly_enroll = self.enroll_data.groupby('month')['total_enroll'].sum()
+        monthly_enroll = b['monthly_enroll']
         month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
                       'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
         
@@ -372,7 +491,7 @@ Reproducibility: All code documented and modular for scalability"""
         # Weekly patterns
         ax3 = fig.add_subplot(gs[1, 1])
         weekday_names = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-        weekly_enroll = self.enroll_data.groupby('weekday')['total_enroll'].mean()
+        weekly_enroll = b['weekday_mean_enroll']
         
         bars = ax3.bar(range(7), [weekly_enroll.get(i, 0) for i in range(7)], 
                       color='#27ae60', alpha=0.7)
@@ -385,7 +504,7 @@ Reproducibility: All code documented and modular for scalability"""
         ax4 = fig.add_subplot(gs[2, :])
         ax4.axis('off')
         
-        rect = Rectangle((0.05, 0.1), 0.9, 0.8, linewidth=2, 
+        rect = mpatches.Rectangle((0.05, 0.1), 0.9, 0.8, linewidth=2, 
                         edgecolor='#9b59b6', facecolor='#f4ecf7', alpha=0.8, transform=ax4.transAxes)
         ax4.add_patch(rect)
         
@@ -410,22 +529,23 @@ Reproducibility: All code documented and modular for scalability"""
         ax4.text(0.1, 0.45, temporal_insights, fontsize=10, ha='left', va='center',
                 color='#2c3e50', transform=ax4.transAxes, linespacing=1.4)
         
-        pdf.savefig(fig, bbox_inches='tight')
-        plt.close()
+        return fig
     
-    def create_demographic_analysis_page(self, pdf):
+    def create_demographic_analysis_page(self):
         """Create demographic analysis page"""
         fig = plt.figure(figsize=(8.5, 11))
         fig.suptitle('AGE DEMOGRAPHICS ANALYSIS', fontsize=16, fontweight='bold', y=0.95)
         
         gs = fig.add_gridspec(3, 3, height_ratios=[1, 1, 1], hspace=0.4, wspace=0.3)
         
+        sums = self.bundle['column_sums']
+        
         # Enrollment age distribution
         ax1 = fig.add_subplot(gs[0, 0])
         age_data = [
-            self.enroll_data['age_0_5'].sum(),
-            self.enroll_data['age_5_17'].sum(),
-            self.enroll_data['age_18_greater'].sum()
+            sums['enrollment']['age_0_5'],
+            sums['enrollment']['age_5_17'],
+            sums['enrollment']['age_18_greater']
         ]
         age_labels = ['0-5 years', '5-17 years', '18+ years']
         colors = ['#ff9999', '#66b3ff', '#99ff99']
@@ -437,8 +557,8 @@ Reproducibility: All code documented and modular for scalability"""
         # Biometric age distribution
         ax2 = fig.add_subplot(gs[0, 1])
         bio_age_data = [
-            self.bio_data['bio_age_5_17'].sum(),
-            self.bio_data['bio_age_17_'].sum()
+            sums['biometric']['bio_age_5_17'],
+            sums['biometric']['bio_age_17_']
         ]
         bio_labels = ['5-17 years', '17+ years']
         bio_colors = ['#ffcc99', '#ff9999']
@@ -450,8 +570,8 @@ Reproducibility: All code documented and modular for scalability"""
         # Demographic age distribution
         ax3 = fig.add_subplot(gs[0, 2])
         demo_age_data = [
-            self.demo_data['demo_age_5_17'].sum(),
-            self.demo_data['demo_age_17_'].sum()
+            sums['demographic']['demo_age_5_17'],
+            sums['demographic']['demo_age_17_']
         ]
         demo_labels = ['5-17 years', '17+ years']
         demo_colors = ['#c2c2f0', '#ffb3e6']
@@ -464,15 +584,7 @@ Reproducibility: All code documented and modular for scalability"""
         ax4 = fig.add_subplot(gs[1, :])
         services = ['Enrollment\n(0-5)', 'Enrollment\n(5-17)', 'Enrollment\n(18+)', 
                    'Biometric\n(5-17)', 'Biometric\n(17+)', 'Demographic\n(5-17)', 'Demographic\n(17+)']
-        values = [
-            self.enroll_data['age_0_5'].sum(),
-            self.enroll_data['age_5_17'].sum(),
-            self.enroll_data['age_18_greater'].sum(),
-            self.bio_data['bio_age_5_17'].sum(),
-            self.bio_data['bio_age_17_'].sum(),
-            self.demo_data['demo_age_5_17'].sum(),
-            self.demo_data['demo_age_17_'].sum()
-        ]
+        values = age_data + bio_age_data + demo_age_data
         
         bars = ax4.bar(services, values, color=['#3498db', '#3498db', '#3498db', '#e74c3c', '#e74c3c', '#27ae60', '#27ae60'])
         ax4.set_title('Service Usage Comparison Across Age Groups', fontweight='bold', fontsize=12)
@@ -489,7 +601,7 @@ Reproducibility: All code documented and modular for scalability"""
         ax5 = fig.add_subplot(gs[2, :])
         ax5.axis('off')
         
-        rect = Rectangle((0.05, 0.1), 0.9, 0.8, linewidth=2, 
+        rect = mpatches.Rectangle((0.05, 0.1), 0.9, 0.8, linewidth=2, 
                         edgecolor='#e67e22', facecolor='#fdf2e9', alpha=0.8, transform=ax5.transAxes)
         ax5.add_patch(rect)
         
@@ -497,8 +609,8 @@ Reproducibility: All code documented and modular for scalability"""
                 ha='center', va='center', color='#e67e22', transform=ax5.transAxes)
         
         # Calculate demographic insights
-        adult_enroll_pct = (self.enroll_data['age_18_greater'].sum() / sum(age_data)) * 100
-        adult_bio_pct = (self.bio_data['bio_age_17_'].sum() / sum(bio_age_data)) * 100
+        adult_enroll_pct = (age_data[2] / sum(age_data)) * 100
+        adult_bio_pct = (bio_age_data[1] / sum(bio_age_data)) * 100
         
         demo_insights = f"""• Adult Dominance: {adult_enroll_pct:.1f}% of enrollments are from 18+ age group
 • Youth Engagement: 5-17 age group shows {(age_data[1]/sum(age_data)*100):.1f}% enrollment participation
@@ -509,37 +621,37 @@ Reproducibility: All code documented and modular for scalability"""
         ax5.text(0.1, 0.45, demo_insights, fontsize=10, ha='left', va='center',
                 color='#2c3e50', transform=ax5.transAxes, linespacing=1.4)
         
-        pdf.savefig(fig, bbox_inches='tight')
-        plt.close()
+        return fig
     
-    def create_advanced_analytics_page(self, pdf):
+    def create_advanced_analytics_page(self):
         """Create advanced analytics page"""
         fig = plt.figure(figsize=(8.5, 11))
         fig.suptitle('ADVANCED ANALYTICS & ANOMALY DETECTION', fontsize=16, fontweight='bold', y=0.95)
         
         gs = fig.add_gridspec(3, 2, height_ratios=[1, 1, 1], hspace=0.4, wspace=0.3)
         
+        b = self.bundle
+        
         # Anomaly detection
-        from scipy import stats
         ax1 = fig.add_subplot(gs[0, :])
         
-        # Calculate z-scores for anomaly detection
-        z_scores = np.abs(stats.zscore(self.enroll_data['total_enroll']))
-        anomalies = self.enroll_data[z_scores > 2]
-        normal_data = self.enroll_data[z_scores <= 2]
-        
-        # Plot normal data
-        ax1.scatter(normal_data['date'], normal_data['total_enroll'], 
-                   c='blue', alpha=0.6, s=20, label='Normal Data')
+        # Normal rows as a fixed-resolution density image (z-score <= 2), anomalies as markers
+        anomalies = b['enroll_anomalies']
+        counts, extent = b['enroll_density']
+        from matplotlib.colors import LogNorm
+        ax1.imshow(np.ma.masked_equal(counts.T, 0), origin='lower', extent=extent, aspect='auto',
+                   cmap='Blues', norm=LogNorm(), interpolation='nearest')
+        ax1.xaxis_date()
+        handles = [mpatches.Patch(color='#4a90c2', label='Normal Data (density)')]
         
         # Plot anomalies
         if len(anomalies) > 0:
-            ax1.scatter(anomalies['date'], anomalies['total_enroll'], 
-                       c='red', s=50, marker='x', label='Anomalies')
+            handles.append(ax1.scatter(anomalies['date'], anomalies['total_enroll'], 
+                                       c='red', s=50, marker='x', label='Anomalies'))
         
         ax1.set_title('Anomaly Detection in Enrollment Data', fontweight='bold', fontsize=12)
         ax1.set_ylabel('Total Enrollment')
-        ax1.legend()
+        ax1.legend(handles=handles)
         ax1.tick_params(axis='x', rotation=45)
         ax1.grid(True, alpha=0.3)
         
@@ -547,15 +659,7 @@ Reproducibility: All code documented and modular for scalability"""
         ax2 = fig.add_subplot(gs[1, 0])
         
         # Create correlation data
-        state_summary = []
-        for state in self.enroll_data['state'].unique()[:10]:  # Top 10 states
-            enroll_sum = self.enroll_data[self.enroll_data['state'] == state]['total_enroll'].sum()
-            bio_sum = self.bio_data[self.bio_data['state'] == state]['total_bio'].sum()
-            demo_sum = self.demo_data[self.demo_data['state'] == state]['total_demo'].sum()
-            state_summary.append([enroll_sum, bio_sum, demo_sum])
-        
-        corr_data = pd.DataFrame(state_summary, columns=['Enrollment', 'Biometric', 'Demographic'])
-        correlation_matrix = corr_data.corr()
+        correlation_matrix = b['state_service_totals'].corr()
         
         im = ax2.imshow(correlation_matrix, cmap='RdYlBu_r', aspect='auto')
         ax2.set_xticks(range(len(correlation_matrix.columns)))
@@ -578,12 +682,7 @@ Reproducibility: All code documented and modular for scalability"""
         from sklearn.preprocessing import StandardScaler
         
         # Prepare data for clustering
-        district_features = self.enroll_data.groupby(['state', 'district']).agg({
-            'age_0_5': 'mean',
-            'age_5_17': 'mean',
-            'age_18_greater': 'mean',
-            'total_enroll': 'mean'
-        }).reset_index()
+        district_features = b['district_means']
         
         # Standardize and cluster
         scaler = StandardScaler()
@@ -603,7 +702,7 @@ Reproducibility: All code documented and modular for scalability"""
         ax4 = fig.add_subplot(gs[2, :])
         ax4.axis('off')
         
-        rect = Rectangle((0.05, 0.1), 0.9, 0.8, linewidth=2, 
+        rect = mpatches.Rectangle((0.05, 0.1), 0.9, 0.8, linewidth=2, 
                         edgecolor='#8e44ad', facecolor='#f4ecf7', alpha=0.8, transform=ax4.transAxes)
         ax4.add_patch(rect)
         
@@ -611,7 +710,8 @@ Reproducibility: All code documented and modular for scalability"""
                 ha='center', va='center', color='#8e44ad', transform=ax4.transAxes)
         
         # Calculate advanced insights
-        anomaly_rate = (len(anomalies) / len(self.enroll_data)) * 100
+        anomaly_count = b['enroll_anomaly_rows']
+        anomaly_rate = (anomaly_count / b['records']['enrollment']) * 100
         strong_correlations = []
         for i in range(len(correlation_matrix)):
             for j in range(i+1, len(correlation_matrix)):
@@ -619,7 +719,7 @@ Reproducibility: All code documented and modular for scalability"""
                     strong_correlations.append(f"{correlation_matrix.index[i]}-{correlation_matrix.columns[j]}")
         
         advanced_insights = f"""• Anomaly Detection: {anomaly_rate:.1f}% of enrollment data points flagged as statistical outliers
-• Quality Monitoring: {len(anomalies)} anomalous transactions require investigation
+• Quality Monitoring: {anomaly_count:,} anomalous transactions require investigation
 • Service Correlations: Strong positive correlations detected between all service types
 • District Clustering: 3 distinct district patterns identified for targeted resource allocation
 • Predictive Indicators: Machine learning models show 85% accuracy in forecasting demand"""
@@ -627,10 +727,9 @@ Reproducibility: All code documented and modular for scalability"""
         ax4.text(0.1, 0.45, advanced_insights, fontsize=10, ha='left', va='center',
                 color='#2c3e50', transform=ax4.transAxes, linespacing=1.4)
         
-        pdf.savefig(fig, bbox_inches='tight')
-        plt.close()
+        return fig
     
-    def create_recommendations_page(self, pdf):
+    def create_recommendations_page(self):
         """Create strategic recommendations page"""
         fig, ax = plt.subplots(figsize=(8.5, 11))
         ax.set_xlim(0, 10)
@@ -693,7 +792,7 @@ Reproducibility: All code documented and modular for scalability"""
         y_pos = 11.5
         for rec in recommendations:
             # Title box
-            rect = Rectangle((0.5, y_pos-0.3), 9, 0.6, linewidth=2, 
+            rect = mpatches.Rectangle((0.5, y_pos-0.3), 9, 0.6, linewidth=2, 
                            edgecolor=rec['color'], facecolor=rec['color'], alpha=0.1)
             ax.add_patch(rect)
             
@@ -709,7 +808,7 @@ Reproducibility: All code documented and modular for scalability"""
             y_pos -= 2.2
         
         # Impact assessment box
-        rect = Rectangle((0.5, 0.5), 9, 1.5, linewidth=3, 
+        rect = mpatches.Rectangle((0.5, 0.5), 9, 1.5, linewidth=3, 
                         edgecolor='#2c3e50', facecolor='#ecf0f1', alpha=0.9)
         ax.add_patch(rect)
         
@@ -725,10 +824,9 @@ Reproducibility: All code documented and modular for scalability"""
         ax.text(1, 1.1, impact_text, fontsize=10, ha='left', va='center',
                 color='#2c3e50', linespacing=1.3)
         
-        pdf.savefig(fig, bbox_inches='tight')
-        plt.close()
+        return fig
     
-    def create_conclusion_page(self, pdf):
+    def create_conclusion_page(self):
         """Create conclusion and next steps page"""
         fig, ax = plt.subplots(figsize=(8.5, 11))
         ax.set_xlim(0, 10)
@@ -740,7 +838,7 @@ Reproducibility: All code documented and modular for scalability"""
                 ha='center', va='center', color='#1f4e79')
         
         # Key achievements box
-        rect = Rectangle((0.5, 10), 9, 2.5, linewidth=2, 
+        rect = mpatches.Rectangle((0.5, 10), 9, 2.5, linewidth=2, 
                         edgecolor='#27ae60', facecolor='#d5f4e6', alpha=0.8)
         ax.add_patch(rect)
         
@@ -757,7 +855,7 @@ Reproducibility: All code documented and modular for scalability"""
                 color='#2c3e50', linespacing=1.4)
         
         # Next steps box
-        rect = Rectangle((0.5, 6.5), 9, 3, linewidth=2, 
+        rect = mpatches.Rectangle((0.5, 6.5), 9, 3, linewidth=2, 
                         edgecolor='#3498db', facecolor='#ebf3fd', alpha=0.8)
         ax.add_patch(rect)
         
@@ -774,7 +872,7 @@ Ongoing: Continuous monitoring and model refinement"""
                 color='#2c3e50', linespacing=1.4)
         
         # Technical specifications box
-        rect = Rectangle((0.5, 3.5), 9, 2.5, linewidth=2, 
+        rect = mpatches.Rectangle((0.5, 3.5), 9, 2.5, linewidth=2, 
                         edgecolor='#e74c3c', facecolor='#fdedec', alpha=0.8)
         ax.add_patch(rect)
         
@@ -803,53 +901,57 @@ Ongoing: Continuous monitoring and model refinement"""
         ax.text(5, 0.8, 'Confidential - For Official Use Only', fontsize=10,
                 ha='center', va='center', color='#e74c3c', fontweight='bold')
         
-        pdf.savefig(fig, bbox_inches='tight')
-        plt.close()
+        return fig
     
-    def generate_pdf_report(self, filename='Aadhaar_DataThon_Winning_Report.pdf'):
-        """Generate complete PDF report"""
+    def prepare_bundle(self, cache=None):
+        """Restore the aggregate bundle for unchanged shards, or load the data and build (and store) it"""
+        manifest = load_manifest()
+        key = self.bundle_key(manifest)
+        if cache is not None:
+            hit, bundle = cache.get(key)
+            if hit:
+                self.bundle = bundle
+                print(f"📦 Aggregate bundle restored for unchanged shards - data pass skipped ({cache.root})")
+                return True
+        
+        if not self.load_data(manifest):
+            return False
+        start = time.perf_counter()
+        self.build_report_bundle()
+        print(f"📦 Aggregate bundle built ({time.perf_counter() - start:.2f}s)")
+        if cache is not None:
+            cache.put(key, self.bundle)
+        return True
+    
+    def generate_pdf_report(self, filename='Aadhaar_DataThon_Winning_Report.pdf', max_workers=None, cache=None):
+        """Generate complete PDF report, building its pages in parallel from the aggregate bundle"""
         print("Generating hackathon-winning PDF report...")
         
-        if not self.load_data():
+        start = time.perf_counter()
+        if not self.prepare_bundle(cache):
             print("Failed to load data. Cannot generate report.")
             return False
         
         try:
-            with PdfPages(filename) as pdf:
-                print("Creating title page...")
-                self.create_title_page(pdf)
-                
-                print("Creating methodology page...")
-                self.create_methodology_page(pdf)
-                
-                print("Creating geographic analysis...")
-                self.create_geographic_analysis_page(pdf)
-                
-                print("Creating temporal analysis...")
-                self.create_temporal_analysis_page(pdf)
-                
-                print("Creating demographic analysis...")
-                self.create_demographic_analysis_page(pdf)
-                
-                print("Creating advanced analytics...")
-                self.create_advanced_analytics_page(pdf)
-                
-                print("Creating recommendations...")
-                self.create_recommendations_page(pdf)
-                
-                print("Creating conclusion...")
-                self.create_conclusion_page(pdf)
-                
-                # Set PDF metadata
-                d = pdf.infodict()
-                d['Title'] = 'Aadhaar Data Analytics - DataThon Winning Submission'
-                d['Author'] = 'Digital India Analytics Team'
-                d['Subject'] = 'Comprehensive Analysis of Aadhaar Enrollment and Update Data'
-                d['Keywords'] = 'Aadhaar, Data Analytics, Digital India, Machine Learning, Predictive Analytics'
-                d['Creator'] = 'Python Analytics Framework'
-                d['Producer'] = 'Hackathon Winning Solution'
+            pages, timings = self.build_pages(max_workers)
+            for (label, _), (wall, cpu) in zip(REPORT_PAGES, timings):
+                print(f"   {label:<24} drawn {wall:6.2f}s wall {cpu:6.2f}s CPU")
             
-            print(f"✅ PDF report generated successfully: {filename}")
+            # Join the pre-drawn pages in order; nothing is redrawn here
+            write = time.perf_counter()
+            report = assemble_pages(pages, metadata={
+                'Title': 'Aadhaar Data Analytics - DataThon Winning Submission',
+                'Author': 'Digital India Analytics Team',
+                'Subject': 'Comprehensive Analysis of Aadhaar Enrollment and Update Data',
+                'Keywords': 'Aadhaar, Data Analytics, Digital India, Machine Learning, Predictive Analytics',
+                'Creator': 'Python Analytics Framework',
+                'Producer': 'Hackathon Winning Solution',
+            })
+            with open(filename, 'wb') as f:
+                f.write(report)
+            print(f"   {'assembled':<24} {time.perf_counter() - write:6.2f}s")
+            
+            print(f"✅ PDF report generated successfully: {filename} ({time.perf_counter() - start:.2f}s)")
             return True
             
         except Exception as e:
@@ -858,8 +960,18 @@ Ongoing: Continuous monitoring and model refinement"""
 
 def main():
     """Main function to generate PDF report"""
-    generator = AadhaarPDFReportGenerator()
-    success = generator.generate_pdf_report()
+    parser = argparse.ArgumentParser(description="Generate the Aadhaar DataThon PDF report")
+    parser.add_argument('--drop-duplicates', action='store_true',
+                        help="remove records whose (date, state, district, pincode) already appeared in an earlier shard")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes that build the report pages (default: CPU count, 1 = serial)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="reload the data and rebuild the aggregate bundle instead of reusing the stored one")
+    args = parser.parse_args()
+    
+    generator = AadhaarPDFReportGenerator(drop_duplicates=args.drop_duplicates)
+    success = generator.generate_pdf_report(max_workers=args.workers,
+                                            cache=None if args.no_cache else ResultCache())
     
     if success:
         print("\n🏆 HACKATHON-WINNING PDF REPORT GENERATED!")
@@ -0,0 +1,165 @@
+"""
+Aadhaar DataThon - Result Cache
+Content-addressed on-disk cache of analysis results with size-bounded LRU eviction
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import shutil
+from pathlib import Path
+
+from data_cache import CACHE_DIR, CACHE_VERSION
+
+# Results live here, inside the shard cache directory
+RESULTS_DIR = 'results'
+
+# Least recently used entries are evicted once the cache grows past this size
+DEFAULT_MAX_MB = 512
+
+RESULT_FILE = 'result.pkl'
+ARTIFACTS_DIR = 'artifacts'
+
+# Code outside the repository (pandas, sklearn, ...) does not enter the code version
+_REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _is_repo_function(func):
+    """Whether a function is defined in one of the repository's modules"""
+    if not inspect.isfunction(func):
+        return False
+    try:
+        return os.path.dirname(os.path.abspath(inspect.getsourcefile(func))) == _REPO_DIR
+    except TypeError:
+        return False
+
+
+def _code_names(code):
+    """Global and attribute names a code object uses, including its comprehensions, lambdas and inner functions"""
+    names = list(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names.extend(_code_names(const))
+    return names
+
+
+def code_version(func):
+    """Hash of a task's source plus the repository methods and functions it calls, transitively
+
+    Editing one analysis only changes the version of the tasks that reach the
+    edited code, so the other tasks keep their cached results.
+    """
+    owner = type(func.__self__) if inspect.ismethod(func) else None
+    digest = hashlib.sha256(str(CACHE_VERSION).encode())
+    seen, stack = set(), [getattr(func, '__func__', func)]
+    while stack:
+        current = stack.pop()
+        if not _is_repo_function(current) or current in seen:
+            continue
+        seen.add(current)
+        digest.update(inspect.getsource(current).encode())
+        for name in _code_names(current.__code__):
+            method = getattr(owner, name, None) if owner is not None else None
+            stack.append(getattr(method, '__func__', method))
+            stack.append(current.__globals__.get(name))
+    return digest.hexdigest()
+
+
+def result_key(name, fingerprint, params, code, inputs=()):
+    """Content address of a result: task name, data fingerprint, parameters, code version and input keys"""
+    payload = json.dumps({
+        'task': name,
+        'fingerprint': fingerprint,
+        'params': params,
+        'code': code,
+        'inputs': list(inputs),
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResultCache:
+    """Pickled results and the files a task wrote, stored under their content key
+
+    Each entry is a directory named by its key. A hit refreshes the entry's
+    modification time, which orders the least-recently-used eviction.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_mb=DEFAULT_MAX_MB):
+        self.root = Path(cache_dir) / RESULTS_DIR
+        self.max_bytes = max_mb * 1024 * 1024
+        self.hits = 0
+        self.misses = 0
+
+    def _entry(self, key):
+        """Directory holding one cached result"""
+        return self.root / key
+
+    def get(self, key):
+        """Return (True, result) and restore the entry's files, or (False, None) on a miss"""
+        entry = self._entry(key)
+        try:
+            with open(entry / RESULT_FILE, 'rb') as f:
+                result = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            self.misses += 1
+            return False, None
+
+        artifacts = entry / ARTIFACTS_DIR
+        if artifacts.is_dir():
+            for artifact in artifacts.iterdir():
+                shutil.copy2(artifact, artifact.name)
+        os.utime(entry)
+        self.hits += 1
+        return True, result
+
+    def put(self, key, result, artifacts=()):
+        """Store a result and copies of the files it produced, then evict down to the size bound"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.root / f".{key}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir()
+        try:
+            with open(tmp / RESULT_FILE, 'wb') as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            shutil.rmtree(tmp, ignore_errors=True)
+            print(f"⚠️ Result not cached ({e})")
+            return False
+
+        for artifact in artifacts:
+            if os.path.exists(artifact):
+                (tmp / ARTIFACTS_DIR).mkdir(exist_ok=True)
+                shutil.copy2(artifact, tmp / ARTIFACTS_DIR / os.path.basename(artifact))
+
+        entry = self._entry(key)
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(tmp, entry)
+        self.evict()
+        return True
+
+    @staticmethod
+    def _size(entry):
+        """Bytes stored in one entry"""
+        return sum(path.stat().st_size for path in entry.rglob('*') if path.is_file())
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits its size bound"""
+        if not self.root.is_dir():
+            return 0
+        entries = [(entry.stat().st_mtime, self._size(entry), entry)
+                   for entry in self.root.iterdir() if entry.is_dir() and not entry.name.startswith('.')]
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def summary(self):
+        """One-line hit/miss description"""
+        return f"Result cache: {self.hits} hits, {self.misses} misses ({self.root})"
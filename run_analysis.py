@@ -3,9 +3,23 @@ Main execution script for Aadhaar DataThon Analysis
 Run this script to execute the complete analysis pipeline
 """
 
+import argparse
 import sys
 import subprocess
 import os
+import time
+
+from lazy_imports import lazy_module
+from data_schema import format_footprint, memory_bytes
+from parallel_ingest import ingest_datasets
+from shard_manifest import load_manifest
+from data_exploration import AadhaarDataExplorer
+from aadhaar_analysis import AadhaarAnalyzer
+from advanced_insights import AdvancedAadhaarAnalytics
+from result_cache import ResultCache
+from figure_rendering import FigureJob, figure_jobs, render_figures
+
+plt = lazy_module('matplotlib.pyplot')
 
 def install_requirements():
     """Install required packages"""
@@ -18,62 +32,123 @@ def install_requirements():
         return False
     return True
 
-def run_analysis_pipeline():
-    """Run the complete analysis pipeline"""
+class DataStore:
+    """Every dataset loaded and preprocessed once, shared read-only by all pipeline stages"""
+    
+    def __init__(self):
+        self.manifest = None
+        self.frames = {}
+        # Unchanged analyses reuse their results across runs
+        self.cache = ResultCache()
+    
+    def load(self):
+        """Read every shard concurrently into typed frames with derived columns"""
+        self.manifest = load_manifest()
+        print(self.manifest.summary())
+        self.frames, raw_bytes = ingest_datasets(
+            self.manifest.file_lists(),
+            on_error=lambda file, e: print(f"  ⚠️ Could not load {file}: {e}")
+        )
+        for dataset, df in self.frames.items():
+            if df is not None:
+                print(f"✓ {dataset.title()} data: {len(df):,} records")
+        typed_bytes = sum(memory_bytes(df) for df in self.frames.values() if df is not None)
+        print(format_footprint("Shared store", raw_bytes, typed_bytes))
+        return self
+
+def exploration_stage(store):
+    """Dataset structure and a data-quality profile of every record in the shared store"""
+    explorer = AadhaarDataExplorer(store.manifest)
+    return {
+        'structure': explorer.explore_dataset_structure(store.frames),
+        'quality_profile': explorer.analyze_data_quality(frames=store.frames),
+    }
+
+def _unwrap(results):
+    """Task results with each FigureJob replaced by the analysis result it carries"""
+    return {name: result.result if isinstance(result, FigureJob) else result
+            for name, result in results.items()}
+
+def analysis_stage(store):
+    """Geographic, age and temporal analysis with insights and recommendations"""
+    analyzer = AadhaarAnalyzer()
+    analyzer.use_frames(store.frames, store.manifest.fingerprint())
+    graph = analyzer.analysis_graph(store.cache)
+    results = graph.run()
+    graph.report()
+    render_figures(figure_jobs(results), cache=store.cache)
+    results = _unwrap(results)
+    return {
+        'state_enrollment': results.get('geographic'),
+        'insights': results.get('insights'),
+        'recommendations': results.get('recommendations'),
+    }
+
+def advanced_stage(store):
+    """Clustering, anomaly detection, correlations and predictions"""
+    analyzer = AdvancedAadhaarAnalytics()
+    analyzer.use_frames(store.frames, store.manifest.fingerprint())
+    graph = analyzer.analysis_graph(store.cache)
+    results = graph.run()
+    graph.report()
+    render_figures(figure_jobs(results), cache=store.cache)
+    results = _unwrap(results)
+    return {
+        'district_clusters': results.get('clustering'),
+        'anomalies': results.get('anomalies'),
+        'correlations': results.get('correlations'),
+        'predictions': results.get('predictions'),
+        'recommendations': results.get('recommendations'),
+    }
+
+# Pipeline stages in execution order: (name, description, stage function)
+PIPELINE_STAGES = [
+    ("exploration", "Data Exploration and Structure Analysis", exploration_stage),
+    ("analysis", "Comprehensive Aadhaar Analysis", analysis_stage),
+    ("advanced", "Advanced Analytics and Insights", advanced_stage),
+]
+
+def run_analysis_pipeline(stages=PIPELINE_STAGES):
+    """Run the complete analysis pipeline in-process against one shared data store
+    
+    Returns {stage name: {'status', 'seconds', 'output', 'error'}} where output is
+    whatever the stage function returned.
+    """
     print("\n" + "="*60)
     print("AADHAAR DATATHON - COMPLETE ANALYSIS PIPELINE")
     print("="*60)
     
-    scripts = [
-        ("data_exploration.py", "Data Exploration and Structure Analysis"),
-        ("aadhaar_analysis.py", "Comprehensive Aadhaar Analysis"),
-        ("advanced_insights.py", "Advanced Analytics and Insights")
-    ]
+    print("\n📥 Loading all datasets once into the shared store")
+    print("-" * 50)
+    store = DataStore().load()
     
     results = {}
     
-    for script, description in scripts:
+    for name, description, stage in stages:
         print(f"\n🔄 Running: {description}")
         print("-" * 50)
         
+        start = time.perf_counter()
         try:
-            # Execute the script
-            result = subprocess.run([sys.executable, script], 
-                                  capture_output=True, 
-                                  text=True, 
-                                  timeout=300)  # 5 minute timeout
-            
-            if result.returncode == 0:
-                print(f"✓ {description} completed successfully!")
-                results[script] = "SUCCESS"
-                
-                # Print last few lines of output
-                if result.stdout:
-                    lines = result.stdout.strip().split('\n')
-                    print("Output preview:")
-                    for line in lines[-5:]:
-                        print(f"  {line}")
-                        
-            else:
-                print(f"❌ {description} failed!")
-                print(f"Error: {result.stderr}")
-                results[script] = "FAILED"
-                
-        except subprocess.TimeoutExpired:
-            print(f"⏰ {description} timed out!")
-            results[script] = "TIMEOUT"
+            output = stage(store)
+            results[name] = {'status': "SUCCESS", 'output': output, 'error': None}
+            print(f"✓ {description} completed successfully!")
         except Exception as e:
             print(f"❌ Error running {description}: {e}")
-            results[script] = "ERROR"
+            results[name] = {'status': "ERROR", 'output': None, 'error': e}
+        finally:
+            # Figures are saved to disk by each stage; release them before the next
+            plt.close('all')
+        results[name]['seconds'] = time.perf_counter() - start
     
     # Print summary
     print("\n" + "="*60)
     print("ANALYSIS PIPELINE SUMMARY")
     print("="*60)
     
-    for script, status in results.items():
-        status_icon = "✓" if status == "SUCCESS" else "❌"
-        print(f"{status_icon} {script}: {status}")
+    for name, result in results.items():
+        status_icon = "✓" if result['status'] == "SUCCESS" else "❌"
+        print(f"{status_icon} {name}: {result['status']} ({result['seconds']:.1f}s)")
     
     # Check for generated files
     expected_files = [
@@ -162,11 +237,16 @@ Identify meaningful patterns, trends, anomalies, and predictive indicators in Aa
 
 def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description="Run the complete Aadhaar analysis pipeline")
+    parser.add_argument('--skip-install', action='store_true',
+                        help="do not pip install requirements.txt before running")
+    args = parser.parse_args()
+    
     print("AADHAAR DATATHON ANALYSIS - AUTOMATED EXECUTION")
     print("="*60)
     
     # Install requirements
-    if not install_requirements():
+    if not args.skip_install and not install_requirements():
         print("❌ Failed to install requirements. Please install manually.")
         return
     
@@ -177,7 +257,7 @@ def main():
     generate_summary_report()
     
     # Final status
-    success_count = sum(1 for status in results.values() if status == "SUCCESS")
+    success_count = sum(1 for result in results.values() if result['status'] == "SUCCESS")
     total_count = len(results)
     
     print(f"\n🎯 FINAL RESULT: {success_count}/{total_count} analyses completed successfully!")
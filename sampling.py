@@ -0,0 +1,81 @@
+"""
+Aadhaar DataThon - Stratified Streaming Sampler
+Seeded reservoir samples stratified by state (and optionally month), read shard by shard
+"""
+
+import os
+import zlib
+
+import numpy as np
+
+from data_cache import iter_shard
+from data_schema import concat_frames
+
+# Fixed seed so every run draws the same sample
+SAMPLE_SEED = 42
+
+# Every stratum keeps at least this many rows (or all of them, if it has fewer)
+MIN_PER_STRATUM = 200
+
+# Rows per chunk while streaming a shard
+SAMPLE_BATCH_ROWS = 250000
+
+# Random priority of each row; the sample keeps the lowest priorities
+PRIORITY_COLUMN = '_priority'
+
+
+class StratifiedSampler:
+    """Bottom-k reservoir sample of the shards, stratified by state (and optionally month)
+
+    Every row draws a seeded uniform priority. A row is kept if it is among the
+    `size` lowest priorities overall (or below `fraction`), or among the
+    `min_per_stratum` lowest of its stratum. Both rules only ever discard rows,
+    so shards are sampled chunk by chunk and per-shard samples merge into the
+    same sample a single pass over all records would draw.
+    """
+
+    def __init__(self, size=None, fraction=None, min_per_stratum=MIN_PER_STRATUM, by_month=False,
+                 seed=SAMPLE_SEED, batch_rows=SAMPLE_BATCH_ROWS):
+        if (size is None) == (fraction is None):
+            raise ValueError("Specify exactly one of size or fraction")
+        self.size = size
+        self.fraction = fraction
+        self.min_per_stratum = min_per_stratum
+        self.by_month = by_month
+        self.seed = seed
+        self.batch_rows = batch_rows
+
+    def _strata(self, frame):
+        """Stratum keys of each row"""
+        keys = [frame['state']]
+        if self.by_month:
+            keys.append(frame['date'].dt.month.rename('month'))
+        return keys
+
+    def _select(self, frame):
+        """Keep the rows a sample of everything seen so far can still contain"""
+        frame = frame.sort_values(PRIORITY_COLUMN, kind='stable', ignore_index=True)
+        if self.size is not None:
+            keep = np.arange(len(frame)) < self.size
+        else:
+            keep = frame[PRIORITY_COLUMN].to_numpy() < self.fraction
+        if self.min_per_stratum:
+            rank = frame.groupby(self._strata(frame), observed=True, dropna=False, sort=False).cumcount()
+            keep |= rank.to_numpy() < self.min_per_stratum
+        return frame[keep]
+
+    def sample_shard(self, csv_path):
+        """Stream one shard, returning its candidate rows with their priorities"""
+        # Seeded per shard name, so a shard draws the same priorities whatever its position
+        rng = np.random.default_rng([self.seed, zlib.crc32(os.path.basename(csv_path).encode())])
+        sample = None
+        for chunk in iter_shard(csv_path, self.batch_rows):
+            chunk[PRIORITY_COLUMN] = rng.random(len(chunk))
+            sample = self._select(concat_frames([sample, chunk]))
+        return sample
+
+    def merge(self, frame):
+        """Reduce concatenated shard candidates to the final sample, dropping the priorities"""
+        if frame is None:
+            return None
+        return self._select(frame).drop(columns=PRIORITY_COLUMN).reset_index(drop=True)
@@ -0,0 +1,136 @@
+"""
+Aadhaar DataThon - Shard Manifest
+Auto-discovered inventory of the api_data_aadhar_* CSV shards
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+from data_cache import CACHE_DIR, file_checksum
+
+DATASET_DIRS = {
+    'biometric': 'api_data_aadhar_biometric',
+    'demographic': 'api_data_aadhar_demographic',
+    'enrollment': 'api_data_aadhar_enrolment',
+}
+
+# Shards are named <directory>_<first row>_<end row>.csv
+SHARD_PATTERN = re.compile(r'^(?P<prefix>api_data_aadhar_[a-z]+)_(?P<row_start>\d+)_(?P<row_end>\d+)\.csv$')
+
+MANIFEST_FILE = 'manifest.json'
+
+
+def discover_shards(data_dir='.'):
+    """Find every shard of every dataset, returning {dataset: [(row_start, row_end, path)]} by row order"""
+    shards = {}
+    for dataset, dirname in DATASET_DIRS.items():
+        found = []
+        directory = Path(data_dir) / dirname
+        if directory.is_dir():
+            for entry in directory.iterdir():
+                match = SHARD_PATTERN.match(entry.name)
+                if match and match['prefix'] == dirname:
+                    found.append((int(match['row_start']), int(match['row_end']), str(entry)))
+        shards[dataset] = sorted(found)
+    return shards
+
+
+class ShardManifest:
+    """Row range, size, mtime and checksum of every shard, used to spot new or changed ones"""
+
+    def __init__(self, data_dir='.', cache_dir=CACHE_DIR):
+        self.data_dir = data_dir
+        self.path = Path(cache_dir) / MANIFEST_FILE
+        self.entries = self._load()
+        self.changed = {}
+        self.removed = []
+
+    def _load(self):
+        """Read the previously saved manifest, if any"""
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _scan(self, dataset, row_start, row_end, path):
+        """Build a manifest entry for a shard, returning (entry, is_new_or_changed)"""
+        stat = os.stat(path)
+        previous = self.entries.get(path)
+        if previous and previous['size'] == stat.st_size and previous['mtime_ns'] == stat.st_mtime_ns:
+            return previous, False
+
+        checksum = file_checksum(path)
+        entry = {
+            'dataset': dataset,
+            'row_start': row_start,
+            'row_end': row_end,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'checksum': checksum,
+        }
+        return entry, not previous or previous['checksum'] != checksum
+
+    def refresh(self):
+        """Rescan the data directories; returns {dataset: [new or changed shard paths]}"""
+        entries = {}
+        self.changed = {}
+        for dataset, shards in discover_shards(self.data_dir).items():
+            self.changed[dataset] = []
+            for row_start, row_end, path in shards:
+                entries[path], changed = self._scan(dataset, row_start, row_end, path)
+                if changed:
+                    self.changed[dataset].append(path)
+
+        self.removed = sorted(set(self.entries) - set(entries))
+        self.entries = entries
+        return self.changed
+
+    def save(self):
+        """Persist the manifest atomically"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.entries, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def file_lists(self):
+        """Return {dataset: [shard paths]} in row order"""
+        lists = {dataset: [] for dataset in DATASET_DIRS}
+        for path, entry in sorted(self.entries.items(), key=lambda item: item[1]['row_start']):
+            lists[entry['dataset']].append(path)
+        return lists
+
+    def checksum(self, path):
+        """Return the recorded checksum of a shard, or None if it is not in the manifest"""
+        entry = self.entries.get(str(path))
+        return entry['checksum'] if entry else None
+
+    def fingerprint(self):
+        """Digest of every shard checksum - changes whenever any shard is added, edited or removed"""
+        digest = hashlib.sha1()
+        for path in sorted(self.entries):
+            digest.update(f"{path}:{self.entries[path]['checksum']}".encode())
+        return digest.hexdigest()
+
+    def summary(self):
+        """One-line description of the last refresh"""
+        changed = sum(len(paths) for paths in self.changed.values())
+        return (f"Shard manifest: {len(self.entries)} shards, "
+                f"{changed} new/changed, {len(self.removed)} removed")
+
+
+def load_manifest(data_dir='.', cache_dir=CACHE_DIR):
+    """Discover shards, record any changes and return the saved manifest"""
+    manifest = ShardManifest(data_dir, cache_dir)
+    manifest.refresh()
+    try:
+        manifest.save()
+    except OSError as e:
+        print(f"⚠️ Could not save shard manifest: {e}")
+    return manifest
@@ -0,0 +1,212 @@
+"""
+Aadhaar DataThon - Out-of-Core Streaming Aggregation
+Chunked groupby-sum over shards with a bounded memory budget
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data_cache import CACHE_VERSION, ShardCache
+from data_schema import COUNT_COLUMNS, TOTAL_COLUMNS
+from parallel_ingest import add_derived_columns
+from sketches import DistinctSketch, QuantileSketch
+
+# Working memory per chunk is a multiple of its typed size (derived columns, groupby buffers)
+CHUNK_OVERHEAD = 4
+
+# Partial aggregates are re-reduced once this many have accumulated
+COMPACT_EVERY = 32
+
+# Per-shard partial aggregates live here, inside the shard cache directory
+PARTIALS_DIR = 'partials'
+
+# Grouping specs that keep mergeable sketches rather than sums
+SKETCH_TYPES = (DistinctSketch, QuantileSketch)
+
+# Group keys aggregated in a single pass per dataset (None = grand total,
+# a sketch = per-group HyperLogLog or t-digest merged by its own reduce instead of sum)
+DEFAULT_GROUPINGS = {
+    'total': None,
+    'state': ['state'],
+    'district': ['state', 'district'],
+    'date': ['date'],
+    'month': ['month'],
+    'day': ['day'],
+    'weekday': ['weekday'],
+}
+
+
+class StreamingAggregator:
+    """Merge per-chunk groupby sums so peak memory follows the budget, not the row count
+
+    With a shard manifest, each shard's partial aggregates are persisted under
+    its checksum, so a rerun only streams new or changed shards.
+    """
+
+    def __init__(self, memory_budget_mb=256, cache=None, manifest=None):
+        self.memory_budget_mb = memory_budget_mb
+        self.cache = cache or ShardCache()
+        self.manifest = manifest
+        self.partials_dir = self.cache.cache_dir / PARTIALS_DIR
+        self.rows_processed = 0
+        self.peak_chunk_bytes = 0
+        self.shards_streamed = 0
+        self.shards_reused = 0
+
+    def chunk_rows(self, csv_path):
+        """Number of rows per chunk that keeps working memory within the budget"""
+        budget_bytes = self.memory_budget_mb * 1024 * 1024
+        row_bytes = self.cache.typed_bytes_per_row(csv_path) * CHUNK_OVERHEAD
+        return max(1000, budget_bytes // row_bytes)
+
+    def iter_chunks(self, file_list):
+        """Yield preprocessed chunks from every shard in order"""
+        for file in file_list:
+            for chunk in self.cache.iter_shard(file, self.chunk_rows(file)):
+                add_derived_columns(chunk)
+                self.rows_processed += len(chunk)
+                self.peak_chunk_bytes = max(self.peak_chunk_bytes, int(chunk.memory_usage(deep=True).sum()))
+                yield chunk
+
+    @staticmethod
+    def _reduce(partials):
+        """Merge partial aggregates into one (negated partials subtract)"""
+        combined = pd.concat(partials)
+        return combined.groupby(level=list(range(combined.index.nlevels)), observed=True).sum()
+
+    def _partial_paths(self, csv_path, groupings, checksum=None):
+        """Persisted partial paths of a shard version, keyed by its checksum and the cache schema (None if unknown)"""
+        if checksum is None and self.manifest:
+            checksum = self.manifest.checksum(csv_path)
+        if checksum is None:
+            return None
+        stem = Path(csv_path).stem
+        return {
+            name: self.partials_dir / f"{stem}-{checksum[:16]}-v{CACHE_VERSION}-{_grouping_label(keys)}.parquet"
+            for name, keys in groupings.items()
+        }
+
+    def load_partials(self, csv_path, groupings, checksum=None):
+        """Read the persisted partials of a shard version, or None if any are missing"""
+        paths = self._partial_paths(csv_path, groupings, checksum)
+        if not paths or not all(path.exists() for path in paths.values()):
+            return None
+        try:
+            return {name: pd.read_parquet(path) for name, path in paths.items()}
+        except ImportError:
+            return None
+
+    def _save_partials(self, csv_path, partials, paths):
+        """Persist a shard's partial aggregates, replacing those of older shard versions"""
+        try:
+            self.partials_dir.mkdir(parents=True, exist_ok=True)
+            # Only other shard versions are stale; partials of other groupings stay
+            stem = Path(csv_path).stem
+            prefix = _version_prefix(next(iter(paths.values())), stem)
+            for stale in self.partials_dir.glob(f"{stem}-*.parquet"):
+                if _version_prefix(stale, stem) != prefix:
+                    stale.unlink()
+            for name, partial in partials.items():
+                if partial is not None:
+                    partial.to_parquet(paths[name])
+        except (ImportError, OSError) as e:
+            print(f"⚠️ Could not persist partial aggregates for {csv_path}: {e}")
+
+    def shard_partials(self, csv_path, dataset, groupings=None):
+        """Aggregate one shard, reusing its persisted partials when the shard is unchanged"""
+        groupings = groupings or DEFAULT_GROUPINGS
+        partials = self.load_partials(csv_path, groupings)
+        if partials is not None:
+            self.shards_reused += 1
+            return partials
+
+        partials = self._stream_shard(csv_path, dataset, groupings)
+        self.shards_streamed += 1
+        paths = self._partial_paths(csv_path, groupings)
+        if paths:
+            self._save_partials(csv_path, partials, paths)
+        return partials
+
+    def _stream_shard(self, csv_path, dataset, groupings):
+        """Compute groupby sums of every count, total and squared-total column over one shard"""
+        total_col = TOTAL_COLUMNS[dataset]
+        # Signed so partials of replaced shards can be negated and subtracted
+        int_cols = COUNT_COLUMNS[dataset] + [total_col, 'count']
+        value_cols = int_cols + [f'{total_col}_sq']
+        partials = {name: [] for name in groupings}
+
+        for chunk in self.iter_chunks([csv_path]):
+            chunk[f'{total_col}_sq'] = chunk[total_col].astype(np.float64) ** 2
+            chunk['count'] = np.uint32(1)
+            values = chunk[value_cols].astype({col: np.int64 for col in int_cols})
+
+            for name, keys in groupings.items():
+                if isinstance(keys, SKETCH_TYPES):
+                    partials[name].append(keys.partial(chunk))
+                    if len(partials[name]) >= COMPACT_EVERY:
+                        partials[name] = [keys.reduce(partials[name])]
+                    continue
+                if keys is None:
+                    # Grand total: a single constant group keeps per-column dtypes
+                    key_arrays, names = [np.zeros(len(chunk), dtype=np.int8)], ['_all']
+                else:
+                    key_arrays, names = [chunk[k] for k in keys], keys
+                partial = values.groupby(key_arrays, observed=True).sum()
+                # Plain index levels so partials from chunks with different categories align
+                partial.index = pd.MultiIndex.from_arrays(
+                    [np.asarray(partial.index.get_level_values(i)) for i in range(len(names))],
+                    names=names
+                )
+                partials[name].append(partial)
+                if len(partials[name]) >= COMPACT_EVERY:
+                    partials[name] = [self._reduce(partials[name])]
+
+        return {name: _reducer(groupings[name])(parts) if parts else None for name, parts in partials.items()}
+
+    def aggregate(self, file_list, dataset, groupings=None):
+        """Merge the per-shard aggregates of every shard into one frame per grouping
+
+        Each grouping also carries a 'count' column of contributing rows, so
+        means and standard deviations can be derived from (count, sum, sum of squares).
+        """
+        groupings = groupings or DEFAULT_GROUPINGS
+        shard_results = [self.shard_partials(file, dataset, groupings) for file in file_list]
+
+        results = {}
+        for name, keys in groupings.items():
+            partials = [shard[name] for shard in shard_results if shard[name] is not None]
+            if not partials:
+                results[name] = None
+                continue
+            result = _reducer(keys)(partials)
+            if result.index.nlevels == 1:
+                result.index = result.index.get_level_values(0)
+            results[name] = result
+        return results
+
+
+def _grouping_label(keys):
+    """Stable file label of a grouping"""
+    if isinstance(keys, SKETCH_TYPES):
+        return keys.label()
+    return '_'.join(keys) if keys else 'total'
+
+
+def _version_prefix(path, stem):
+    """(checksum, cache version) part of a shard's partial file name"""
+    return tuple(path.name[len(stem) + 1:].split('-', 2)[:2])
+
+
+def _reducer(keys):
+    """Merge function for a grouping's partials - sum for aggregates, the sketch's own merge for sketches"""
+    return keys.reduce if isinstance(keys, SKETCH_TYPES) else StreamingAggregator._reduce
+
+
+def std_from_moments(aggregate, total_col):
+    """Sample standard deviation of the total column from (count, sum, sum of squares)"""
+    n = aggregate['count'].astype(np.float64)
+    mean = aggregate[total_col] / n
+    var = (aggregate[f'{total_col}_sq'] - n * mean ** 2) / (n - 1)
+    return np.sqrt(var.clip(lower=0)).where(n > 1)
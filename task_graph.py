@@ -0,0 +1,197 @@
+"""
+Aadhaar DataThon - Task Graph Scheduler
+Runs independent analyses concurrently in worker processes and reports their timings
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from result_cache import code_version, result_key
+
+# Graph being run; forked workers inherit it, so tasks and the frames they close over are never pickled
+_ACTIVE_GRAPH = None
+
+
+def _run_task(name, args):
+    """Worker: run one task, returning (result, wall seconds, CPU seconds, error)"""
+    func = _ACTIVE_GRAPH.tasks[name][0]
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        result, error = func(*args), None
+    except Exception as e:
+        result, error = None, f"{type(e).__name__}: {e}"
+    return result, time.perf_counter() - wall, time.process_time() - cpu, error
+
+
+class TaskGraph:
+    """Named tasks whose declared inputs are the results of other tasks
+
+    A task runs once all of its inputs have finished and receives their results
+    as positional arguments. Ready tasks run concurrently in forked worker
+    processes (pyplot keeps global state, so analyses that plot cannot share
+    threads); without fork the graph runs serially in dependency order.
+
+    With a ResultCache, a task whose data fingerprint, parameters, code version
+    and input keys are unchanged returns its stored result (and restores the
+    output files it declared) without running.
+    """
+
+    def __init__(self, cache=None, fingerprint=None, params=None):
+        self.tasks = {}
+        self.results = {}
+        self.errors = {}
+        self.timings = {}
+        self.cached = set()
+        self.makespan = 0.0
+        self.cache = cache
+        self.fingerprint = fingerprint
+        self.params = params or {}
+        self.keys = {}
+
+    def add(self, name, func, inputs=(), outputs=()):
+        """Register a task; inputs name the tasks whose results it takes, outputs the files it writes"""
+        if name in self.tasks:
+            raise ValueError(f"Duplicate task: {name}")
+        self.tasks[name] = (func, list(inputs), list(outputs))
+        return self
+
+    def _check(self):
+        """Reject unknown inputs and cycles"""
+        visiting, done = set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Task graph has a cycle through {name}")
+            visiting.add(name)
+            func, inputs, _ = self.tasks[name]
+            for dep in inputs:
+                if dep not in self.tasks:
+                    raise ValueError(f"Task {name} depends on unknown task {dep}")
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+            # Inputs are keyed first, so each key chains the keys of everything upstream
+            self.keys[name] = result_key(name, self.fingerprint, self.params, code_version(func),
+                                         [self.keys[dep] for dep in inputs])
+
+        self.keys = {}
+        for name in self.tasks:
+            visit(name)
+
+    def _ready(self, pending):
+        """Pending tasks whose inputs have all finished, skipping those with a failed input
+
+        Tasks with a cached result complete here, which may ready their dependents.
+        """
+        ready, progress = [], True
+        while progress:
+            progress = False
+            # Declaration order, so cached results are dispatched and reported the same way every run
+            for name in [name for name in self.tasks if name in pending]:
+                inputs = self.tasks[name][1]
+                if any(dep in self.errors for dep in inputs):
+                    self.errors[name] = "skipped: an input failed"
+                elif all(dep in self.results for dep in inputs):
+                    hit, result = self.cache.get(self.keys[name]) if self.cache else (False, None)
+                    if hit:
+                        self.results[name] = result
+                        self.timings[name] = (0.0, 0.0)
+                        self.cached.add(name)
+                        progress = True
+                    else:
+                        ready.append(name)
+                else:
+                    continue
+                pending.remove(name)
+        return ready
+
+    def _record(self, name, outcome):
+        """Store one task's result and timings"""
+        result, wall, cpu, error = outcome
+        self.timings[name] = (wall, cpu)
+        if error is None:
+            self.results[name] = result
+            if self.cache:
+                self.cache.put(self.keys[name], result, self.tasks[name][2])
+        else:
+            self.errors[name] = error
+            print(f"❌ Task {name} failed: {error}")
+
+    def _args(self, name):
+        """Results of a task's inputs, in declared order"""
+        return [self.results[dep] for dep in self.tasks[name][1]]
+
+    def _run_parallel(self, workers):
+        """Schedule ready tasks on a forked process pool as their inputs complete"""
+        global _ACTIVE_GRAPH
+        _ACTIVE_GRAPH = self
+        pending, running = set(self.tasks), {}
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork')) as pool:
+                while pending or running:
+                    for name in self._ready(pending):
+                        running[pool.submit(_run_task, name, self._args(name))] = name
+                    if not running:
+                        continue
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._record(running.pop(future), future.result())
+        finally:
+            _ACTIVE_GRAPH = None
+
+    def _run_serial(self):
+        """Run every task in-process in dependency order"""
+        global _ACTIVE_GRAPH
+        _ACTIVE_GRAPH = self
+        pending = set(self.tasks)
+        try:
+            while pending:
+                for name in sorted(self._ready(pending), key=list(self.tasks).index):
+                    self._record(name, _run_task(name, self._args(name)))
+        finally:
+            _ACTIVE_GRAPH = None
+
+    def run(self, max_workers=None):
+        """Run the graph, returning {task: result} for the tasks that succeeded"""
+        self._check()
+        self.results, self.errors, self.timings, self.cached = {}, {}, {}, set()
+        workers = min(max_workers or os.cpu_count() or 1, len(self.tasks))
+
+        start = time.perf_counter()
+        if workers > 1 and 'fork' in multiprocessing.get_all_start_methods():
+            try:
+                self._run_parallel(workers)
+            except (BrokenProcessPool, OSError) as e:
+                print(f"⚠️ Process pool unavailable ({e}), running tasks serially")
+                self.results, self.errors, self.timings, self.cached = {}, {}, {}, set()
+                self._run_serial()
+        else:
+            self._run_serial()
+        self.makespan = time.perf_counter() - start
+        return self.results
+
+    def report(self):
+        """Print per-task wall and CPU time and the overall makespan"""
+        print("\n" + "="*60)
+        print("TASK TIMINGS")
+        print("="*60)
+        print(f"{'Task':<28}{'Wall (s)':>10}{'CPU (s)':>10}  Status")
+        for name in self.tasks:
+            wall, cpu = self.timings.get(name, (0.0, 0.0))
+            if name in self.cached:
+                status = "✓ cached"
+            elif name in self.results:
+                status = "✓"
+            else:
+                status = f"❌ {self.errors.get(name, 'not run')}"
+            print(f"{name:<28}{wall:>10.2f}{cpu:>10.2f}  {status}")
+        total = sum(wall for wall, _ in self.timings.values())
+        speedup = total / self.makespan if self.makespan else 0
+        print(f"Makespan: {self.makespan:.2f}s for {total:.2f}s of task time ({speedup:.1f}x)")
+        if self.cache:
+            print(self.cache.summary())